@@ -0,0 +1,6 @@
+"""MarkerEngine Benchmarks - synthetischer Korpus und Messläufe"""
+from .corpus import generate_chat, load_marker_examples, write_chat
+from .suite import BenchmarkSuite, compare_results, measure
+
+__all__ = ['generate_chat', 'load_marker_examples', 'write_chat',
+           'BenchmarkSuite', 'compare_results', 'measure']
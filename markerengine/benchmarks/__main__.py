@@ -0,0 +1,68 @@
+"""
+MarkerEngine Benchmarks - Kommandozeile
+
+    python -m markerengine.benchmarks --size 500000 --output bench.json
+    python -m markerengine.benchmarks --compare alt.json --output neu.json
+    python -m markerengine.benchmarks --generate chat.txt --size 1000000
+"""
+import argparse
+import json
+import logging
+import sys
+
+from .corpus import write_chat
+from .suite import BenchmarkSuite, compare_results, default_output_path
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="MarkerEngine Benchmarks")
+    parser.add_argument('--size', type=int, default=200_000, help="Korpusgröße in Zeichen")
+    parser.add_argument('--senders', type=int, default=2, help="Anzahl Absender")
+    parser.add_argument('--hit-density', type=float, default=0.3,
+                        help="Anteil der Nachrichten mit Marker-Beispiel (0..1)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeats', type=int, default=3, help="Messläufe pro Benchmark")
+    parser.add_argument('--marker-path', help="Marker/ Verzeichnis (MarkerEngine)")
+    parser.add_argument('--markers-path', help="markers/ Verzeichnis (Pattern Engine)")
+    parser.add_argument('--output', help="JSON-Ausgabedatei (Standard: benchmark_<Zeit>.json)")
+    parser.add_argument('--compare', help="Früheres Ergebnis zum Vergleich")
+    parser.add_argument('--generate', metavar='FILE',
+                        help="Nur den Korpus nach FILE schreiben, keine Messung")
+    args = parser.parse_args(argv)
+
+    corpus_params = dict(size=args.size, senders=args.senders,
+                         hit_density=args.hit_density, seed=args.seed)
+
+    if args.generate:
+        write_chat(args.generate, markers_path=args.marker_path, **corpus_params)
+        print(f"✅ Korpus geschrieben: {args.generate}")
+        return 0
+
+    # Engine-Logs (inkl. der bei jedem Kaltstart wiederholten YAML-Fehler)
+    # würden die Messwerte überdecken
+    logging.getLogger('markerengine').setLevel(logging.CRITICAL)
+
+    print(f"⏱️  MarkerEngine Benchmarks ({args.size} Zeichen, {args.repeats} Läufe)")
+    suite = BenchmarkSuite(repeats=args.repeats, marker_path=args.marker_path,
+                           markers_path=args.markers_path, **corpus_params)
+    results = suite.run()
+
+    output = args.output or default_output_path()
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"💾 Ergebnisse gespeichert: {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\n📊 Vergleich mit {args.compare} (Median):")
+        for row in compare_results(baseline, results):
+            regression = row['ratio'] > 1.1 and row['current'] - row['baseline'] > 0.001
+            marker = '⚠️ ' if regression else '   '
+            print(f"{marker}{row['name']:<40} {row['baseline'] * 1000:10.1f} ms -> "
+                  f"{row['current'] * 1000:10.1f} ms  ({row['ratio']:.2f}x)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+MarkerEngine Benchmarks - Synthetischer WhatsApp-Korpus
+Deterministischer Generator: gleiche Parameter + Seed ergeben denselben Chat.
+Nachrichten bestehen aus Fülltext und (je nach Trefferdichte) eingestreuten
+Beispielen der Atomic Marker.
+"""
+import os
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+from markerengine.core.marker_loader import load_marker_directories
+
+DEFAULT_MARKERS_PATH = Path(__file__).resolve().parent.parent.parent / "Marker"
+
+FILLER_WORDS = [
+    'ja', 'nein', 'okay', 'heute', 'morgen', 'gestern', 'abend', 'später',
+    'wir', 'du', 'ich', 'sie', 'mal', 'noch', 'schon', 'gerade', 'eigentlich',
+    'kino', 'essen', 'arbeit', 'wetter', 'zug', 'einkaufen', 'wochenende',
+    'treffen', 'anrufen', 'schreiben', 'sehen', 'machen', 'gehen', 'kommen',
+    'gut', 'schön', 'lustig', 'müde', 'spät', 'früh', 'danke', 'bitte',
+]
+
+SENDER_NAMES = [
+    'Anna', 'Ben', 'Clara', 'David', 'Emma', 'Felix', 'Greta', 'Hannes',
+    'Ida', 'Jonas', 'Katja', 'Lukas', 'Mia', 'Noah', 'Olga', 'Paul',
+]
+
+
+def load_marker_examples(markers_path: Optional[str] = None) -> List[str]:
+    """Sammelt die Beispiele (beispiele / marker.examples) aller Atomic Marker"""
+    markers_path = Path(markers_path) if markers_path else DEFAULT_MARKERS_PATH
+    examples = []
+    for marker_file in load_marker_directories(markers_path, ('atomic',))['atomic']:
+        data = marker_file.data
+        if not isinstance(data, dict):
+            continue
+        if 'beispiele' in data:
+            candidates = data.get('beispiele') or []
+        elif isinstance(data.get('marker'), dict):
+            candidates = data['marker'].get('examples') or []
+        else:
+            continue
+        examples.extend(e.strip() for e in candidates if isinstance(e, str) and e.strip())
+    return examples
+
+
+def _sender_names(senders: int) -> List[str]:
+    names = SENDER_NAMES[:senders]
+    names += [f"Person {i + 1}" for i in range(len(names), senders)]
+    return names
+
+
+def generate_chat(size: int = 200_000, senders: int = 2, hit_density: float = 0.3,
+                  seed: int = 42, examples: Optional[List[str]] = None,
+                  markers_path: Optional[str] = None) -> str:
+    """
+    Erzeugt einen WhatsApp-Export (iOS-Format, DE) mit ca. `size` Zeichen
+
+    Args:
+        size: Zielgröße in Zeichen (der Chat endet mit der ersten Nachricht darüber)
+        senders: Anzahl verschiedener Absender
+        hit_density: Anteil der Nachrichten mit einem Marker-Beispiel (0..1)
+        seed: Seed für den Zufallsgenerator
+        examples: Marker-Beispiele (Standard: aus markers_path geladen)
+        markers_path: Marker-Ordner für die Beispiele
+    """
+    rng = random.Random(seed)
+    if examples is None:
+        examples = load_marker_examples(markers_path)
+    names = _sender_names(max(1, senders))
+    timestamp = datetime(2024, 1, 1, 8, 0, 0)
+
+    parts = []
+    length = 0
+    while length < size:
+        timestamp += timedelta(seconds=rng.randint(5, 900))
+        words = rng.choices(FILLER_WORDS, k=rng.randint(2, 14))
+        if examples and rng.random() < hit_density:
+            words.insert(rng.randint(0, len(words)), rng.choice(examples))
+        text = ' '.join(words)
+        # Gelegentlich mehrzeilige Nachrichten
+        if rng.random() < 0.05:
+            text += '\n' + ' '.join(rng.choices(FILLER_WORDS, k=rng.randint(1, 8)))
+
+        line = f"[{timestamp:%d.%m.%y, %H:%M:%S}] {rng.choice(names)}: {text}\n"
+        parts.append(line)
+        length += len(line)
+
+    return ''.join(parts)
+
+
+def write_chat(file_path: str, **kwargs) -> str:
+    """Schreibt einen generierten Chat nach file_path (Parameter wie generate_chat)"""
+    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(generate_chat(**kwargs))
+    return file_path
@@ -0,0 +1,187 @@
+"""
+MarkerEngine Benchmarks - Messläufe für Startup, Phasen und End-to-End
+Jeder Benchmark wird `repeats` mal gemessen; Ergebnisse sind JSON-fähige
+Dicts, damit Läufe verschiedener Stände verglichen werden können.
+"""
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from markerengine.core.chat_parser import parse_chat
+from markerengine.core.engine import MarkerEngine
+from markerengine.core.pattern_engine import MarkerPatternEngine
+from markerengine.core.real_analyzer import analyze_whatsapp_chat
+from markerengine.core.registry import clear_registry
+
+from .corpus import generate_chat
+
+RESULT_VERSION = 1
+
+
+def measure(func: Callable[[], Any], repeats: int = 3,
+            setup: Optional[Callable[[], None]] = None) -> Dict[str, Any]:
+    """
+    Misst die Laufzeit von func()
+
+    Returns:
+        Zeiten in Sekunden (min/median/mean/alle Läufe) und das Ergebnis des
+        letzten Laufs unter 'value'
+    """
+    times = []
+    value = None
+    for _ in range(max(1, repeats)):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        value = func()
+        times.append(time.perf_counter() - start)
+    return {
+        'min': min(times),
+        'median': statistics.median(times),
+        'mean': statistics.mean(times),
+        'runs': times,
+        'value': value,
+    }
+
+
+class BenchmarkSuite:
+    """
+    Alle Benchmarks über einen synthetischen Korpus
+
+    Der Marker-Cache wird für die Dauer des Laufs in ein temporäres
+    Verzeichnis umgelenkt, damit kalte und warme Startzeiten reproduzierbar
+    sind und der Cache des Benutzers unberührt bleibt.
+    """
+
+    def __init__(self, size: int = 200_000, senders: int = 2, hit_density: float = 0.3,
+                 seed: int = 42, repeats: int = 3, marker_path: Optional[str] = None,
+                 markers_path: Optional[str] = None):
+        self.corpus_params = {
+            'size': size,
+            'senders': senders,
+            'hit_density': hit_density,
+            'seed': seed,
+        }
+        self.repeats = repeats
+        self.marker_path = marker_path
+        self.markers_path = markers_path
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def _record(self, name: str, func: Callable[[], Any], setup: Optional[Callable[[], None]] = None,
+                repeats: Optional[int] = None, count: Optional[Callable[[Any], int]] = None):
+        measurement = measure(func, repeats or self.repeats, setup)
+        value = measurement.pop('value')
+        if count is not None:
+            measurement['items'] = count(value)
+        self.results[name] = measurement
+        print(f"  {name:<32} {measurement['median'] * 1000:10.1f} ms")
+        return value
+
+    def run(self) -> Dict[str, Any]:
+        """Führt alle Benchmarks aus und liefert das Ergebnis-Dict"""
+        text = generate_chat(markers_path=self.marker_path, **self.corpus_params)
+        messages = parse_chat(text)
+
+        previous_cache_dir = os.environ.get('MARKERENGINE_CACHE_DIR')
+        with tempfile.TemporaryDirectory(prefix='markerengine-bench-') as tmp_dir:
+            os.environ['MARKERENGINE_CACHE_DIR'] = os.path.join(tmp_dir, 'cache')
+            try:
+                chat_file = os.path.join(tmp_dir, 'chat.txt')
+                with open(chat_file, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                self._run_startup()
+                self._run_phases(text)
+                self._run_pattern_engine(text)
+                self._run_end_to_end(chat_file)
+            finally:
+                if previous_cache_dir is None:
+                    os.environ.pop('MARKERENGINE_CACHE_DIR', None)
+                else:
+                    os.environ['MARKERENGINE_CACHE_DIR'] = previous_cache_dir
+                clear_registry()
+
+        return {
+            'version': RESULT_VERSION,
+            'created_at': datetime.now().isoformat(),
+            'environment': {
+                'python': sys.version.split()[0],
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+            },
+            'corpus': dict(self.corpus_params, chars=len(text), messages=len(messages)),
+            'repeats': self.repeats,
+            'benchmarks': self.results,
+        }
+
+    def _run_startup(self):
+        self._record('startup.engine_cold',
+                     lambda: MarkerEngine(self.marker_path, use_cache=False))
+        # Einmal bauen, damit der Cache gefüllt ist
+        MarkerEngine(self.marker_path)
+        self._record('startup.engine_warm', lambda: MarkerEngine(self.marker_path))
+        self._record('startup.pattern_engine_cold',
+                     lambda: MarkerPatternEngine(self.markers_path, use_cache=False))
+
+    def _run_phases(self, text: str):
+        engine = MarkerEngine(self.marker_path)
+        self._record('engine.parse_chat', lambda: parse_chat(text), count=len)
+
+        messages = parse_chat(text)
+        atomic_hits = self._record('engine.phase1_atomic',
+                                   lambda: engine._detect_atomic_markers(text), count=len)
+        semantic_hits = self._record(
+            'engine.phase2_semantic',
+            lambda: engine._evaluate_semantic_markers(text, atomic_hits, messages), count=len)
+        cluster_hits = self._record('engine.phase3_cluster',
+                                    lambda: engine._detect_clusters(text, semantic_hits), count=len)
+        self._record('engine.phase4_meta',
+                     lambda: engine._trigger_meta_markers(cluster_hits), count=len)
+        self._record('engine.analyze', lambda: engine.analyze(text),
+                     count=lambda result: result.statistics['total_markers'])
+
+    def _run_pattern_engine(self, text: str):
+        pattern_engine = MarkerPatternEngine(self.markers_path)
+        self._record('pattern_engine.detect_patterns',
+                     lambda: pattern_engine.detect_patterns(text), count=len)
+
+    def _run_end_to_end(self, chat_file: str):
+        # Erster Aufruf im Prozess: Engine wird (aus dem Cache) gebaut
+        self._record('end_to_end.analyze_whatsapp_chat_first',
+                     lambda: analyze_whatsapp_chat(chat_file), setup=clear_registry,
+                     count=lambda result: result['statistics']['total_atomic_hits'])
+        self._record('end_to_end.analyze_whatsapp_chat',
+                     lambda: analyze_whatsapp_chat(chat_file),
+                     count=lambda result: result['statistics']['total_atomic_hits'])
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Vergleicht zwei Ergebnis-Dicts über den Median jedes Benchmarks
+
+    Returns:
+        Pro gemeinsamem Benchmark: Name, beide Mediane und Faktor (aktuell / Basis)
+    """
+    rows = []
+    for name, result in current.get('benchmarks', {}).items():
+        base = baseline.get('benchmarks', {}).get(name)
+        if base is None:
+            continue
+        ratio = result['median'] / base['median'] if base['median'] else float('inf')
+        rows.append({
+            'name': name,
+            'baseline': base['median'],
+            'current': result['median'],
+            'ratio': ratio,
+        })
+    return rows
+
+
+def default_output_path() -> Path:
+    """Standard-Ausgabedatei mit Zeitstempel im aktuellen Verzeichnis"""
+    return Path(f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json")
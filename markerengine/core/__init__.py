@@ -1,4 +1,8 @@
 """MarkerEngine Core Module"""
 from .engine import MarkerEngine, AnalysisResult, MarkerHit
+from .incremental import IncrementalAnalyzer, AnalysisDelta
+from .registry import get_marker_engine, get_pattern_engine, get_real_analyzer
 
-__all__ = ['MarkerEngine', 'AnalysisResult', 'MarkerHit']
+__all__ = ['MarkerEngine', 'AnalysisResult', 'MarkerHit',
+           'IncrementalAnalyzer', 'AnalysisDelta',
+           'get_marker_engine', 'get_pattern_engine', 'get_real_analyzer']
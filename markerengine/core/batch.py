@@ -0,0 +1,283 @@
+"""
+MarkerEngine Batch - Analyse vieler Chat-Exporte
+Eine einmal kompilierte Engine wird an einen Prozess-Pool verteilt; jeder
+Chat landet als JSON im Ausgabe-Verzeichnis. Eine Checkpoint-Datei (JSONL,
+eine Zeile pro fertigem Chat) erlaubt es, abgebrochene Läufe fortzusetzen.
+
+    python -m markerengine.core.batch exports/ --output results/ --workers 8
+    python -m markerengine.core.batch manifest.txt --output results/
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .engine import MarkerEngine
+
+CHECKPOINT_NAME = 'checkpoint.jsonl'
+SUMMARY_NAME = 'batch_summary.json'
+DEFAULT_GLOB = '*.txt'
+
+# Zustand im Worker-Prozess (vom Initializer gesetzt)
+_worker: Dict[str, Any] = {}
+
+
+def collect_chats(source: str, pattern: str = DEFAULT_GLOB) -> List[Tuple[Path, str]]:
+    """
+    Chat-Dateien aus einem Verzeichnis (rekursiv) oder einem Manifest
+
+    Ein Manifest enthält einen Pfad pro Zeile (relativ zum Manifest;
+    Leerzeilen und '#'-Kommentare werden ignoriert).
+
+    Returns:
+        (Pfad, Name) - der Name ist eindeutig und bestimmt die Ausgabedatei
+    """
+    source = Path(source)
+    if source.is_dir():
+        return [(path, path.relative_to(source).as_posix())
+                for path in sorted(source.rglob(pattern)) if path.is_file()]
+
+    base = source.parent.resolve()
+    chats = []
+    with open(source, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            path = (base / line).resolve()
+            try:
+                name = path.relative_to(base).as_posix()
+            except ValueError:
+                # Außerhalb des Manifest-Ordners: Dateiname + Hash des Pfads
+                digest = hashlib.sha1(str(path).encode('utf-8')).hexdigest()[:8]
+                name = f"{path.stem}-{digest}{path.suffix}"
+            chats.append((path, name))
+    return chats
+
+
+def _fingerprint(path: Path) -> List[int]:
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class Checkpoint:
+    """Fortschritt eines Batch-Laufs als JSONL (letzter Eintrag pro Chat gilt)"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Abgeschnittene letzte Zeile eines abgebrochenen Laufs
+                        continue
+                    self.entries[entry['name']] = entry
+
+    def is_done(self, name: str, fingerprint: List[int]) -> bool:
+        """Wurde der Chat in unveränderter Form bereits erfolgreich analysiert?"""
+        entry = self.entries.get(name)
+        return entry is not None and entry['status'] == 'ok' and entry['fingerprint'] == fingerprint
+
+    def record(self, entry: Dict[str, Any]):
+        """Hängt einen Eintrag an (sofort auf die Platte geschrieben)"""
+        self.entries[entry['name']] = entry
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            f.flush()
+
+
+def _init_worker(engine: MarkerEngine, log_level: int, columnar: bool = False):
+    """Pool-Initializer: übernimmt die im Hauptprozess kompilierte Engine"""
+    logging.getLogger('markerengine').setLevel(log_level)
+    # Die Worker sind bereits parallel - kein zusätzlicher Scan-Pool pro Chat
+    engine.scan_workers = 1
+    _worker['engine'] = engine
+    _worker['columnar'] = columnar
+
+
+def analyze_chat(task: Tuple[str, str, str, List[int]]) -> Dict[str, Any]:
+    """
+    Analysiert einen Chat und schreibt das Ergebnis-JSON (atomar per rename)
+
+    Returns:
+        Checkpoint-Eintrag (Status, Laufzeit, Größe, Trefferzahl)
+    """
+    path, name, output, fingerprint = task
+    started = time.perf_counter()
+    entry = {'name': name, 'path': path, 'output': output, 'fingerprint': fingerprint}
+    try:
+        result = _worker['engine'].analyze_file(path)
+        data = result.to_dict()
+        data['chat_file'] = path
+
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        tmp_output = output + '.tmp'
+        with open(tmp_output, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_output, output)
+
+        if _worker.get('columnar'):
+            # Treffer zusätzlich spaltenweise (Parquet bzw. .npz) für Auswertungen
+            from .columnar import export_hits
+            entry['columnar'] = str(export_hits(result, output[:-len('.json')] + '.hits'))
+
+        entry.update(status='ok', total_markers=result.statistics['total_markers'])
+    except Exception as e:
+        entry.update(status='error', error=f"{type(e).__name__}: {e}")
+    entry['seconds'] = time.perf_counter() - started
+    return entry
+
+
+def run_batch(chats: List[Tuple[Path, str]], output_dir: str,
+              engine: Optional[MarkerEngine] = None, marker_path: Optional[str] = None,
+              workers: Optional[int] = None, resume: bool = True,
+              columnar: bool = False,
+              progress: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Analysiert alle Chats mit einem Pool aus `workers` Prozessen
+
+    Args:
+        chats: (Pfad, Name) aus collect_chats()
+        output_dir: Ziel für <Name>.json, Checkpoint und Zusammenfassung
+        engine: Kompilierte Engine (Standard: MarkerEngine(marker_path))
+        workers: Prozesse (None = CPU-Anzahl, 1 = im aktuellen Prozess)
+        resume: Bereits erfolgreich analysierte, unveränderte Chats überspringen
+        columnar: Treffer zusätzlich als <Name>.hits.parquet / .npz schreiben
+        progress: Wird nach jedem Chat mit (Eintrag, Durchsatz) aufgerufen
+
+    Returns:
+        Zusammenfassung inkl. Durchsatz (Chats/s, MB/s)
+    """
+    if columnar:
+        from .columnar import NUMPY_AVAILABLE, PYARROW_AVAILABLE
+        if not (PYARROW_AVAILABLE or NUMPY_AVAILABLE):
+            raise ImportError("--columnar benötigt pyarrow oder numpy")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    checkpoint_path = output_dir / CHECKPOINT_NAME
+    if not resume and checkpoint_path.exists():
+        checkpoint_path.unlink()
+    checkpoint = Checkpoint(checkpoint_path)
+
+    tasks = []
+    skipped = 0
+    for path, name in chats:
+        fingerprint = _fingerprint(path)
+        if checkpoint.is_done(name, fingerprint):
+            skipped += 1
+            continue
+        tasks.append((str(path), name, str(output_dir / (name + '.json')), fingerprint))
+
+    if engine is None:
+        engine = MarkerEngine(marker_path)
+    workers = min(workers or os.cpu_count() or 1, max(1, len(tasks)))
+    log_level = logging.getLogger('markerengine').getEffectiveLevel()
+
+    stats = {'processed': 0, 'failed': 0, 'bytes': 0}
+    started = time.perf_counter()
+
+    def finish(entry: Dict[str, Any]):
+        checkpoint.record(entry)
+        stats['processed'] += 1
+        stats['bytes'] += entry['fingerprint'][0]
+        if entry['status'] != 'ok':
+            stats['failed'] += 1
+        if progress is not None:
+            progress(entry, _throughput(stats, time.perf_counter() - started, len(tasks)))
+
+    if workers == 1:
+        _worker['engine'] = engine
+        _worker['columnar'] = columnar
+        for task in tasks:
+            finish(analyze_chat(task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(engine, log_level, columnar)) as pool:
+            futures = [pool.submit(analyze_chat, task) for task in tasks]
+            try:
+                for future in as_completed(futures):
+                    finish(future.result())
+            except KeyboardInterrupt:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+
+    summary = _throughput(stats, time.perf_counter() - started, len(tasks))
+    summary.update(total=len(chats), skipped=skipped, workers=workers,
+                   output_dir=str(output_dir))
+    with open(output_dir / SUMMARY_NAME, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    return summary
+
+
+def _throughput(stats: Dict[str, int], elapsed: float, pending: int) -> Dict[str, Any]:
+    return {
+        'processed': stats['processed'],
+        'pending': pending,
+        'failed': stats['failed'],
+        'bytes': stats['bytes'],
+        'seconds': elapsed,
+        'chats_per_second': stats['processed'] / elapsed if elapsed else 0.0,
+        'mb_per_second': stats['bytes'] / 1e6 / elapsed if elapsed else 0.0,
+    }
+
+
+def _print_progress(entry: Dict[str, Any], throughput: Dict[str, Any]):
+    status = '✅' if entry['status'] == 'ok' else f"❌ {entry.get('error', '')}"
+    print(f"[{throughput['processed']}/{throughput['pending']}] {entry['name']} "
+          f"{status} ({entry['seconds']:.2f}s) | "
+          f"{throughput['chats_per_second']:.1f} Chats/s, {throughput['mb_per_second']:.2f} MB/s")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Batch-Analyse vieler WhatsApp-Exporte")
+    parser.add_argument('source', help="Verzeichnis mit Chat-Dateien oder Manifest (ein Pfad pro Zeile)")
+    parser.add_argument('--output', '-o', required=True, help="Ausgabe-Verzeichnis")
+    parser.add_argument('--workers', '-w', type=int, help="Prozesse (Standard: CPU-Anzahl)")
+    parser.add_argument('--glob', default=DEFAULT_GLOB, help="Dateimuster im Verzeichnis")
+    parser.add_argument('--marker-path', help="Marker-Verzeichnis")
+    parser.add_argument('--no-resume', action='store_true',
+                        help="Checkpoint verwerfen und alle Chats neu analysieren")
+    parser.add_argument('--columnar', action='store_true',
+                        help="Treffer zusätzlich als Parquet (bzw. .npz ohne pyarrow) schreiben")
+    parser.add_argument('--verbose', '-v', action='store_true', help="Engine-Logs anzeigen")
+    args = parser.parse_args(argv)
+
+    # Die bei jedem Start wiederholten YAML-Fehler der Marker-Bibliothek
+    # würden den Fortschritt überdecken
+    if not args.verbose:
+        logging.getLogger('markerengine').setLevel(logging.CRITICAL)
+
+    chats = collect_chats(args.source, args.glob)
+    print(f"📁 {len(chats)} Chats in {args.source}")
+
+    try:
+        summary = run_batch(chats, args.output, marker_path=args.marker_path,
+                            workers=args.workers, resume=not args.no_resume,
+                            columnar=args.columnar,
+                            progress=_print_progress)
+    except KeyboardInterrupt:
+        print("\n⏸️  Abgebrochen - erneuter Aufruf setzt am Checkpoint fort")
+        return 130
+    except ImportError as e:
+        print(f"❌ {e}")
+        return 2
+
+    print(f"\n✅ {summary['processed']} analysiert, {summary['skipped']} übersprungen, "
+          f"{summary['failed']} fehlgeschlagen")
+    print(f"⏱️  {summary['seconds']:.1f}s | {summary['chats_per_second']:.2f} Chats/s | "
+          f"{summary['mb_per_second']:.2f} MB/s")
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
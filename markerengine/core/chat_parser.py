@@ -0,0 +1,271 @@
+"""
+MarkerEngine Chat Parser - Nachrichten-Tabelle für WhatsApp-Exporte
+Zerlegt einen Export zeilenweise (streaming) in Nachrichten und speichert sie
+spaltenweise: Offsets, Zeitstempel und Sender-IDs in kompakten Arrays
+"""
+import calendar
+import re
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# [07.11.24, 14:32:15] Sarah: ...   (iOS, DE)
+# [11/07/2024, 2:32:15 PM] Sarah: ...   (iOS, EN)
+BRACKET_HEADER = re.compile(
+    r'^[ \t]*\u200e?\[(\d{1,2})([./])(\d{1,2})[./](\d{2,4}),? '
+    r'(\d{1,2}):(\d{2})(?::(\d{2}))?(?:[\s\u202f]?([AaPp])\.?[Mm]\.?)?\] '
+    r'(?:([^:\n]+?): )?'
+)
+
+# 07.11.24, 14:32 - Sarah: ...   (Android, DE)
+# 11/7/24, 2:32 PM - Sarah: ...   (Android, EN)
+DASH_HEADER = re.compile(
+    r'^[ \t]*\u200e?(\d{1,2})([./])(\d{1,2})[./](\d{2,4}),? '
+    r'(\d{1,2}):(\d{2})(?::(\d{2}))?(?:[\s\u202f]?([AaPp])\.?[Mm]\.?)? - '
+    r'(?:([^:\n]+?): )?'
+)
+
+HEADER_PATTERNS = (BRACKET_HEADER, DASH_HEADER)
+
+NO_SENDER = -1
+
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """Zeilen inkl. '\\n', ohne den ganzen Text in eine Liste zu kopieren"""
+    pos = 0
+    length = len(text)
+    while pos < length:
+        end = text.find('\n', pos)
+        end = length if end == -1 else end + 1
+        yield text[pos:end]
+        pos = end
+
+
+def _slash_dayfirst(groups: Sequence[str]) -> Optional[bool]:
+    """Reihenfolge eines Slash-Datums, wenn eindeutig (Tag > 12), sonst None"""
+    first, second = int(groups[0]), int(groups[2])
+    if first > 12:
+        return True
+    if second > 12:
+        return False
+    return None
+
+
+def _parse_timestamp(groups: Sequence[str], dayfirst: bool) -> float:
+    """Header-Zeitstempel als Sekunden (naiv, wie UTC behandelt); NaN wenn ungültig"""
+    first, separator, second, year, hour, minute, seconds, ampm = groups
+    first, second, year = int(first), int(second), int(year)
+    hour, minute = int(hour), int(minute)
+
+    day, month = (first, second) if dayfirst else (second, first)
+
+    if year < 100:
+        year += 2000
+    if ampm:
+        hour = hour % 12 + (12 if ampm in 'Pp' else 0)
+
+    try:
+        return float(calendar.timegm((year, month, day, hour, minute, int(seconds or 0))))
+    except (ValueError, OverflowError):
+        return float('nan')
+
+
+class MessageTable:
+    """
+    Spaltenweise Nachrichten-Tabelle eines Chats
+
+    Pro Nachricht i:
+        starts[i] / ends[i]   Zeichen-Offsets der Nachricht (inkl. Header)
+        text_starts[i]        Offset des Nachrichtentexts hinter "Name: "
+        timestamps[i]         Sekunden, NaN wenn unbekannt
+        sender_ids[i]         Index in senders, NO_SENDER für Systemzeilen
+    """
+
+    def __init__(self):
+        self.starts = array('q')
+        self.ends = array('q')
+        self.text_starts = array('q')
+        self.timestamps = array('d')
+        self.sender_ids = array('l')
+        self.senders: List[str] = []
+        self._sender_index: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def sender_id(self, name: Optional[str]) -> int:
+        """Sender-ID zu einem Namen (legt neue IDs bei Bedarf an)"""
+        if not name:
+            return NO_SENDER
+        sender_id = self._sender_index.get(name)
+        if sender_id is None:
+            sender_id = len(self.senders)
+            self._sender_index[name] = sender_id
+            self.senders.append(name)
+        return sender_id
+
+    def append(self, start: int, end: int, text_start: int,
+               timestamp: float = float('nan'), sender: Optional[str] = None) -> int:
+        """Hängt eine Nachricht an und liefert ihren Index"""
+        self.starts.append(start)
+        self.ends.append(end)
+        self.text_starts.append(text_start)
+        self.timestamps.append(timestamp)
+        self.sender_ids.append(self.sender_id(sender))
+        return len(self.starts) - 1
+
+    def extend_last(self, end: int):
+        """Verlängert die letzte Nachricht (Folgezeile einer mehrzeiligen Nachricht)"""
+        self.ends[-1] = end
+
+    def message_index(self, offset: int) -> int:
+        """Index der Nachricht, die den Zeichen-Offset enthält (O(log n)), sonst -1"""
+        index = bisect_right(self.starts, offset) - 1
+        if index < 0 or offset >= self.ends[index]:
+            return -1
+        return index
+
+    def message_indexes(self, offsets: Sequence[int]) -> List[int]:
+        """message_index() für viele Offsets"""
+        return [self.message_index(offset) for offset in offsets]
+
+    def sender(self, index: int) -> Optional[str]:
+        """Name des Senders einer Nachricht (None für Systemzeilen)"""
+        sender_id = self.sender_ids[index]
+        return self.senders[sender_id] if sender_id != NO_SENDER else None
+
+
+class ChatParser:
+    """
+    Streaming-Parser für WhatsApp-Exporte (DE/EN, iOS- und Android-Format)
+
+    Zeilen werden einzeln gefüttert; Zeilen ohne Header gehören zur vorigen
+    Nachricht. Text vor dem ersten Header bildet eine eigene Nachricht ohne
+    Sender, ein Text ganz ohne Header also genau eine Nachricht.
+
+    Ohne dayfirst wird die Reihenfolge von Slash-Daten einmal pro Chat
+    festgelegt, am ersten eindeutigen Datum (Tag > 12). Mehrdeutige Daten
+    davor erhalten vorläufig Monat/Tag und werden dann nachgetragen.
+    Punkt-Daten sind immer Tag.Monat.
+    """
+
+    def __init__(self, table: Optional[MessageTable] = None,
+                 dayfirst: Optional[bool] = None, offset: int = 0):
+        self.table = table if table is not None else MessageTable()
+        self.dayfirst = dayfirst
+        self.offset = offset
+        # Nachrichten mit mehrdeutigem Slash-Datum, solange dayfirst offen ist
+        self._undecided: List[Tuple[int, Sequence[str]]] = []
+        # Unvollständige letzte Zeile aus feed_chunk()
+        self._pending = ''
+
+    def feed_line(self, line: str) -> bool:
+        """
+        Verarbeitet eine Zeile (inkl. Zeilenumbruch)
+
+        Returns:
+            True wenn die Zeile eine neue Nachricht beginnt
+        """
+        start = self.offset
+        self.offset += len(line)
+
+        for pattern in HEADER_PATTERNS:
+            match = pattern.match(line)
+            if match:
+                index = self.table.append(
+                    start=start,
+                    end=self.offset,
+                    text_start=start + match.end(),
+                    sender=match.group(9)
+                )
+                self._set_timestamp(index, match.groups()[:8])
+                return True
+
+        if len(self.table) == 0:
+            self.table.append(start=start, end=self.offset, text_start=start)
+            return True
+
+        self.table.extend_last(self.offset)
+        return False
+
+    def _set_timestamp(self, index: int, groups: Sequence[str]):
+        dayfirst = self.dayfirst
+        if dayfirst is None:
+            if groups[1] == '.':
+                dayfirst = True
+            else:
+                dayfirst = _slash_dayfirst(groups)
+                if dayfirst is None:
+                    # Vorläufig Monat/Tag, bis ein eindeutiges Datum entscheidet
+                    self._undecided.append((index, groups))
+                    dayfirst = False
+                else:
+                    self._decide(dayfirst)
+        self.table.timestamps[index] = _parse_timestamp(groups, dayfirst)
+
+    def _decide(self, dayfirst: bool):
+        """Legt die Datums-Reihenfolge des Chats fest und trägt offene Zeitstempel nach"""
+        self.dayfirst = dayfirst
+        timestamps = self.table.timestamps
+        for index, groups in self._undecided:
+            timestamps[index] = _parse_timestamp(groups, dayfirst)
+        self._undecided = []
+
+    def feed(self, text: str) -> 'ChatParser':
+        """Verarbeitet einen Textblock (muss an einer Zeilengrenze enden)"""
+        for line in _iter_lines(text):
+            self.feed_line(line)
+        return self
+
+    def feed_chunk(self, text: str) -> 'ChatParser':
+        """
+        Verarbeitet einen beliebig geschnittenen Textblock
+
+        Eine unvollständige letzte Zeile wird bis zum nächsten Block (bzw.
+        flush()) zurückgehalten.
+        """
+        pos = 0
+        length = len(text)
+        if self._pending:
+            newline = text.find('\n')
+            if newline == -1:
+                self._pending += text
+                return self
+            self.feed_line(self._pending + text[:newline + 1])
+            self._pending = ''
+            pos = newline + 1
+
+        while pos < length:
+            end = text.find('\n', pos)
+            if end == -1:
+                self._pending = text[pos:]
+                break
+            self.feed_line(text[pos:end + 1])
+            pos = end + 1
+        return self
+
+    def flush(self) -> 'ChatParser':
+        """Verarbeitet eine zurückgehaltene letzte Zeile ohne Zeilenumbruch"""
+        if self._pending:
+            line, self._pending = self._pending, ''
+            self.feed_line(line)
+        return self
+
+
+def parse_chat(text: str, dayfirst: Optional[bool] = None) -> MessageTable:
+    """Zerlegt einen kompletten Chat-Text in eine MessageTable"""
+    return ChatParser(dayfirst=dayfirst).feed(text).table
+
+
+def parse_chat_lines(lines: Iterable[str], dayfirst: Optional[bool] = None) -> MessageTable:
+    """Zerlegt einen Zeilen-Stream (z.B. ein geöffnetes File) in eine MessageTable"""
+    parser = ChatParser(dayfirst=dayfirst)
+    for line in lines:
+        parser.feed_line(line)
+    return parser.table
+
+
+def parse_chat_file(file_path: str, dayfirst: Optional[bool] = None) -> MessageTable:
+    """Liest einen Export zeilenweise, ohne ihn komplett in den Speicher zu laden"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return parse_chat_lines(f, dayfirst=dayfirst)
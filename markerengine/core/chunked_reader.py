@@ -0,0 +1,123 @@
+"""
+MarkerEngine Chunked Reader - Speicher-begrenztes Lesen großer Exporte
+Die Datei wird per mmap eingeblendet und in Blöcken (Kern) dekodiert. Jeder
+Block wird links und rechts um eine Überlappung erweitert, damit Treffer an
+den Blockgrenzen vollständig im dekodierten Fenster liegen. Ein Treffer
+gehört zu dem Fenster, in dessen Kern er beginnt - so wird er genau einmal
+gemeldet, solange er (inkl. Kontext) kürzer als die Überlappung ist.
+"""
+import mmap
+import os
+from typing import Iterator
+
+# Größe eines dekodierten Kern-Blocks in Bytes
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Überlappung links und rechts des Kerns in Bytes
+DEFAULT_OVERLAP = 4096
+
+
+class TextWindow:
+    """
+    Dekodiertes Fenster eines Exports
+
+    text[core_start:core_end] ist der Kern; offset ist die Zeichen-Position von
+    text[0] im Gesamttext (Zeichen wie bei open(..., 'r').read()).
+    """
+
+    __slots__ = ('text', 'offset', 'core_start', 'core_end')
+
+    def __init__(self, text: str, offset: int, core_start: int, core_end: int):
+        self.text = text
+        self.offset = offset
+        self.core_start = core_start
+        self.core_end = core_end
+
+    @property
+    def core(self) -> str:
+        return self.text[self.core_start:self.core_end]
+
+    @property
+    def end_offset(self) -> int:
+        """Zeichen-Position hinter dem Kern im Gesamttext"""
+        return self.offset + self.core_end
+
+    def owns(self, start: int) -> bool:
+        """Gehört ein Treffer mit Start `start` (relativ zum Fenster) zu diesem Fenster?"""
+        return self.core_start <= start < self.core_end
+
+
+def _decode(data: bytes) -> str:
+    """UTF-8 dekodieren, Zeilenumbrüche wie im Textmodus (universal newlines)"""
+    text = data.decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def _char_boundary(data: mmap.mmap, pos: int, size: int) -> int:
+    """Verschiebt pos auf die nächste UTF-8-Zeichengrenze (nie zwischen \\r und \\n)"""
+    while pos < size and (data[pos] & 0xC0) == 0x80:
+        pos += 1
+    if 0 < pos < size and data[pos - 1] == 0x0D and data[pos] == 0x0A:
+        pos += 1
+    return pos
+
+
+def _boundary_after(data: mmap.mmap, pos: int, size: int, search: int) -> int:
+    """Erste Zeilengrenze ab pos (höchstens `search` Bytes weiter), sonst Zeichengrenze"""
+    if pos >= size:
+        return size
+    newline = data.find(b'\n', max(0, pos - 1), min(size, pos + search))
+    if newline != -1:
+        return newline + 1
+    return _char_boundary(data, pos, size)
+
+
+def _boundary_before(data: mmap.mmap, pos: int, size: int, search: int) -> int:
+    """Letzte Zeilengrenze vor pos (höchstens `search` Bytes zurück), sonst Zeichengrenze"""
+    if pos <= 0:
+        return 0
+    newline = data.rfind(b'\n', max(0, pos - search), pos)
+    if newline != -1:
+        return newline + 1
+    return _char_boundary(data, pos, size)
+
+
+def iter_text_windows(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      overlap: int = DEFAULT_OVERLAP) -> Iterator[TextWindow]:
+    """
+    Liefert die Fenster eines UTF-8-Exports
+
+    Kerne schließen lückenlos aneinander an und enden, wenn möglich, an
+    Zeilengrenzen. Zu jedem Zeitpunkt ist nur ein Fenster dekodiert.
+
+    Args:
+        chunk_size: Kern-Größe in Bytes
+        overlap: Überlappung in Bytes (größer als der längste Treffer + Kontext)
+    """
+    chunk_size = max(1, chunk_size)
+    overlap = max(0, overlap)
+
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            core_start = 0
+            char_offset = 0
+            while core_start < size:
+                core_end = _boundary_after(data, core_start + chunk_size, size, overlap + 1)
+                left = _boundary_before(data, core_start - overlap, size, overlap + 1) if overlap else core_start
+                left = min(left, core_start)
+                right = _boundary_after(data, core_end + overlap, size, overlap + 1) if overlap else core_end
+
+                left_chars = len(_decode(data[left:core_start]))
+                right_chars = len(_decode(data[core_end:right]))
+                text = _decode(data[left:right])
+                core_chars = len(text) - left_chars - right_chars
+
+                yield TextWindow(text, char_offset - left_chars, left_chars, left_chars + core_chars)
+
+                char_offset += core_chars
+                core_start = core_end
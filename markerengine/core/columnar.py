@@ -0,0 +1,185 @@
+"""
+MarkerEngine Columnar - Treffer als Spalten-Tabelle für Auswertungen
+Die Treffer eines AnalysisResult werden in kompakte Spalten überführt
+(Marker-ID und Ebene kategorial, Offsets als int64, Nachrichten-Index und
+Sender-ID als int32, Konfidenz als float32) und als Parquet (pyarrow) bzw.
+ohne pyarrow als NumPy-.npz geschrieben.
+"""
+import json
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .chat_parser import NO_SENDER
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+LEVELS = ('atomic', 'semantic', 'cluster', 'meta')
+
+
+class HitColumns:
+    """
+    Spaltenweise Treffer-Tabelle (wie MessageTable in kompakten Arrays)
+
+    Pro Treffer i:
+        marker_codes[i]    Index in marker_ids
+        level_codes[i]     Index in LEVELS
+        starts[i]/ends[i]  Zeichen-Offsets
+        message_index[i]   Nachricht des Treffer-Starts, -1 wenn keine
+        sender_ids[i]      Index in senders, NO_SENDER für Systemzeilen
+        confidence[i]      float32
+    """
+
+    def __init__(self):
+        self.marker_codes = array('i')
+        self.level_codes = array('b')
+        self.starts = array('q')
+        self.ends = array('q')
+        self.message_index = array('i')
+        self.sender_ids = array('i')
+        self.confidence = array('f')
+        self.marker_ids: List[str] = []
+        self.senders: List[str] = []
+        self._marker_index: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def marker_code(self, marker_id: str) -> int:
+        code = self._marker_index.get(marker_id)
+        if code is None:
+            code = len(self.marker_ids)
+            self._marker_index[marker_id] = code
+            self.marker_ids.append(marker_id)
+        return code
+
+    def metadata(self) -> Dict[str, Any]:
+        """Kategorien der kodierten Spalten"""
+        return {'marker_ids': self.marker_ids, 'levels': list(LEVELS), 'senders': self.senders}
+
+
+def hit_columns(result, levels: Iterable[str] = LEVELS) -> HitColumns:
+    """Überführt die Treffer eines AnalysisResult in eine HitColumns-Tabelle"""
+    columns = HitColumns()
+    messages = result.messages
+    if messages is not None:
+        columns.senders = list(messages.senders)
+
+    for level in levels:
+        level_code = LEVELS.index(level)
+        for hit in getattr(result, f'{level}_hits'):
+            message = messages.message_index(hit.position_start) if messages is not None else -1
+            columns.marker_codes.append(columns.marker_code(hit.marker_id))
+            columns.level_codes.append(level_code)
+            columns.starts.append(hit.position_start)
+            columns.ends.append(hit.position_end)
+            columns.message_index.append(message)
+            columns.sender_ids.append(messages.sender_ids[message] if message >= 0 else NO_SENDER)
+            columns.confidence.append(hit.confidence)
+    return columns
+
+
+def to_arrow(columns: HitColumns) -> 'pa.Table':
+    """Arrow-Tabelle (Puffer der Arrays werden ohne Kopie übernommen)"""
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow wird für den Arrow/Parquet-Export benötigt")
+
+    length = len(columns)
+
+    def column(values: array, arrow_type) -> 'pa.Array':
+        return pa.Array.from_buffers(arrow_type, length, [None, pa.py_buffer(values)])
+
+    def categorical(codes: array, code_type, categories: List[str]) -> 'pa.DictionaryArray':
+        return pa.DictionaryArray.from_arrays(column(codes, code_type), pa.array(categories, pa.string()))
+
+    table = pa.table({
+        'marker_id': categorical(columns.marker_codes, pa.int32(), columns.marker_ids),
+        'level': categorical(columns.level_codes, pa.int8(), list(LEVELS)),
+        'start': column(columns.starts, pa.int64()),
+        'end': column(columns.ends, pa.int64()),
+        'message_index': column(columns.message_index, pa.int32()),
+        'sender_id': column(columns.sender_ids, pa.int32()),
+        'confidence': column(columns.confidence, pa.float32()),
+    })
+    return table.replace_schema_metadata({'markerengine': json.dumps(columns.metadata(), ensure_ascii=False)})
+
+
+def to_numpy(columns: HitColumns) -> Dict[str, 'np.ndarray']:
+    """Spalten als NumPy-Arrays (Kategorien als String-Arrays)"""
+    if not NUMPY_AVAILABLE:
+        raise ImportError("numpy wird für den NumPy-Export benötigt")
+
+    return {
+        'marker_code': np.frombuffer(columns.marker_codes, dtype=np.int32),
+        'level_code': np.frombuffer(columns.level_codes, dtype=np.int8),
+        'start': np.frombuffer(columns.starts, dtype=np.int64),
+        'end': np.frombuffer(columns.ends, dtype=np.int64),
+        'message_index': np.frombuffer(columns.message_index, dtype=np.int32),
+        'sender_id': np.frombuffer(columns.sender_ids, dtype=np.int32),
+        'confidence': np.frombuffer(columns.confidence, dtype=np.float32),
+        'marker_ids': np.array(columns.marker_ids, dtype=str),
+        'levels': np.array(LEVELS, dtype=str),
+        'senders': np.array(columns.senders, dtype=str),
+    }
+
+
+def to_dataframe(columns: HitColumns):
+    """pandas DataFrame mit kategorialer Marker-ID und Ebene"""
+    import pandas as pd
+
+    data = to_numpy(columns)
+    return pd.DataFrame({
+        'marker_id': pd.Categorical.from_codes(data['marker_code'], categories=columns.marker_ids),
+        'level': pd.Categorical.from_codes(data['level_code'], categories=list(LEVELS)),
+        'start': data['start'],
+        'end': data['end'],
+        'message_index': data['message_index'],
+        'sender_id': data['sender_id'],
+        'confidence': data['confidence'],
+    })
+
+
+def export_hits(result, path: str, format: Optional[str] = None,
+                levels: Iterable[str] = LEVELS) -> Path:
+    """
+    Schreibt die Treffer eines AnalysisResult spaltenweise
+
+    Args:
+        format: 'parquet' oder 'npz'; None = Parquet wenn pyarrow verfügbar,
+            sonst .npz (die Endung von path wird dann angepasst)
+
+    Returns:
+        Pfad der geschriebenen Datei
+    """
+    if format is None:
+        if PYARROW_AVAILABLE:
+            format = 'parquet'
+        elif NUMPY_AVAILABLE:
+            format = 'npz'
+        else:
+            raise ImportError("Für den Spalten-Export wird pyarrow oder numpy benötigt")
+
+    columns = hit_columns(result, levels)
+    path = Path(path)
+    if format == 'parquet':
+        table = to_arrow(columns)
+        path = path.with_suffix('.parquet')
+        pq.write_table(table, path)
+    elif format == 'npz':
+        data = to_numpy(columns)
+        path = path.with_suffix('.npz')
+        np.savez_compressed(path, **data)
+    else:
+        raise ValueError(f"Unbekanntes Format: {format}")
+    return path
@@ -7,23 +7,29 @@ import yaml
 import re
 import json
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterable, List, Any, Optional, Set, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import logging
 
-# Import unsere Module
-try:
-    from .whisper_integration import WhisperTranscriber, WhatsAppAudioProcessor
-    WHISPER_AVAILABLE = True
-except ImportError:
-    WHISPER_AVAILABLE = False
+# Import unsere Module (whisper/torch selbst werden erst bei der ersten
+# Sprachnachricht importiert, siehe WhisperTranscriber.model)
+from .whisper_integration import WHISPER_AVAILABLE, WhisperTranscriber, WhatsAppAudioProcessor
+from .transcription_scheduler import ProgressCallback
+if not WHISPER_AVAILABLE:
     print("⚠️ Whisper nicht verfügbar - Audio-Transkription deaktiviert")
 
+from .chunked_reader import iter_text_windows
+from .media_index import MediaIndex
 from .real_analyzer import RealMarkerAnalyzer, MarkerResult
+from .result_stream import NDJSONWriter, Sink
+from .registry import get_real_analyzer, shared_instance
 
 logger = logging.getLogger(__name__)
 
+# Marker-ID-Bestandteile, die als Key Finding gemeldet werden
+CRITICAL_MARKERS = ('SCAM', 'FRAUD', 'MANIPULATION', 'GASLIGHTING', 'MONEY', 'CRISIS')
+
 class CompleteWhatsAppAnalyzer:
     """
     Vollständiger Analyzer mit:
@@ -35,7 +41,10 @@ class CompleteWhatsAppAnalyzer:
     def __init__(self, 
                  markers_path: str = None,
                  whisper_model: str = "large-v3",
-                 enable_audio: bool = True):
+                 enable_audio: bool = True,
+                 preload_audio: bool = False,
+                 audio_workers: Optional[int] = 1,
+                 audio_progress: Optional[ProgressCallback] = None):
         """
         Initialisiert den kompletten Analyzer
         
@@ -43,51 +52,175 @@ class CompleteWhatsAppAnalyzer:
             markers_path: Pfad zu den Marker-YAML-Dateien
             whisper_model: Whisper Model Size
             enable_audio: Audio-Transkription aktivieren
+            preload_audio: Whisper sofort laden statt bei der ersten
+                Sprachnachricht (Standard: schneller Start, auch mit Audio)
+            audio_workers: Prozesse für die Transkription, jeder mit eigenem
+                Modell (1 = im aktuellen Prozess, None = CPU-Anzahl)
+            audio_progress: Wird mit (fertige, alle) Sprachnachrichten aufgerufen
         """
-        # Marker Analyzer
-        self.marker_analyzer = RealMarkerAnalyzer(markers_path)
+        # Marker Analyzer (prozess-weit geteilt, wird nur einmal geladen)
+        self.marker_analyzer = get_real_analyzer(markers_path)
         
-        # Whisper Transcriber (optional)
+        # Whisper Transcriber (optional, wird erst bei Bedarf geladen)
+        self.whisper_model = whisper_model
+        self.audio_workers = audio_workers
+        self.audio_progress = audio_progress
         self.whisper_enabled = enable_audio and WHISPER_AVAILABLE
+        self._audio_processor = None
         if self.whisper_enabled:
-            try:
-                self.transcriber = WhisperTranscriber(model_size=whisper_model)
-                self.audio_processor = WhatsAppAudioProcessor(self.transcriber)
-                logger.info("✅ Whisper v3 Audio-Transkription aktiviert")
-            except Exception as e:
-                logger.error(f"❌ Whisper konnte nicht geladen werden: {e}")
-                self.whisper_enabled = False
+            logger.info("✅ Whisper v3 Audio-Transkription aktiviert")
+            if preload_audio:
+                try:
+                    self.audio_processor.transcriber.model
+                except Exception as e:
+                    logger.error(f"❌ Whisper konnte nicht geladen werden: {e}")
+                    self.whisper_enabled = False
         else:
             logger.info("ℹ️ Audio-Transkription deaktiviert")
     
+    @property
+    def audio_processor(self) -> WhatsAppAudioProcessor:
+        """Audio-Processor mit prozess-weit geteiltem Transcriber (Modell lädt beim ersten Transkribieren)"""
+        if self._audio_processor is None:
+            self._audio_processor = WhatsAppAudioProcessor(
+                self.transcriber, workers=self.audio_workers, progress=self.audio_progress
+            )
+        return self._audio_processor
+    
+    @property
+    def transcriber(self) -> WhisperTranscriber:
+        return shared_instance(WhisperTranscriber, model_size=self.whisper_model)
+    
     def analyze_whatsapp_export(self, 
                                export_path: str,
-                               process_audio: bool = True) -> Dict[str, Any]:
+                               process_audio: bool = True,
+                               include_chat: bool = True) -> Dict[str, Any]:
         """
         Analysiert einen kompletten WhatsApp-Export
         
         Args:
             export_path: Pfad zum Export (Datei oder Ordner)
             process_audio: Audio-Dateien transkribieren
+            include_chat: Chat-Text unter 'enhanced_chat' zurückgeben; ohne
+                Transkriptionen und mit False wird der Export nie komplett
+                in den Speicher geladen
             
         Returns:
             Vollständige Analyse mit Audio + Markern
         """
+        chat_file, media_folder = self._locate_chat(export_path)
+        media = MediaIndex(media_folder)
+        
+        # Phase 1: Audio-Transkription (falls aktiviert)
+        enhanced_chat, audio_messages = self._transcribe_audio(chat_file, media, process_audio)
+        
+        # Phase 2: Marker-Analyse auf dem erweiterten Chat
+        logger.info("🔍 Starte Marker-Analyse...")
+        if enhanced_chat is not None:
+            marker_results = self.marker_analyzer.analyze_text(enhanced_chat)
+        else:
+            # Keine Audio-Transkription: Original-Chat blockweise per mmap
+            marker_results = self.marker_analyzer.analyze_file(str(chat_file))
+            if include_chat:
+                with open(chat_file, 'r', encoding='utf-8') as f:
+                    enhanced_chat = f.read()
+        
+        # Phase 3: Kombiniere Ergebnisse
+        complete_results = {
+            'timestamp': datetime.now().isoformat(),
+            'file_info': self._file_info(chat_file, media),
+            'audio_analysis': {
+                'enabled': self.whisper_enabled and process_audio,
+                'transcribed_messages': len(audio_messages),
+                'audio_details': [self._audio_detail(msg) for msg in audio_messages]
+            },
+            'marker_analysis': marker_results,
+            'enhanced_chat': enhanced_chat if include_chat else None,  # Der erweiterte Chat mit Transkriptionen
+            'summary': self._generate_summary(marker_results, audio_messages)
+        }
+        
+        return complete_results
+    
+    def stream_whatsapp_export(self,
+                               export_path: str,
+                               output: Sink,
+                               process_audio: bool = True,
+                               include_chat: bool = False) -> Dict[str, Any]:
+        """
+        Wie analyze_whatsapp_export(), schreibt die Ergebnisse aber als NDJSON
+        
+        Reihenfolge der Records: header, audio (pro Sprachnachricht), hit
+        (pro Treffer, nach Ebene), optional chat (Text in Teilstücken) und
+        zuletzt summary. Die Atomic Hits werden geschrieben, sobald ein Block
+        gescannt ist, und nicht gesammelt; ohne Transkriptionen wird auch der
+        Export nie komplett in den Speicher geladen.
+        
+        Args:
+            output: Dateipfad, File-Objekt, Socket oder 'tcp://host:port'
+            include_chat: Chat-Text (mit Transkriptionen) mitschreiben
+            
+        Returns:
+            Der summary-Record
+        """
+        chat_file, media_folder = self._locate_chat(export_path)
+        media = MediaIndex(media_folder)
+        
+        with NDJSONWriter(output) as writer:
+            writer.write(dict(type='header', timestamp=datetime.now().isoformat(),
+                              **self._file_info(chat_file, media)))
+            
+            enhanced_chat, audio_messages = self._transcribe_audio(chat_file, media, process_audio)
+            for msg in audio_messages:
+                writer.write(dict(type='audio', **self._audio_detail(msg)))
+            
+            logger.info("🔍 Starte Marker-Analyse...")
+            key_findings: Set[str] = set()
+            
+            def write_atomic(hits):
+                writer.write_hits('atomic', hits)
+                self._key_findings(hits, key_findings)
+            
+            # Atomic Hits werden blockweise geschrieben, sobald sie gefunden sind
+            if enhanced_chat is not None:
+                marker_results = self.marker_analyzer.analyze_text(enhanced_chat, on_hits=write_atomic)
+            else:
+                marker_results = self.marker_analyzer.analyze_file(str(chat_file), on_hits=write_atomic)
+            for level in ('semantic', 'cluster', 'meta'):
+                writer.write_hits(level, marker_results[f'{level}_hits'])
+                
+            if include_chat:
+                if enhanced_chat is not None:
+                    writer.write_chat([enhanced_chat])
+                else:
+                    writer.write_chat(window.core for window in iter_text_windows(str(chat_file)))
+            
+            summary = dict(
+                type='summary',
+                text_length=marker_results['text_length'],
+                statistics=marker_results['statistics'],
+                transcribed_messages=len(audio_messages),
+                **self._generate_summary(marker_results, audio_messages, key_findings)
+            )
+            writer.write(summary)
+        
+        return summary
+    
+    def _locate_chat(self, export_path: str) -> Tuple[Path, Path]:
+        """(Chat-Datei, Medien-Ordner) eines Exports (Datei oder Ordner)"""
         export_path = Path(export_path)
         
-        # Finde Chat-Datei
         if export_path.is_file():
-            chat_file = export_path
-            media_folder = export_path.parent
-        else:
-            # Suche _chat.txt im Ordner
-            chat_files = list(export_path.glob("*chat*.txt"))
-            if not chat_files:
-                raise FileNotFoundError(f"Keine Chat-Datei gefunden in {export_path}")
-            chat_file = chat_files[0]
-            media_folder = export_path
+            return export_path, export_path.parent
         
-        # Phase 1: Audio-Transkription (falls aktiviert)
+        # Suche _chat.txt im Ordner
+        chat_files = list(export_path.glob("*chat*.txt"))
+        if not chat_files:
+            raise FileNotFoundError(f"Keine Chat-Datei gefunden in {export_path}")
+        return chat_files[0], export_path
+    
+    def _transcribe_audio(self, chat_file: Path, media: MediaIndex,
+                          process_audio: bool) -> Tuple[Optional[str], List]:
+        """Chat mit eingefügten Transkriptionen (None ohne Audio) und die Sprachnachrichten"""
         enhanced_chat = None
         audio_messages = []
         
@@ -96,54 +229,39 @@ class CompleteWhatsAppAnalyzer:
             try:
                 enhanced_chat, audio_messages = self.audio_processor.process_chat_with_audio(
                     str(chat_file),
-                    str(media_folder)
+                    media_index=media
                 )
                 logger.info(f"✅ {len(audio_messages)} Sprachnachrichten transkribiert")
             except Exception as e:
                 logger.error(f"Fehler bei Audio-Transkription: {e}")
+                if self.transcriber.load_error is not None:
+                    # Whisper ließ sich nicht laden - nicht bei jedem Export erneut versuchen
+                    self.whisper_enabled = False
                 enhanced_chat = None
+                audio_messages = []
         
-        # Falls keine Audio-Transkription, nutze Original-Chat
-        if enhanced_chat is None:
-            with open(chat_file, 'r', encoding='utf-8') as f:
-                enhanced_chat = f.read()
-        
-        # Phase 2: Marker-Analyse auf dem erweiterten Chat
-        logger.info("🔍 Starte Marker-Analyse...")
-        marker_results = self.marker_analyzer.analyze_text(enhanced_chat)
-        
-        # Phase 3: Kombiniere Ergebnisse
-        complete_results = {
-            'timestamp': datetime.now().isoformat(),
-            'file_info': {
-                'chat_file': str(chat_file),
-                'media_folder': str(media_folder),
-                'size': os.path.getsize(chat_file),
-                'has_media': len(list(media_folder.glob("*.opus"))) > 0 or 
-                            len(list(media_folder.glob("*.mp4"))) > 0
-            },
-            'audio_analysis': {
-                'enabled': self.whisper_enabled and process_audio,
-                'transcribed_messages': len(audio_messages),
-                'audio_details': [
-                    {
-                        'timestamp': msg.timestamp,
-                        'sender': msg.sender,
-                        'transcription': msg.transcription,
-                        'confidence': msg.confidence
-                    } for msg in audio_messages
-                ] if audio_messages else []
-            },
-            'marker_analysis': marker_results,
-            'enhanced_chat': enhanced_chat,  # Der erweiterte Chat mit Transkriptionen
-            'summary': self._generate_summary(marker_results, audio_messages)
+        return enhanced_chat, audio_messages
+    
+    def _file_info(self, chat_file: Path, media: MediaIndex) -> Dict[str, Any]:
+        return {
+            'chat_file': str(chat_file),
+            'media_folder': str(media.media_path),
+            'size': os.path.getsize(chat_file),
+            'has_media': media.has_audio
+        }
+    
+    def _audio_detail(self, msg) -> Dict[str, Any]:
+        return {
+            'timestamp': msg.timestamp,
+            'sender': msg.sender,
+            'transcription': msg.transcription,
+            'confidence': msg.confidence
         }
-        
-        return complete_results
     
     def _generate_summary(self, 
                          marker_results: Dict[str, Any], 
-                         audio_messages: List) -> Dict[str, Any]:
+                         audio_messages: List,
+                         key_findings: Optional[Set[str]] = None) -> Dict[str, Any]:
         """Generiert eine Zusammenfassung der Analyse"""
         
         # Risk Assessment
@@ -164,16 +282,9 @@ class CompleteWhatsAppAnalyzer:
                 'transcription_quality': 'Gut' if avg_confidence > 0.8 else 'Mittel' if avg_confidence > 0.6 else 'Niedrig'
             }
         
-        # Key Findings
-        key_findings = []
-        
-        # Prüfe auf kritische Marker
-        critical_markers = ['SCAM', 'FRAUD', 'MANIPULATION', 'GASLIGHTING', 'MONEY', 'CRISIS']
-        for hit in marker_results.get('atomic_hits', []):
-            for critical in critical_markers:
-                if critical in hit.marker_id.upper():
-                    key_findings.append(f"⚠️ {critical}-Indikator gefunden")
-                    break
+        # Key Findings (beim Streamen schon während der Analyse gesammelt)
+        if key_findings is None:
+            key_findings = self._key_findings(marker_results.get('atomic_hits', []))
         
         return {
             'risk_assessment': {
@@ -182,10 +293,23 @@ class CompleteWhatsAppAnalyzer:
                 'high_risk_markers': marker_results['statistics'].get('high_risk_markers', 0)
             },
             'audio_summary': audio_summary,
-            'key_findings': list(set(key_findings)),  # Unique findings
+            'key_findings': list(key_findings),  # Unique findings
             'recommendations': self._generate_recommendations(risk_level, key_findings)
         }
     
+    def _key_findings(self, hits: Iterable, findings: Optional[Set[str]] = None) -> Set[str]:
+        """Sammelt die kritischen Marker der Treffer (in findings, falls übergeben)"""
+        if findings is None:
+            findings = set()
+        
+        # Prüfe auf kritische Marker
+        for hit in hits:
+            for critical in CRITICAL_MARKERS:
+                if critical in hit.marker_id.upper():
+                    findings.add(f"⚠️ {critical}-Indikator gefunden")
+                    break
+        return findings
+    
     def _generate_recommendations(self, risk_level: str, findings: List[str]) -> List[str]:
         """Generiert Empfehlungen basierend auf der Analyse"""
         recommendations = []
@@ -211,7 +335,9 @@ class CompleteWhatsAppAnalyzer:
 
 def analyze_whatsapp_complete(export_path: str, 
                             enable_audio: bool = True,
-                            whisper_model: str = "large-v3") -> Dict[str, Any]:
+                            whisper_model: str = "large-v3",
+                            output: Optional[Sink] = None,
+                            include_chat: bool = False) -> Dict[str, Any]:
     """
     Haupt-Funktion für komplette WhatsApp-Analyse
     
@@ -219,9 +345,12 @@ def analyze_whatsapp_complete(export_path: str,
         export_path: Pfad zum WhatsApp-Export
         enable_audio: Audio-Transkription aktivieren
         whisper_model: Whisper Model (tiny, base, small, medium, large, large-v3)
+        output: NDJSON-Ziel (Datei, Socket, 'tcp://host:port'); dann werden
+            die Ergebnisse gestreamt und nur der summary-Record zurückgegeben
+        include_chat: Beim Streamen den Chat-Text mitschreiben
         
     Returns:
-        Vollständige Analyse-Ergebnisse
+        Vollständige Analyse-Ergebnisse (bzw. summary-Record beim Streamen)
     """
     print("🚀 Starte komplette WhatsApp-Analyse...")
     print(f"📁 Export: {export_path}")
@@ -232,6 +361,13 @@ def analyze_whatsapp_complete(export_path: str,
         enable_audio=enable_audio
     )
     
+    if output is not None:
+        summary = analyzer.stream_whatsapp_export(export_path, output, include_chat=include_chat)
+        print("\n✅ Analyse abgeschlossen!")
+        print(f"📊 Risk Score: {summary['risk_assessment']['score']:.1f}/10")
+        print(f"🎯 Marker gefunden: {summary['statistics']['total_atomic_hits']}")
+        return summary
+    
     results = analyzer.analyze_whatsapp_export(export_path)
     
     print("\n✅ Analyse abgeschlossen!")
@@ -249,17 +385,15 @@ if __name__ == "__main__":
     test_export = "/path/to/whatsapp/export"
     
     try:
-        results = analyze_whatsapp_complete(
+        # Ergebnisse werden direkt als NDJSON gestreamt
+        analyze_whatsapp_complete(
             test_export,
             enable_audio=True,
-            whisper_model="large-v3"
+            whisper_model="large-v3",
+            output="analysis_results.ndjson"
         )
-        
-        # Speichere Ergebnisse
-        with open("analysis_results.json", "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=2, ensure_ascii=False, default=str)
             
-        print("\n📄 Ergebnisse gespeichert in: analysis_results.json")
+        print("\n📄 Ergebnisse gespeichert in: analysis_results.ndjson")
         
     except Exception as e:
         print(f"❌ Fehler: {e}")
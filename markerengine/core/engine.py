@@ -8,28 +8,129 @@ import os
 import re
 import yaml
 import json
-from typing import Dict, List, Set, Any, Optional, Tuple
+from typing import Callable, Dict, List, Set, Any, Optional, Tuple
 from pathlib import Path
 from dataclasses import dataclass, field
 from collections import defaultdict
 import logging
+import threading
+import time
 from datetime import datetime
 
+from .chat_parser import ChatParser, MessageTable, parse_chat
+from .chunked_reader import DEFAULT_CHUNK_SIZE, DEFAULT_OVERLAP, iter_text_windows
+from .hierarchy import MarkerHierarchy
+from .hit_stats import FLAG_EMOTIONAL, FLAG_NEGATIVE, FLAG_POSITIVE, MarkerFlags
+from .instrumentation import Instrumentation, MetricsCallback
+from .matcher import PhraseMatcher
+from .marker_cache import MarkerCache
+from .marker_loader import load_marker_directories
+from .proximity import ProximityPattern, TokenIndex
+from .spans import POLICIES, SCOPES, resolve_overlaps
+from .windows import cooccurrence_windows, merge_events
+
 # Logging konfigurieren
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Standard-Pfad zum echten Marker-Ordner (Marker/ im Projekt-Wurzelverzeichnis)
+DEFAULT_MARKER_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "Marker"
+)
+
+# Maximal erlaubte Wörter zwischen zwei Keywords eines Beispiels
+# (deckt die bisherigen 20 Zeichen Abstand ab)
+KEYWORD_MAX_GAP = 4
+
+# on_phase-Callback von analyze(): (Ebene, Treffer der Phase)
+PhaseCallback = Callable[[str, List['MarkerHit']], None]
+
 
-@dataclass
 class MarkerHit:
-    """Repräsentiert einen Marker-Treffer"""
-    marker_id: str
-    marker_name: str
-    text: str
-    position_start: int
-    position_end: int
-    confidence: float = 1.0
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    """
+    Repräsentiert einen Marker-Treffer
+    
+    Kompakt (__slots__): Atomic Hits aus from_source() halten nur Offsets und
+    Referenzen auf Quelltext und Marker-Tabelle; Text und Metadaten werden
+    erst beim Zugriff erzeugt.
+    """
+    
+    __slots__ = ('marker_id', 'marker_name', 'position_start', 'position_end',
+                 'confidence', '_text', '_metadata', '_source', '_shared_metadata')
+    
+    def __init__(self, marker_id: str, marker_name: str, text: str,
+                 position_start: int, position_end: int, confidence: float = 1.0,
+                 metadata: Optional[Dict[str, Any]] = None):
+        self.marker_id = marker_id
+        self.marker_name = marker_name
+        self.position_start = position_start
+        self.position_end = position_end
+        self.confidence = confidence
+        self._text = text
+        self._metadata = metadata if metadata is not None else {}
+        self._source = None
+        self._shared_metadata = None
+        
+    @classmethod
+    def from_source(cls, marker_id: str, marker_name: str, source: Tuple[str, int],
+                    position_start: int, position_end: int,
+                    shared_metadata: Dict[str, Any], confidence: float = 1.0) -> 'MarkerHit':
+        """
+        Treffer, dessen Text aus source = (Text, Offset des Texts) gelesen wird
+        
+        shared_metadata gehört allen Treffern eines Markers und wird erst bei
+        Zugriff auf .metadata kopiert.
+        """
+        hit = cls.__new__(cls)
+        hit.marker_id = marker_id
+        hit.marker_name = marker_name
+        hit.position_start = position_start
+        hit.position_end = position_end
+        hit.confidence = confidence
+        hit._text = None
+        hit._metadata = None
+        hit._source = source
+        hit._shared_metadata = shared_metadata
+        return hit
+        
+    @property
+    def text(self) -> str:
+        if self._text is None and self._source is not None:
+            source, offset = self._source
+            return source[self.position_start - offset:self.position_end - offset]
+        return self._text
+        
+    @text.setter
+    def text(self, value: str):
+        self._text = value
+        
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        if self._metadata is None:
+            self._metadata = dict(self._shared_metadata or {})
+        return self._metadata
+        
+    @metadata.setter
+    def metadata(self, value: Dict[str, Any]):
+        self._metadata = value
+        
+    def _fields(self) -> tuple:
+        return (self.marker_id, self.marker_name, self.text, self.position_start,
+                self.position_end, self.confidence, self.metadata)
+        
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+        
+    __hash__ = None
+        
+    def __repr__(self) -> str:
+        return (f"MarkerHit(marker_id={self.marker_id!r}, marker_name={self.marker_name!r}, "
+                f"text={self.text!r}, position_start={self.position_start!r}, "
+                f"position_end={self.position_end!r}, confidence={self.confidence!r}, "
+                f"metadata={self.metadata!r})")
     
 
 @dataclass
@@ -41,6 +142,25 @@ class AnalysisResult:
     meta_hits: List[MarkerHit] = field(default_factory=list)
     statistics: Dict[str, Any] = field(default_factory=dict)
     insights: List[Dict[str, Any]] = field(default_factory=list)
+    messages: Optional[MessageTable] = None
+    
+    def message_index(self, hit: MarkerHit) -> int:
+        """Index der Chat-Nachricht eines Treffers (-1 wenn keine Nachricht zugeordnet)"""
+        if self.messages is None:
+            return -1
+        return self.messages.message_index(hit.position_start)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-fähige Zusammenfassung (Format der CLI-Ausgabe)"""
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'statistics': self.statistics,
+            'atomic_hits': [{'id': h.marker_id, 'text': h.text} for h in self.atomic_hits],
+            'semantic_hits': [{'id': h.marker_id, 'name': h.marker_name} for h in self.semantic_hits],
+            'cluster_hits': [{'id': h.marker_id, 'name': h.marker_name} for h in self.cluster_hits],
+            'meta_hits': [{'id': h.marker_id, 'name': h.marker_name} for h in self.meta_hits],
+            'insights': self.insights
+        }
     
 
 class MarkerEngine:
@@ -52,16 +172,48 @@ class MarkerEngine:
     4. Meta (MM_)
     """
     
-    def __init__(self, marker_base_path: str = None):
-        """Initialisiert die Engine mit dem Marker-Verzeichnis"""
+    def __init__(self, marker_base_path: str = None, use_cache: bool = True,
+                 load_workers: Optional[int] = None, instrument: bool = False,
+                 metrics_callback: Optional[MetricsCallback] = None,
+                 overlap_policy: str = 'longest', overlap_scope: str = 'marker',
+                 scan_workers: Optional[int] = 1):
+        """
+        Initialisiert die Engine mit dem Marker-Verzeichnis
+        
+        Args:
+            marker_base_path: Pfad zum Marker-Ordner (Standard: /Marker/)
+            use_cache: Geparste YAMLs aus dem persistenten Marker-Cache laden
+            load_workers: Prozesse für das YAML-Parsing (None = CPU-Anzahl, 1 = seriell)
+            instrument: Zeiten und Zähler pro Phase in statistics['phases'] ablegen
+            metrics_callback: Wird mit den PhaseMetrics jeder beendeten Phase
+                aufgerufen (schaltet die Messung ein)
+            overlap_policy: Welcher überlappende Atomic Hit bleibt (siehe spans.POLICIES)
+            overlap_scope: 'marker' (exakte und Keyword-Variante desselben Markers
+                zählen einmal) oder 'global' (auch Marker untereinander)
+            scan_workers: Prozesse für die Atomic-Erkennung großer Texte
+                (1 = seriell, None = CPU-Anzahl; siehe parallel.ParallelScanner)
+        """
         if marker_base_path is None:
             # Standard-Pfad zum echten Marker-Ordner
-            marker_base_path = os.path.join(
-                os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
-                "Marker"
-            )
+            marker_base_path = DEFAULT_MARKER_PATH
+            
+        if overlap_policy not in POLICIES:
+            raise ValueError(f"Unbekannte Overlap-Policy: {overlap_policy}")
+        if overlap_scope not in SCOPES:
+            raise ValueError(f"Unbekannter Overlap-Scope: {overlap_scope}")
+        self.overlap_policy = overlap_policy
+        self.overlap_scope = overlap_scope
             
         self.marker_base_path = Path(marker_base_path)
+        self._marker_cache = MarkerCache(self.marker_base_path, enabled=use_cache)
+        self.load_workers = load_workers
+        self.scan_workers = scan_workers
+        self._scanner = None
+        # Geteilte Engines (Registry): der Pool wird nur einmal gestartet
+        self._scanner_lock = threading.Lock()
+        
+        # Parse-Zeit pro Marker-Datei (LoadedMarkerFile) des letzten Ladevorgangs
+        self.load_report = []
         
         # Marker-Sammlungen für jede Ebene
         self.atomic_markers = {}
@@ -69,101 +221,170 @@ class MarkerEngine:
         self.cluster_markers = {}
         self.meta_markers = {}
         
+        # Marker-Tabelle der Atomic Markers: ID -> (Name, geteilte Metadaten)
+        self.atomic_table = {}
+        
         # Kompilierte Regex-Patterns für Performance
         self.compiled_patterns = {}
         
+        # Exakte Phrasen aller Marker in einem Automaten (ein Scan pro Text),
+        # Keyword-Patterns bleiben als Regex-Fallback
+        self.phrase_matcher = PhraseMatcher()
+        self.fallback_patterns = {}
+        
+        # Abhängigkeitsgraph atomic -> semantic -> cluster -> meta (Bitsets)
+        self.hierarchy = None
+        
+        # Kategorie-Flags pro Marker-ID für die Statistiken (beim Laden berechnet)
+        self.marker_flags = MarkerFlags()
+        
+        # Messung pro Phase (ausgeschaltet ein Null-Objekt ohne Kosten)
+        self.instrumentation = Instrumentation(
+            enabled=instrument or metrics_callback is not None,
+            callback=metrics_callback
+        )
+        
         # Lade alle Marker
-        self._load_all_markers()
+        metrics = self.instrumentation.run()
+        with metrics.phase('load') as phase:
+            self._load_all_markers()
+            self.marker_flags.register(self._all_marker_ids())
+            if metrics.enabled:
+                phase.count(
+                    hits=(len(self.atomic_markers) + len(self.semantic_markers) +
+                          len(self.cluster_markers) + len(self.meta_markers)),
+                    bytes_scanned=sum(f.size for f in self.load_report)
+                )
+        self.load_metrics = metrics.as_dict()
         
     def _load_all_markers(self):
         """Lädt alle Marker aus den YAML-Dateien"""
         logger.info(f"Lade Marker aus: {self.marker_base_path}")
         
+        marker_files = load_marker_directories(
+            self.marker_base_path,
+            ('atomic', 'semantic', 'cluster', 'meta_marker'),
+            cache=self._marker_cache,
+            workers=self.load_workers
+        )
+        self.load_report = [f for files in marker_files.values() for f in files]
+        
         # Atomic Markers
-        atomic_path = self.marker_base_path / "atomic"
-        if atomic_path.exists():
-            for yaml_file in atomic_path.glob("*.yaml"):
-                try:
-                    with open(yaml_file, 'r', encoding='utf-8') as f:
-                        data = yaml.safe_load(f)
-                        if data:
-                            # Verschiedene Marker-Formate unterstützen
-                            marker_id = None
-                            examples = None
-                            
-                            # Format 1: marker_name auf Top-Level
-                            if 'marker_name' in data:
-                                marker_id = data['marker_name']
-                                examples = data.get('beispiele', [])
-                            
-                            # Format 2: marker.name
-                            elif 'marker' in data and isinstance(data['marker'], dict):
-                                marker_id = data['marker'].get('name') or data['marker'].get('id')
-                                examples = data['marker'].get('examples', [])
-                                # Füge marker_name für konsistenten Zugriff hinzu
-                                data['marker_name'] = marker_id
-                            
-                            if marker_id:
-                                self.atomic_markers[marker_id] = data
-                                
-                                # Kompiliere Regex-Patterns aus den Beispielen
-                                if examples:
-                                    patterns = self._create_patterns_from_examples(examples)
-                                    if patterns:
-                                        self.compiled_patterns[marker_id] = patterns
-                                
-                except Exception as e:
-                    logger.error(f"Fehler beim Laden von {yaml_file}: {e}")
+        for marker_file in marker_files['atomic']:
+            try:
+                data = marker_file.result()
+                if data:
+                    # Verschiedene Marker-Formate unterstützen
+                    marker_id = None
+                    examples = None
                     
+                    # Format 1: marker_name auf Top-Level
+                    if 'marker_name' in data:
+                        marker_id = data['marker_name']
+                        examples = data.get('beispiele', [])
+                    
+                    # Format 2: marker.name
+                    elif 'marker' in data and isinstance(data['marker'], dict):
+                        marker_id = data['marker'].get('name') or data['marker'].get('id')
+                        examples = data['marker'].get('examples', [])
+                        # Füge marker_name für konsistenten Zugriff hinzu
+                        data['marker_name'] = marker_id
+                    
+                    if marker_id:
+                        self.atomic_markers[marker_id] = data
+                        self.atomic_table[marker_id] = (
+                            data.get('marker_name', marker_id),
+                            {
+                                'beschreibung': data.get('beschreibung', ''),
+                                'kategorie': data.get('kategorie', 'UNCATEGORIZED')
+                            }
+                        )
+                        
+                        # Kompiliere Regex-Patterns aus den Beispielen
+                        if examples:
+                            self._register_patterns(marker_id, examples)
+                        
+            except Exception as e:
+                logger.error(f"Fehler beim Laden von {marker_file.path}: {e}")
+                
+        self.phrase_matcher.build()
         logger.info(f"Geladen: {len(self.atomic_markers)} Atomic Markers")
         
         # Semantic Markers
-        semantic_path = self.marker_base_path / "semantic"
-        if semantic_path.exists():
-            for yaml_file in semantic_path.glob("*.yaml"):
-                try:
-                    with open(yaml_file, 'r', encoding='utf-8') as f:
-                        data = yaml.safe_load(f)
-                        if data:
-                            marker_id = data.get('id', yaml_file.stem)
-                            self.semantic_markers[marker_id] = data
-                except Exception as e:
-                    logger.error(f"Fehler beim Laden von {yaml_file}: {e}")
-                    
+        for marker_file in marker_files['semantic']:
+            try:
+                data = marker_file.result()
+                if data:
+                    marker_id = data.get('id', marker_file.path.stem)
+                    self.semantic_markers[marker_id] = data
+            except Exception as e:
+                logger.error(f"Fehler beim Laden von {marker_file.path}: {e}")
+                
         logger.info(f"Geladen: {len(self.semantic_markers)} Semantic Markers")
         
         # Cluster Markers
-        cluster_path = self.marker_base_path / "cluster"
-        if cluster_path.exists():
-            for yaml_file in cluster_path.glob("*.yaml"):
-                try:
-                    with open(yaml_file, 'r', encoding='utf-8') as f:
-                        data = yaml.safe_load(f)
-                        if data:
-                            marker_id = data.get('id', yaml_file.stem)
-                            self.cluster_markers[marker_id] = data
-                except Exception as e:
-                    logger.error(f"Fehler beim Laden von {yaml_file}: {e}")
-                    
+        for marker_file in marker_files['cluster']:
+            try:
+                data = marker_file.result()
+                if data:
+                    marker_id = data.get('id', marker_file.path.stem)
+                    self.cluster_markers[marker_id] = data
+            except Exception as e:
+                logger.error(f"Fehler beim Laden von {marker_file.path}: {e}")
+                
         logger.info(f"Geladen: {len(self.cluster_markers)} Cluster Markers")
         
         # Meta Markers
-        meta_path = self.marker_base_path / "meta_marker"
-        if meta_path.exists():
-            for yaml_file in meta_path.glob("*.yaml"):
-                try:
-                    with open(yaml_file, 'r', encoding='utf-8') as f:
-                        data = yaml.safe_load(f)
-                        if data:
-                            marker_id = data.get('id', yaml_file.stem)
-                            self.meta_markers[marker_id] = data
-                except Exception as e:
-                    logger.error(f"Fehler beim Laden von {yaml_file}: {e}")
-                    
+        for marker_file in marker_files['meta_marker']:
+            try:
+                data = marker_file.result()
+                if data:
+                    marker_id = data.get('id', marker_file.path.stem)
+                    self.meta_markers[marker_id] = data
+            except Exception as e:
+                logger.error(f"Fehler beim Laden von {marker_file.path}: {e}")
+                
         logger.info(f"Geladen: {len(self.meta_markers)} Meta Markers")
         
+        self.hierarchy = MarkerHierarchy(
+            self.atomic_markers, self.semantic_markers,
+            self.cluster_markers, self.meta_markers
+        )
+        
+        # Pattern-Durchläufe pro Atomic-Scan: Automat + Keyword-Fallbacks
+        self.patterns_per_scan = (
+            (1 if self.phrase_matcher else 0) +
+            sum(len(patterns) for patterns in self.fallback_patterns.values())
+        )
+        
+        self._marker_cache.save()
+        
+    def _register_patterns(self, marker_id: str, examples: List[str]):
+        """Verteilt die Pattern-Varianten eines Markers auf Automat und Regex-Fallback"""
+        variants = self._create_pattern_variants(examples)
+        if not variants:
+            return
+            
+        self.compiled_patterns[marker_id] = [pattern for pattern, _ in variants]
+        
+        for pattern_index, (pattern, phrase) in enumerate(variants):
+            if phrase is not None:
+                self.phrase_matcher.add(phrase, (marker_id, pattern_index))
+            else:
+                self.fallback_patterns.setdefault(marker_id, []).append((pattern_index, pattern))
+                
     def _create_patterns_from_examples(self, examples: List[str]) -> List[re.Pattern]:
         """Erstellt Regex-Patterns aus Beispielen"""
+        return [pattern for pattern, _ in self._create_pattern_variants(examples)]
+        
+    def _create_pattern_variants(self, examples: List[str]) -> List[Tuple[Any, Optional[str]]]:
+        """
+        Erstellt Regex-Patterns aus Beispielen
+        
+        Returns:
+            Liste von (Pattern, Phrase) - Phrase ist gesetzt, wenn das Pattern
+            ein exaktes Literal ist und vom PhraseMatcher übernommen werden kann
+        """
         patterns = []
         
         for example in examples:
@@ -183,141 +404,351 @@ class MarkerEngine:
             
             # 1. Exakte Phrase
             escaped = re.escape(clean_example)
-            patterns_to_try.append(escaped)
+            patterns_to_try.append((escaped, clean_example))
             
             # 2. Wichtige Schlüsselwörter extrahieren (länger als 3 Zeichen)
             words = clean_example.split()
             keywords = [w for w in words if len(w) > 3 and not w.lower() in ['und', 'oder', 'aber', 'doch', 'wenn', 'dass', 'weil']]
             
-            # 3. Erstelle flexibleres Pattern mit Schlüsselwörtern
-            if len(keywords) >= 2:
-                # Erlaube bis zu 3 Wörter zwischen Keywords
-                keyword_pattern = r'\b' + r'\b.{0,20}\b'.join(re.escape(kw) for kw in keywords[:3]) + r'\b'
-                patterns_to_try.append(keyword_pattern)
-            
             # Kompiliere alle Pattern-Varianten
-            for pattern_str in patterns_to_try:
+            for pattern_str, phrase in patterns_to_try:
                 try:
                     compiled = re.compile(pattern_str, re.IGNORECASE | re.DOTALL)
-                    patterns.append(compiled)
+                    patterns.append((compiled, phrase))
                 except Exception as e:
                     logger.debug(f"Konnte Pattern nicht kompilieren: {pattern_str} - {e}")
                     
+            # 3. Erstelle flexibleres Pattern mit Schlüsselwörtern
+            if len(keywords) >= 2:
+                # Erlaube bis zu KEYWORD_MAX_GAP Wörter zwischen Keywords (Token-Abstand statt .{0,20})
+                keyword_pattern = ProximityPattern(keywords[:3], max_gap=KEYWORD_MAX_GAP)
+                if len(keyword_pattern.tokens) >= 2:
+                    patterns.append((keyword_pattern, None))
+                    
         return patterns
         
-    def analyze(self, text: str) -> AnalysisResult:
+    def analyze(self, text: str, on_phase: Optional[PhaseCallback] = None) -> AnalysisResult:
         """
         Führt die komplette vierstufige Analyse durch
+        
+        Args:
+            on_phase: Wird nach jeder Phase mit (Ebene, Treffer) aufgerufen,
+                z.B. NDJSONWriter.write_hits zum Streamen der Ergebnisse
         """
         logger.info("Starte Analyse...")
         result = AnalysisResult()
+        metrics = self.instrumentation.run()
+        text_bytes = len(text.encode('utf-8')) if metrics.enabled else 0
+        
+        # Nachrichten-Tabelle (Offsets, Zeitstempel, Sender) für Trefferzuordnung
+        with metrics.phase('parse', text_bytes):
+            result.messages = parse_chat(text)
         
         # Phase 1: Atomic Marker Detection
         logger.info("Phase 1: Atomic Marker Detection")
-        atomic_hits = self._detect_atomic_markers(text)
+        with metrics.phase('atomic', text_bytes) as phase:
+            if self._use_scanner(text):
+                atomic_hits = self._detect_atomic_markers_parallel(text, result.messages)
+            else:
+                atomic_hits = self._detect_atomic_markers(text)
+            phase.count(hits=len(atomic_hits), regex_evaluations=self.patterns_per_scan)
+        result.atomic_hits = atomic_hits
+        logger.info(f"Gefunden: {len(atomic_hits)} Atomic Hits")
+        if on_phase is not None:
+            on_phase('atomic', atomic_hits)
+        
+        return self._analyze_levels(result, len(text), metrics, on_phase)
+        
+    def analyze_file(self, file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     overlap: int = DEFAULT_OVERLAP,
+                     on_phase: Optional[PhaseCallback] = None) -> AnalysisResult:
+        """
+        Wie analyze(), liest den Export aber per mmap in überlappenden Blöcken
+        
+        Der Speicherbedarf hängt von chunk_size ab, nicht von der Dateigröße;
+        Atomic Hits halten nur ihren eigenen Text statt einer Referenz auf
+        den Block. Positionen sind Zeichen-Offsets im Gesamttext.
+        
+        Args:
+            chunk_size: Block-Größe in Bytes (siehe chunked_reader)
+            overlap: Überlappung in Bytes, größer als der längste Treffer
+            on_phase: Wird nach jeder Phase mit (Ebene, Treffer) aufgerufen
+        """
+        logger.info(f"Starte Analyse (blockweise): {file_path}")
+        result = AnalysisResult()
+        metrics = self.instrumentation.run()
+        file_bytes = os.path.getsize(file_path) if metrics.enabled else 0
+        
+        # Phase 1 (inkl. Lesen und Nachrichten-Tabelle) Block für Block
+        logger.info("Phase 1: Atomic Marker Detection")
+        parser = ChatParser()
+        spans = []
+        text_length = 0
+        with metrics.phase('atomic', file_bytes) as phase:
+            for window in iter_text_windows(file_path, chunk_size, overlap):
+                parser.feed_chunk(window.core)
+                offset = window.offset
+                for marker_id, pattern_index, start, end in self._atomic_spans(window.text):
+                    if window.owns(start):
+                        spans.append((marker_id, pattern_index, start + offset, end + offset,
+                                      window.text[start:end]))
+                text_length = window.end_offset
+                phase.count(regex_evaluations=self.patterns_per_scan)
+            result.messages = parser.flush().table
+            
+            spans.sort(key=self._atomic_order())
+            atomic_hits = []
+            for marker_id, _, start, end, hit_text in spans:
+                marker_name, shared_metadata = self.atomic_table[marker_id]
+                atomic_hits.append(MarkerHit.from_source(
+                    marker_id, marker_name, (hit_text, start), start, end, shared_metadata
+                ))
+            phase.count(hits=len(atomic_hits))
         result.atomic_hits = atomic_hits
         logger.info(f"Gefunden: {len(atomic_hits)} Atomic Hits")
+        if on_phase is not None:
+            on_phase('atomic', atomic_hits)
+        
+        return self._analyze_levels(result, text_length, metrics, on_phase)
+        
+    def _analyze_levels(self, result: AnalysisResult, text_length: int, metrics,
+                        on_phase: Optional[PhaseCallback] = None) -> AnalysisResult:
+        """Phasen 2-4, Statistiken und Insights auf Basis der Atomic Hits"""
+        atomic_hits = result.atomic_hits
         
         # Phase 2: Semantic Marker Evaluation
         logger.info("Phase 2: Semantic Marker Evaluation")
-        semantic_hits = self._evaluate_semantic_markers(text, atomic_hits)
+        with metrics.phase('semantic') as phase:
+            semantic_hits = self._semantic_hits(atomic_hits, result.messages, text_length)
+            phase.count(hits=len(semantic_hits))
         result.semantic_hits = semantic_hits
         logger.info(f"Gefunden: {len(semantic_hits)} Semantic Hits")
+        if on_phase is not None:
+            on_phase('semantic', semantic_hits)
         
         # Phase 3: Cluster Detection
         logger.info("Phase 3: Cluster Detection")
-        cluster_hits = self._detect_clusters(text, semantic_hits)
+        with metrics.phase('cluster') as phase:
+            cluster_hits = self._cluster_hits(semantic_hits, text_length)
+            phase.count(hits=len(cluster_hits))
         result.cluster_hits = cluster_hits
         logger.info(f"Gefunden: {len(cluster_hits)} Cluster Hits")
+        if on_phase is not None:
+            on_phase('cluster', cluster_hits)
         
         # Phase 4: Meta Marker Triggering
         logger.info("Phase 4: Meta Marker Triggering")
-        meta_hits = self._trigger_meta_markers(cluster_hits)
+        with metrics.phase('meta') as phase:
+            meta_hits = self._trigger_meta_markers(cluster_hits)
+            phase.count(hits=len(meta_hits))
         result.meta_hits = meta_hits
         logger.info(f"Gefunden: {len(meta_hits)} Meta Hits")
+        if on_phase is not None:
+            on_phase('meta', meta_hits)
         
-        # Statistiken berechnen
-        result.statistics = self._calculate_statistics(result)
+        # Statistiken berechnen (ein Zähl-Durchlauf pro Ebene für Statistiken und Insights)
+        counts = self._level_counts(result)
+        result.statistics = self._calculate_statistics(result, counts)
+        if metrics.enabled:
+            result.statistics['phases'] = metrics.as_dict()
+            result.statistics['load'] = self.load_metrics.get('load')
         
         # Insights generieren
-        result.insights = self._generate_insights(result)
+        result.insights = self._generate_insights(result, counts)
         
         return result
         
-    def _detect_atomic_markers(self, text: str) -> List[MarkerHit]:
-        """Phase 1: Erkennt Atomic Markers im Text"""
-        hits = []
+    def session(self):
+        """Inkrementelle Analyse eines wachsenden Chats (siehe IncrementalAnalyzer)"""
+        from .incremental import IncrementalAnalyzer
+        return IncrementalAnalyzer(self)
         
-        for marker_id, patterns in self.compiled_patterns.items():
-            marker_data = self.atomic_markers.get(marker_id, {})
-            
-            for pattern in patterns:
-                for match in pattern.finditer(text):
-                    hit = MarkerHit(
-                        marker_id=marker_id,
-                        marker_name=marker_data.get('marker_name', marker_id),
-                        text=match.group(0),
-                        position_start=match.start(),
-                        position_end=match.end(),
-                        metadata={
-                            'beschreibung': marker_data.get('beschreibung', ''),
-                            'kategorie': marker_data.get('kategorie', 'UNCATEGORIZED')
-                        }
-                    )
-                    hits.append(hit)
+    def _detect_atomic_markers(self, text: str, offset: int = 0,
+                               profiler=None) -> List[MarkerHit]:
+        """
+        Phase 1: Erkennt Atomic Markers im Text
+        
+        Args:
+            offset: Wird auf alle Positionen addiert (Text ist ein Ausschnitt)
+            profiler: Optionaler MarkerProfiler (Laufzeit/Treffer pro Pattern)
+        """
+        spans = self._atomic_spans(text, profiler)
+                    
+        # Gleiche Reihenfolge wie Marker -> Pattern -> Position
+        spans.sort(key=self._atomic_order())
+        
+        # Treffer referenzieren Text und Marker-Tabelle statt Kopien zu halten
+        source = (text, offset)
+        hits = []
+        for marker_id, _, start, end in spans:
+            marker_name, shared_metadata = self.atomic_table[marker_id]
+            hits.append(MarkerHit.from_source(
+                marker_id, marker_name, source,
+                start + offset, end + offset, shared_metadata
+            ))
                     
         return hits
         
-    def _evaluate_semantic_markers(self, text: str, atomic_hits: List[MarkerHit]) -> List[MarkerHit]:
+    def _use_scanner(self, text: str) -> bool:
+        """Lohnt sich der Prozess-Pool für diesen Text?"""
+        from .parallel import PARALLEL_MIN_CHARS
+        return self.scan_workers != 1 and len(text) >= PARALLEL_MIN_CHARS
+        
+    def _detect_atomic_markers_parallel(self, text: str,
+                                        messages: Optional[MessageTable] = None) -> List[MarkerHit]:
+        """
+        Phase 1 über den Prozess-Pool
+        
+        Die Worker liefern die Spans ihrer Abschnitte ohne Überlappungs-
+        Auflösung; sie erfolgt hier über alle Abschnitte, wie seriell.
+        """
+        spans = self._resolve_spans(self._get_scanner().atomic_spans(text, messages))
+        spans.sort(key=self._atomic_order())
+        
+        source = (text, 0)
+        hits = []
+        for marker_id, _, start, end in spans:
+            marker_name, shared_metadata = self.atomic_table[marker_id]
+            hits.append(MarkerHit.from_source(
+                marker_id, marker_name, source, start, end, shared_metadata
+            ))
+        return hits
+        
+    def _get_scanner(self):
+        """Prozess-Pool der Engine (beim ersten Aufruf gestartet, thread-sicher)"""
+        with self._scanner_lock:
+            if self._scanner is None:
+                from .parallel import ParallelScanner
+                self._scanner = ParallelScanner(self, self.scan_workers)
+            return self._scanner
+        
+    def close(self):
+        """Beendet einen gestarteten Scan-Prozess-Pool"""
+        with self._scanner_lock:
+            if self._scanner is not None:
+                self._scanner.close()
+                self._scanner = None
+        
+    def _atomic_spans(self, text: str, profiler=None) -> List[Tuple[str, int, int, int]]:
+        """Atomic-Treffer als (Marker-ID, Pattern-Index, Start, Ende), Überlappungen aufgelöst"""
+        return self._resolve_spans(self._raw_atomic_spans(text, profiler))
+        
+    def _raw_atomic_spans(self, text: str, profiler=None) -> List[Tuple[str, int, int, int]]:
+        """Atomic-Treffer vor der Überlappungs-Auflösung (so liefern sie die Worker)"""
+        spans = []
+        
+        # Alle exakten Phrasen in einem einzigen Durchlauf
+        started = time.perf_counter() if profiler is not None else 0.0
+        for (marker_id, pattern_index), start, end in self.phrase_matcher.search(text):
+            spans.append((marker_id, pattern_index, start, end))
+        if profiler is not None:
+            hits_by_marker = defaultdict(int)
+            for span in spans:
+                hits_by_marker[span[0]] += 1
+            profiler.record_shared(f"<Phrasen-Automat: {len(self.phrase_matcher)} Phrasen>",
+                                   time.perf_counter() - started, hits_by_marker)
+            
+        # Fallback: Keyword-Patterns über einen einmal aufgebauten Token-Index
+        started = time.perf_counter() if profiler is not None else 0.0
+        token_index = TokenIndex(text) if self.fallback_patterns else None
+        if profiler is not None and token_index is not None:
+            profiler.record_shared("<Token-Index>", time.perf_counter() - started)
+        for marker_id, patterns in self.fallback_patterns.items():
+            for pattern_index, pattern in patterns:
+                started = time.perf_counter() if profiler is not None else 0.0
+                before = len(spans)
+                for match in pattern.finditer(token_index):
+                    spans.append((marker_id, pattern_index, match.start(), match.end()))
+                if profiler is not None:
+                    profiler.record(marker_id, pattern, time.perf_counter() - started,
+                                    len(spans) - before)
+        return spans
+        
+    def _resolve_spans(self, spans: List[Tuple[str, int, int, int]]) -> List[Tuple[str, int, int, int]]:
+        """Überlappende Treffer auflösen (Standard: pro Marker der längste)"""
+        return resolve_overlaps(
+            spans,
+            start=lambda span: span[2],
+            end=lambda span: span[3],
+            group=(lambda span: span[0]) if self.overlap_scope == 'marker' else None,
+            policy=self.overlap_policy
+        )
+        
+    def _atomic_order(self):
+        """Sortierschlüssel für Spans: Marker -> Pattern -> Position"""
+        marker_order = {marker_id: i for i, marker_id in enumerate(self.compiled_patterns)}
+        return lambda span: (marker_order[span[0]], span[1], span[2])
+        
+    def _evaluate_semantic_markers(self, text: str, atomic_hits: List[MarkerHit],
+                                   messages: Optional[MessageTable] = None) -> List[MarkerHit]:
         """Phase 2: Evaluiert Semantic Markers basierend auf Atomic Hits"""
+        if messages is None:
+            messages = parse_chat(text)
+        return self._semantic_hits(atomic_hits, messages, len(text))
+        
+    def _semantic_hits(self, atomic_hits: List[MarkerHit], messages: MessageTable,
+                       text_length: int) -> List[MarkerHit]:
+        """Phase 2 ohne Text: nur Länge und Nachrichten-Tabelle werden gebraucht"""
         hits = []
         
-        # Gruppiere Atomic Hits nach ID für schnelleren Zugriff
+        # Gruppiere Atomic Hits nach ID: sortierte Nachrichten-Indizes pro Marker
         atomic_by_id = defaultdict(list)
         for hit in atomic_hits:
-            atomic_by_id[hit.marker_id].append(hit)
+            atomic_by_id[hit.marker_id].append(messages.message_index(hit.position_start))
+        for positions in atomic_by_id.values():
+            positions.sort()
             
-        for marker_id, marker_data in self.semantic_markers.items():
-            # Prüfe ob die benötigten Atomic Markers vorhanden sind
-            if 'composed_of' in marker_data:
-                required_atomics = marker_data['composed_of']
-                
-                # Prüfe Regeln
-                if self._check_semantic_rules(marker_data, atomic_by_id, text):
-                    hit = MarkerHit(
-                        marker_id=marker_id,
-                        marker_name=marker_data.get('name', marker_id),
-                        text=f"Semantic Pattern: {marker_id}",
-                        position_start=0,
-                        position_end=len(text),
-                        confidence=0.85,
-                        metadata={
-                            'description': marker_data.get('description', ''),
-                            'composed_of': required_atomics
-                        }
-                    )
-                    hits.append(hit)
+        # Nur Semantic Marker, deren Regel-Eingänge gefeuert haben
+        fired = self.hierarchy.mask('atomic', atomic_by_id)
+        for marker_id in self.hierarchy.candidates('semantic', fired):
+            marker_data = self.semantic_markers[marker_id]
+            
+            # Prüfe Regeln - ein Treffer pro erfülltem Fenster
+            for first, last in self._check_semantic_rules(marker_data, atomic_by_id, messages):
+                hits.append(self._semantic_hit(marker_id, first, last, messages, text_length))
                     
         return hits
         
-    def _check_semantic_rules(self, marker_data: Dict, atomic_by_id: Dict, text: str) -> bool:
-        """Prüft ob die Regeln für einen Semantic Marker erfüllt sind"""
+    def _semantic_hit(self, marker_id: str, first: int, last: int,
+                      messages: MessageTable, text_length: int) -> MarkerHit:
+        """Treffer eines Semantic Markers für das Fenster first..last (-1 = ganzer Text)"""
+        marker_data = self.semantic_markers[marker_id]
+        return MarkerHit(
+            marker_id=marker_id,
+            marker_name=marker_data.get('name', marker_id),
+            text=f"Semantic Pattern: {marker_id}",
+            position_start=messages.starts[first] if first >= 0 else 0,
+            position_end=messages.ends[last] if last >= 0 else text_length,
+            confidence=0.85,
+            metadata={
+                'description': marker_data.get('description', ''),
+                'composed_of': marker_data['composed_of'],
+                'messages': (first, last)
+            }
+        )
+        
+    def _check_semantic_rules(self, marker_data: Dict, atomic_by_id: Dict,
+                              messages: MessageTable) -> List[Tuple[int, int]]:
+        """
+        Prüft ob die Regeln für einen Semantic Marker erfüllt sind
+        
+        Returns:
+            Erfüllte Fenster als (erste Nachricht, letzte Nachricht); leer wenn
+            die Regeln nicht greifen, (-1, -1) für den ganzen Text
+        """
         rules = marker_data.get('rules', {})
         
-        # Co-occurrence Regel
+        # Co-occurrence Regel: alle Marker innerhalb von `window` Nachrichten
         if 'co_occurrence' in rules:
             co_rule = rules['co_occurrence']
             required = set(co_rule.get('markers', []))
             window = co_rule.get('window', 3)
             
-            # Prüfe ob alle benötigten Marker im Fenster vorhanden sind
-            found = set()
-            for marker_id in required:
-                if marker_id in atomic_by_id and atomic_by_id[marker_id]:
-                    found.add(marker_id)
-                    
-            if found == required:
-                return True
+            if required and all(marker_id in atomic_by_id for marker_id in required):
+                events = merge_events(atomic_by_id, required)
+                windows = cooccurrence_windows(events, required, window)
+                if windows:
+                    return windows
                 
         # Frequency Regel
         if 'frequency' in rules:
@@ -326,111 +757,108 @@ class MarkerEngine:
             min_count = freq_rule.get('min_count', 1)
             
             if marker in atomic_by_id and len(atomic_by_id[marker]) >= min_count:
-                return True
+                return [(-1, -1)]
                 
-        return False
+        return []
         
     def _detect_clusters(self, text: str, semantic_hits: List[MarkerHit]) -> List[MarkerHit]:
         """Phase 3: Erkennt Cluster basierend auf Semantic Patterns"""
+        return self._cluster_hits(semantic_hits, len(text))
+        
+    def _cluster_hits(self, semantic_hits: List[MarkerHit], text_length: int) -> List[MarkerHit]:
+        """Phase 3 ohne Text: nur die Länge wird gebraucht"""
         hits = []
         
-        # Gruppiere Semantic Hits nach ID
-        semantic_by_id = defaultdict(list)
-        for hit in semantic_hits:
-            semantic_by_id[hit.marker_id].append(hit)
-            
-        for marker_id, marker_data in self.cluster_markers.items():
-            if 'composed_of' in marker_data:
-                required_semantics = marker_data['composed_of']
-                
-                # Prüfe ob genügend der benötigten Semantic Marker vorhanden sind
-                found_count = 0
-                for sem_id in required_semantics:
-                    if sem_id in semantic_by_id:
-                        found_count += 1
-                        
-                # Trigger threshold
-                threshold = marker_data.get('trigger_threshold', len(required_semantics))
-                
-                if found_count >= threshold:
-                    hit = MarkerHit(
-                        marker_id=marker_id,
-                        marker_name=marker_data.get('name', marker_id),
-                        text=f"Cluster Pattern: {marker_id}",
-                        position_start=0,
-                        position_end=len(text),
-                        confidence=0.75,
-                        metadata={
-                            'description': marker_data.get('description', ''),
-                            'severity': marker_data.get('severity', 'medium')
-                        }
-                    )
-                    hits.append(hit)
+        # Trigger threshold per Popcount über das Bitset der gefeuerten Semantic Marker
+        fired = self.hierarchy.mask('semantic', (hit.marker_id for hit in semantic_hits))
+        for marker_id in self.hierarchy.triggered('cluster', fired):
+            hits.append(self._cluster_hit(marker_id, text_length))
                     
         return hits
         
+    def _cluster_hit(self, marker_id: str, text_length: int) -> MarkerHit:
+        """Treffer eines Cluster Markers (gilt für den ganzen Text)"""
+        marker_data = self.cluster_markers[marker_id]
+        return MarkerHit(
+            marker_id=marker_id,
+            marker_name=marker_data.get('name', marker_id),
+            text=f"Cluster Pattern: {marker_id}",
+            position_start=0,
+            position_end=text_length,
+            confidence=0.75,
+            metadata={
+                'description': marker_data.get('description', ''),
+                'severity': marker_data.get('severity', 'medium')
+            }
+        )
+        
     def _trigger_meta_markers(self, cluster_hits: List[MarkerHit]) -> List[MarkerHit]:
         """Phase 4: Triggert Meta Markers basierend auf Clusters"""
         hits = []
         
-        # Gruppiere Cluster Hits nach ID
-        cluster_by_id = defaultdict(list)
-        for hit in cluster_hits:
-            cluster_by_id[hit.marker_id].append(hit)
-            
-        for marker_id, marker_data in self.meta_markers.items():
-            if 'composed_of' in marker_data:
-                required_clusters = marker_data['composed_of']
-                
-                # Prüfe Trigger Threshold
-                found_count = 0
-                for cluster_id in required_clusters:
-                    if cluster_id in cluster_by_id:
-                        found_count += 1
-                        
-                threshold = marker_data.get('trigger_threshold', 2)
-                
-                if found_count >= threshold:
-                    hit = MarkerHit(
-                        marker_id=marker_id,
-                        marker_name=marker_data.get('name', marker_id),
-                        text=f"Meta Pattern: {marker_id}",
-                        position_start=0,
-                        position_end=0,
-                        confidence=0.9,
-                        metadata={
-                            'description': marker_data.get('description', ''),
-                            'risk_level': marker_data.get('risk_level', 'high')
-                        }
-                    )
-                    hits.append(hit)
+        # Trigger threshold per Popcount über das Bitset der gefeuerten Cluster
+        fired = self.hierarchy.mask('cluster', (hit.marker_id for hit in cluster_hits))
+        for marker_id in self.hierarchy.triggered('meta', fired):
+            hits.append(self._meta_hit(marker_id))
                     
         return hits
         
-    def _calculate_statistics(self, result: AnalysisResult) -> Dict[str, Any]:
-        """Berechnet Statistiken über die Analyse"""
+    def _meta_hit(self, marker_id: str) -> MarkerHit:
+        """Treffer eines Meta Markers"""
+        marker_data = self.meta_markers[marker_id]
+        return MarkerHit(
+            marker_id=marker_id,
+            marker_name=marker_data.get('name', marker_id),
+            text=f"Meta Pattern: {marker_id}",
+            position_start=0,
+            position_end=0,
+            confidence=0.9,
+            metadata={
+                'description': marker_data.get('description', ''),
+                'risk_level': marker_data.get('risk_level', 'high')
+            }
+        )
+        
+    def _all_marker_ids(self) -> List[str]:
+        """IDs aller geladenen Marker (alle Ebenen)"""
+        return [marker_id
+                for markers in (self.atomic_markers, self.semantic_markers,
+                                self.cluster_markers, self.meta_markers)
+                for marker_id in markers]
+        
+    def _level_counts(self, result: AnalysisResult) -> Dict[str, Any]:
+        """Treffer pro Marker-Code für jede Ebene (siehe hit_stats.MarkerFlags)"""
         return {
-            'total_markers': (
-                len(result.atomic_hits) + 
-                len(result.semantic_hits) + 
-                len(result.cluster_hits) + 
-                len(result.meta_hits)
-            ),
-            'by_level': {
-                'atomic': len(result.atomic_hits),
-                'semantic': len(result.semantic_hits),
-                'cluster': len(result.cluster_hits),
-                'meta': len(result.meta_hits)
-            },
+            level: self.marker_flags.counts(getattr(result, f'{level}_hits'))
+            for level in ('atomic', 'semantic', 'cluster', 'meta')
+        }
+        
+    def _calculate_statistics(self, result: AnalysisResult,
+                              counts: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Berechnet Statistiken über die Analyse
+        
+        Args:
+            counts: Ergebnis von _level_counts() (None = hier berechnen)
+        """
+        if counts is None:
+            counts = self._level_counts(result)
+        flags = self.marker_flags
+        by_level = {level: flags.total(level_counts) for level, level_counts in counts.items()}
+        return {
+            'total_markers': sum(by_level.values()),
+            'by_level': by_level,
             'unique_patterns': {
-                'atomic': len(set(h.marker_id for h in result.atomic_hits)),
-                'semantic': len(set(h.marker_id for h in result.semantic_hits)),
-                'cluster': len(set(h.marker_id for h in result.cluster_hits)),
-                'meta': len(set(h.marker_id for h in result.meta_hits))
+                level: flags.unique(level_counts) for level, level_counts in counts.items()
+            },
+            'messages': {
+                'count': len(result.messages) if result.messages is not None else 0,
+                'senders': len(result.messages.senders) if result.messages is not None else 0
             }
         }
         
-    def _generate_insights(self, result: AnalysisResult) -> List[Dict[str, Any]]:
+    def _generate_insights(self, result: AnalysisResult,
+                           counts: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Generiert Insights aus den Analyse-Ergebnissen"""
         insights = []
         
@@ -454,30 +882,27 @@ class MarkerEngine:
             })
             
         # Emotionale Stimmung
-        emotional_markers = [h for h in result.atomic_hits if 'EMO' in h.marker_id]
-        if emotional_markers:
+        atomic_counts = (counts['atomic'] if counts is not None
+                         else self.marker_flags.counts(result.atomic_hits))
+        emotional = self.marker_flags.total(atomic_counts, FLAG_EMOTIONAL)
+        if emotional:
             insights.append({
                 'type': 'emotional_tone',
                 'level': 'info',
-                'message': f'{len(emotional_markers)} emotionale Marker gefunden',
-                'distribution': self._analyze_emotional_distribution(emotional_markers)
+                'message': f'{emotional} emotionale Marker gefunden',
+                'distribution': self._analyze_emotional_distribution(atomic_counts)
             })
             
         return insights
         
-    def _analyze_emotional_distribution(self, emotional_markers: List[MarkerHit]) -> Dict[str, int]:
-        """Analysiert die Verteilung emotionaler Marker"""
-        distribution = defaultdict(int)
-        
-        for marker in emotional_markers:
-            if 'HIGH_VALENCE' in marker.marker_id:
-                distribution['positive'] += 1
-            elif 'LOW_VALENCE' in marker.marker_id:
-                distribution['negative'] += 1
-            else:
-                distribution['neutral'] += 1
-                
-        return dict(distribution)
+    def _analyze_emotional_distribution(self, atomic_counts) -> Dict[str, int]:
+        """Analysiert die Verteilung emotionaler Marker (Masken über die Marker-Flags)"""
+        flags = self.marker_flags
+        positive = flags.total(atomic_counts, FLAG_POSITIVE)
+        negative = flags.total(atomic_counts, FLAG_NEGATIVE)
+        neutral = flags.total(atomic_counts, FLAG_EMOTIONAL) - positive - negative
+        distribution = {'positive': positive, 'negative': negative, 'neutral': neutral}
+        return {key: count for key, count in distribution.items() if count}
 
 
 # CLI Interface
@@ -488,15 +913,11 @@ if __name__ == "__main__":
         print("Usage: python -m markerengine.core.engine <textfile>")
         sys.exit(1)
         
-    # Lade Text
-    with open(sys.argv[1], 'r', encoding='utf-8') as f:
-        text = f.read()
-        
     # Initialisiere Engine
     engine = MarkerEngine()
     
-    # Analysiere
-    result = engine.analyze(text)
+    # Analysiere (Export wird blockweise per mmap gelesen)
+    result = engine.analyze_file(sys.argv[1])
     
     # Ausgabe
     print(f"\n=== MARKER ENGINE ANALYSE ===")
@@ -519,14 +940,6 @@ if __name__ == "__main__":
     # JSON Export
     output_file = "analysis_result.json"
     with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump({
-            'timestamp': datetime.now().isoformat(),
-            'statistics': result.statistics,
-            'atomic_hits': [{'id': h.marker_id, 'text': h.text} for h in result.atomic_hits],
-            'semantic_hits': [{'id': h.marker_id, 'name': h.marker_name} for h in result.semantic_hits],
-            'cluster_hits': [{'id': h.marker_id, 'name': h.marker_name} for h in result.cluster_hits],
-            'meta_hits': [{'id': h.marker_id, 'name': h.marker_name} for h in result.meta_hits],
-            'insights': result.insights
-        }, f, indent=2, ensure_ascii=False)
+        json.dump(result.to_dict(), f, indent=2, ensure_ascii=False)
         
     print(f"\n✅ Analyse gespeichert in: {output_file}")
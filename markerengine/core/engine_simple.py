@@ -152,9 +152,9 @@ class MarkerEngine:
         # Phase 1: Atomic Marker Detection (vereinfacht)
         for marker_id, patterns in self.simple_patterns.items():
             for pattern in patterns:
-                if pattern in text_lower:
-                    # Finde Position
-                    start = text_lower.find(pattern)
+                # Finde Position (ein Durchlauf statt `in` + find)
+                start = text_lower.find(pattern)
+                if start != -1:
                     end = start + len(pattern)
                     
                     hit = MarkerHit(
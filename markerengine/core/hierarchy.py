@@ -0,0 +1,171 @@
+"""
+MarkerEngine Hierarchy - Kompilierter Abhängigkeitsgraph der Marker-Ebenen
+atomic -> semantic -> cluster -> meta als integer-indizierter DAG; gefeuerte
+Marker einer Ebene sind ein Bitset, Trigger-Schwellen werden per Popcount
+geprüft und nur Marker mit gefeuerten Eingängen werden überhaupt angefasst
+"""
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+LEVELS = ('atomic', 'semantic', 'cluster', 'meta')
+
+try:
+    _popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def _popcount(value: int) -> int:
+        return bin(value).count('1')
+
+
+def _iter_bits(mask: int) -> Iterable[int]:
+    """Indizes der gesetzten Bits, aufsteigend"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _as_list(value: Any) -> List[str]:
+    if isinstance(value, (list, tuple, set)):
+        return [v for v in value if isinstance(v, str)]
+    if isinstance(value, str):
+        return [value]
+    return []
+
+
+def _semantic_inputs(marker_data: Dict) -> Optional[List[str]]:
+    """Atomic-Eingänge eines Semantic Markers (None wenn er nie feuern kann)"""
+    if 'composed_of' not in marker_data:
+        return None
+    rules = marker_data.get('rules') or {}
+    if not isinstance(rules, dict):
+        return None
+    inputs = []
+    co_rule = rules.get('co_occurrence')
+    if isinstance(co_rule, dict):
+        inputs.extend(_as_list(co_rule.get('markers')))
+    freq_rule = rules.get('frequency')
+    if isinstance(freq_rule, dict):
+        inputs.extend(_as_list(freq_rule.get('marker')))
+    return inputs
+
+
+class _Level:
+    """Knoten einer Ebene mit Eingangs-Bitsets und Schwellen"""
+
+    def __init__(self, ids: List[str]):
+        self.ids = ids
+        self.index = {marker_id: i for i, marker_id in enumerate(ids)}
+        self.inputs: List[int] = [0] * len(ids)
+        # Schwellen unverändert aus dem YAML (auch gebrochen, z.B. 0.5)
+        self.thresholds: List[Union[int, float]] = [0] * len(ids)
+        # Mehrfach gelistete Eingänge (composed_of: [S_X, S_X]) zählen mehrfach;
+        # nur für diese seltenen Knoten: Eingangs-Index -> Anzahl
+        self.weights: List[Optional[Dict[int, int]]] = [None] * len(ids)
+        # Knoten, die auch ohne gefeuerte Eingänge auslösen (Schwelle <= 0)
+        self.always = 0
+
+
+class MarkerHierarchy:
+    """
+    Einmal beim Laden kompilierter DAG aus composed_of / trigger_threshold
+
+    Pro Ebene bekommt jeder Marker einen Integer-Index. Für jeden Marker der
+    Ebenen semantic/cluster/meta wird ein Bitset seiner Eingänge der Ebene
+    darunter gehalten, dazu pro Eingang die Liste seiner Eltern.
+    """
+
+    def __init__(self, atomic_markers: Dict[str, Any], semantic_markers: Dict[str, Dict],
+                 cluster_markers: Dict[str, Dict], meta_markers: Dict[str, Dict]):
+        definitions = {
+            'atomic': atomic_markers,
+            'semantic': semantic_markers,
+            'cluster': cluster_markers,
+            'meta': meta_markers,
+        }
+        self.levels = {level: _Level(list(definitions[level])) for level in LEVELS}
+        # parents[lower_level][i] -> Indizes der Marker eine Ebene höher
+        self.parents: Dict[str, List[List[int]]] = {
+            level: [[] for _ in self.levels[level].ids] for level in LEVELS
+        }
+
+        for upper, lower in zip(LEVELS[1:], LEVELS[:-1]):
+            upper_level = self.levels[upper]
+            lower_level = self.levels[lower]
+            for j, marker_id in enumerate(upper_level.ids):
+                marker_data = definitions[upper][marker_id] or {}
+
+                if upper == 'semantic':
+                    inputs = _semantic_inputs(marker_data)
+                    # Regeln feuern erst, wenn mindestens ein Eingang vorliegt
+                    threshold = 1
+                else:
+                    inputs = _as_list(marker_data.get('composed_of')) if 'composed_of' in marker_data else None
+                    default = len(inputs) if upper == 'cluster' and inputs is not None else 2
+                    threshold = marker_data.get('trigger_threshold', default)
+                    if isinstance(threshold, bool) or not isinstance(threshold, (int, float)):
+                        try:
+                            threshold = float(threshold)
+                        except (TypeError, ValueError):
+                            threshold = default
+
+                if inputs is None:
+                    # Ohne composed_of wird der Marker nie ausgewertet
+                    upper_level.thresholds[j] = -1
+                    continue
+
+                mask = 0
+                weights: Dict[int, int] = {}
+                for input_id in inputs:
+                    i = lower_level.index.get(input_id)
+                    if i is None:
+                        continue
+                    if mask >> i & 1:
+                        weights[i] = weights.get(i, 1) + 1
+                    else:
+                        mask |= 1 << i
+                        self.parents[lower][i].append(j)
+
+                upper_level.inputs[j] = mask
+                if weights:
+                    upper_level.weights[j] = weights
+                upper_level.thresholds[j] = threshold
+                if threshold <= 0:
+                    upper_level.always |= 1 << j
+
+    def mask(self, level: str, marker_ids: Iterable[str]) -> int:
+        """Bitset der übergebenen (gefeuerten) Marker einer Ebene"""
+        index = self.levels[level].index
+        mask = 0
+        for marker_id in marker_ids:
+            i = index.get(marker_id)
+            if i is not None:
+                mask |= 1 << i
+        return mask
+
+    def _candidates(self, level: str, fired_mask: int) -> int:
+        """Bitset der Marker von `level`, die einen gefeuerten Eingang haben"""
+        lower = LEVELS[LEVELS.index(level) - 1]
+        parents = self.parents[lower]
+        candidates = self.levels[level].always
+        for i in _iter_bits(fired_mask):
+            for j in parents[i]:
+                candidates |= 1 << j
+        return candidates
+
+    def candidates(self, level: str, fired_mask: int) -> List[str]:
+        """Marker von `level`, deren Eingänge (teilweise) gefeuert haben, in Definitions-Reihenfolge"""
+        ids = self.levels[level].ids
+        return [ids[j] for j in _iter_bits(self._candidates(level, fired_mask))]
+
+    def triggered(self, level: str, fired_mask: int) -> List[str]:
+        """Marker von `level`, deren Trigger-Schwelle durch die Ebene darunter erreicht ist"""
+        level_data = self.levels[level]
+        triggered = []
+        for j in _iter_bits(self._candidates(level, fired_mask)):
+            fired_inputs = fired_mask & level_data.inputs[j]
+            count = _popcount(fired_inputs)
+            weights = level_data.weights[j]
+            if weights:
+                count += sum(n - 1 for i, n in weights.items() if fired_inputs >> i & 1)
+            if count >= level_data.thresholds[j]:
+                triggered.append(level_data.ids[j])
+        return triggered
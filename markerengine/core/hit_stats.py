@@ -0,0 +1,114 @@
+"""
+MarkerEngine Hit Stats - Statistiken über Treffer-Arrays
+Kategorie- und Risiko-Flags werden einmal pro Marker-ID berechnet (beim
+Laden); Statistiken entstehen aus einem einzigen Durchlauf über die
+Marker-Codes der Treffer (np.bincount, ohne numpy ein Zähl-Array) und
+Masken über die wenigen Marker statt über alle Treffer.
+"""
+from array import array
+from typing import Callable, Dict, Iterable, List, Sequence
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Flags pro Marker-ID
+FLAG_EMOTIONAL = 1       # 'EMO' in der ID
+FLAG_POSITIVE = 2        # emotional, 'HIGH_VALENCE'
+FLAG_NEGATIVE = 4        # emotional, 'LOW_VALENCE' (und nicht positiv)
+FLAG_HIGH_RISK = 8       # enthält ein High-Risk-Keyword
+
+# Keywords für FLAG_HIGH_RISK (real_analyzer)
+HIGH_RISK_KEYWORDS = (
+    'SCAM', 'FRAUD', 'MANIPULATION', 'GASLIGHTING',
+    'CRISIS', 'MONEY', 'BLAME', 'GUILT', 'SHIFT',
+    'PLATFORM_SWITCH', 'URGENCY', 'WEBCAM_EXCUSE'
+)
+
+
+def classify_marker(marker_id: str) -> int:
+    """Flags einer Marker-ID (gleiche Regeln wie die bisherigen Substring-Prüfungen)"""
+    flags = 0
+    if 'EMO' in marker_id:
+        flags |= FLAG_EMOTIONAL
+        if 'HIGH_VALENCE' in marker_id:
+            flags |= FLAG_POSITIVE
+        elif 'LOW_VALENCE' in marker_id:
+            flags |= FLAG_NEGATIVE
+    upper = marker_id.upper()
+    if any(keyword in upper for keyword in HIGH_RISK_KEYWORDS):
+        flags |= FLAG_HIGH_RISK
+    return flags
+
+
+class MarkerFlags:
+    """
+    Dichte Codes und Flags pro Marker-ID
+
+    Bekannte Marker werden beim Laden registriert; unbekannte IDs erhalten
+    beim ersten Auftreten einen Code.
+    """
+
+    def __init__(self, classify: Callable[[str], int] = classify_marker):
+        self.classify = classify
+        self.ids: List[str] = []
+        self.flags = array('q')
+        self._codes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def code(self, marker_id: str) -> int:
+        code = self._codes.get(marker_id)
+        if code is None:
+            code = len(self.ids)
+            self._codes[marker_id] = code
+            self.ids.append(marker_id)
+            self.flags.append(self.classify(marker_id))
+        return code
+
+    def register(self, marker_ids: Iterable[str]):
+        """Berechnet die Flags vorab (beim Laden der Marker)"""
+        for marker_id in marker_ids:
+            self.code(marker_id)
+
+    def counts(self, hits: Iterable) -> Sequence[int]:
+        """Treffer pro Marker-Code in einem Durchlauf über die Treffer"""
+        code = self.code
+        codes = array('q', [code(hit.marker_id) for hit in hits])
+        if NUMPY_AVAILABLE:
+            return np.bincount(np.frombuffer(codes, dtype=np.int64), minlength=len(self.ids))
+        counts = [0] * len(self.ids)
+        for c in codes:
+            counts[c] += 1
+        return counts
+
+    def update(self, counts: List[int], hits: Iterable) -> List[int]:
+        """Zählt Treffer in eine laufende Liste (für blockweise gestreamte Treffer)"""
+        code = self.code
+        for hit in hits:
+            c = code(hit.marker_id)
+            if c >= len(counts):
+                counts.extend([0] * (c + 1 - len(counts)))
+            counts[c] += 1
+        return counts
+
+    def total(self, counts: Sequence[int], flag: int = 0) -> int:
+        """Anzahl Treffer (mit Flag); Maske über die Marker, nicht über die Treffer"""
+        if NUMPY_AVAILABLE and isinstance(counts, np.ndarray):
+            if not flag:
+                return int(counts.sum())
+            mask = (np.frombuffer(self.flags, dtype=np.int64)[:len(counts)] & flag) != 0
+            return int(counts[mask].sum())
+        if not flag:
+            return sum(counts)
+        flags = self.flags
+        return sum(n for c, n in enumerate(counts) if n and flags[c] & flag)
+
+    def unique(self, counts: Sequence[int]) -> int:
+        """Anzahl verschiedener Marker mit mindestens einem Treffer"""
+        if NUMPY_AVAILABLE and isinstance(counts, np.ndarray):
+            return int(np.count_nonzero(counts))
+        return sum(1 for n in counts if n)
@@ -0,0 +1,265 @@
+"""
+MarkerEngine Incremental - Streaming-Analyse für wachsende Chats
+Neue Nachrichten werden einzeln angehängt: Atomic Marker laufen nur über die
+neuen bzw. verlängerten Nachrichten, Semantic/Cluster/Meta nur für Marker,
+deren Eingänge sich geändert haben. Jeder Aufruf liefert ein Delta.
+"""
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from .chat_parser import ChatParser, MessageTable, _iter_lines
+from .engine import AnalysisResult, MarkerEngine, MarkerHit
+from .windows import CooccurrenceSweep
+
+
+@dataclass
+class AnalysisDelta:
+    """Änderungen des Analyse-Ergebnisses durch ein append()"""
+    added: List[MarkerHit] = field(default_factory=list)
+    retracted: List[MarkerHit] = field(default_factory=list)
+    # Indizes der neu hinzugekommenen bzw. verlängerten Nachrichten
+    messages: List[int] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.retracted)
+
+
+def _hit_key(hit: MarkerHit) -> Tuple[str, int, int]:
+    return hit.marker_id, hit.position_start, hit.position_end
+
+
+class _SemanticState:
+    """Fortschreibbarer Regel-Zustand eines Semantic Markers"""
+
+    __slots__ = ('sweep', 'frequency', 'windows', '_snapshot')
+
+    def __init__(self, marker_data: Dict):
+        rules = marker_data.get('rules', {})
+
+        self.sweep = None
+        if 'co_occurrence' in rules:
+            co_rule = rules['co_occurrence']
+            self.sweep = CooccurrenceSweep(co_rule.get('markers', []), co_rule.get('window', 3))
+
+        self.frequency = None
+        if 'frequency' in rules:
+            freq_rule = rules['frequency']
+            self.frequency = (freq_rule.get('marker'), freq_rule.get('min_count', 1))
+
+        self.windows: List[Tuple[int, int]] = []
+        # (Nachricht, Sweep-Zustand davor, Anzahl Fenster davor)
+        self._snapshot: Optional[Tuple[int, tuple, int]] = None
+
+    def update(self, message: int, marker_ids: List[str]):
+        """Schreibt die Events einer (neuen oder neu gescannten) Nachricht fort"""
+        if self.sweep is None:
+            return
+        if self._snapshot is not None and self._snapshot[0] == message:
+            # Nachricht wurde verlängert: ihre alten Events zurücknehmen
+            _, state, window_count = self._snapshot
+            self.sweep.restore(state)
+            del self.windows[window_count:]
+        else:
+            self._snapshot = (message, self.sweep.state(), len(self.windows))
+
+        for marker_id in marker_ids:
+            found = self.sweep.push(message, marker_id)
+            if found is not None:
+                self.windows.append(found)
+
+    def result(self, atomic_counts: Dict[str, int]) -> List[Tuple[int, int]]:
+        """Erfüllte Fenster wie MarkerEngine._check_semantic_rules"""
+        if self.windows:
+            return list(self.windows)
+        if self.frequency is not None:
+            marker, min_count = self.frequency
+            if atomic_counts.get(marker, 0) >= min_count:
+                return [(-1, -1)]
+        return []
+
+
+class IncrementalAnalyzer:
+    """
+    Inkrementelle Analyse eines Chats, dem laufend Nachrichten angehängt werden
+
+    Die Kosten eines append() hängen von der Länge der neuen Nachricht ab,
+    nicht von der Länge des Chats. Eine Folgezeile verlängert die letzte
+    Nachricht; diese wird dann komplett neu gescannt, wodurch Treffer auch
+    zurückgenommen werden können.
+
+    Treffer über den ganzen Chat (Frequency-Regel, Cluster) behalten ihre
+    Identität, auch wenn ihr position_end mit dem Text wächst.
+    """
+
+    def __init__(self, engine: MarkerEngine):
+        self.engine = engine
+        self.messages = MessageTable()
+        self._parser = ChatParser(self.messages)
+        self._chunks: List[str] = []
+        self._text: Optional[str] = ''
+        self._length = 0
+        self._last_message_text = ''
+
+        # Atomic Hits pro Nachricht und Anzahl pro Marker
+        self._atomic_hits: List[List[MarkerHit]] = []
+        self._atomic_counts: Dict[str, int] = defaultdict(int)
+
+        self._semantic_states: Dict[str, _SemanticState] = {}
+        # Semantic Hits pro Marker und Fenster; Marker mit Fenstern, die in der
+        # letzten (noch verlängerbaren) Nachricht enden
+        self._semantic_hits: Dict[str, List[Tuple[Tuple[int, int], MarkerHit]]] = {}
+        self._tail_markers: Set[str] = set()
+        self._clusters: Optional[List[str]] = None
+        self._metas: List[str] = []
+
+    @property
+    def text(self) -> str:
+        """Bisheriger Chat-Text"""
+        if self._text is None:
+            self._text = ''.join(self._chunks)
+            self._chunks = [self._text]
+        return self._text
+
+    def append(self, text: str) -> AnalysisDelta:
+        """
+        Hängt eine oder mehrere Zeilen an den Chat an
+
+        Ein fehlender Zeilenumbruch am Ende wird ergänzt, jeder Aufruf
+        schließt also seine letzte Zeile ab.
+        """
+        delta = AnalysisDelta()
+        if not text:
+            return delta
+        if not text.endswith('\n'):
+            text += '\n'
+
+        self._chunks.append(text)
+        self._text = None
+        self._length += len(text)
+
+        previous_count = len(self.messages)
+        pieces: Dict[int, List[str]] = {}
+        for line in _iter_lines(text):
+            self._parser.feed_line(line)
+            pieces.setdefault(len(self.messages) - 1, []).append(line)
+
+        # Phase 1: nur neue bzw. verlängerte Nachrichten scannen
+        touched: Set[str] = set()
+        events_by_message = []
+        for index in sorted(pieces):
+            message_text = ''.join(pieces[index])
+            if index == previous_count - 1:
+                message_text = self._last_message_text + message_text
+            self._last_message_text = message_text
+            delta.messages.append(index)
+
+            new_hits = self.engine._detect_atomic_markers(message_text, self.messages.starts[index])
+            if index < len(self._atomic_hits):
+                old_hits = self._atomic_hits[index]
+                self._atomic_hits[index] = new_hits
+            else:
+                old_hits = []
+                self._atomic_hits.append(new_hits)
+            self._diff(old_hits, new_hits, delta)
+            for hit in old_hits:
+                self._atomic_counts[hit.marker_id] -= 1
+            for hit in new_hits:
+                self._atomic_counts[hit.marker_id] += 1
+
+            marker_ids = sorted(hit.marker_id for hit in new_hits)
+            touched.update(hit.marker_id for hit in old_hits)
+            touched.update(marker_ids)
+            events_by_message.append((index, marker_ids))
+
+        # Phase 2: Regeln nur für Semantic Marker mit betroffenen Eingängen;
+        # Fenster, die in einer verlängerten Nachricht enden, werden neu gemeldet
+        hierarchy = self.engine.hierarchy
+        extended = previous_count - 1 if previous_count - 1 in pieces else None
+        candidates = hierarchy.candidates('semantic', hierarchy.mask('atomic', touched))
+        if extended is not None:
+            candidates.extend(self._tail_markers.difference(candidates))
+
+        last_index = len(self.messages) - 1
+        tail_markers = set()
+        fired_changed = False
+        for marker_id in candidates:
+            state = self._semantic_states.get(marker_id)
+            if state is None:
+                state = _SemanticState(self.engine.semantic_markers[marker_id])
+                self._semantic_states[marker_id] = state
+            for index, marker_ids in events_by_message:
+                state.update(index, marker_ids)
+
+            # Unveränderte Fenster behalten ihren Hit (Fenster können sich wiederholen)
+            old_hits = self._semantic_hits.get(marker_id, [])
+            reusable = defaultdict(list)
+            for window, hit in reversed(old_hits):
+                if window[1] != extended:
+                    reusable[window].append(hit)
+            new_hits = []
+            for window in state.result(self._atomic_counts):
+                if reusable[window]:
+                    hit = reusable[window].pop()
+                else:
+                    hit = self._semantic_hit(marker_id, window)
+                    delta.added.append(hit)
+                new_hits.append((window, hit))
+                if window[1] == last_index:
+                    tail_markers.add(marker_id)
+            kept = {id(hit) for _, hit in new_hits}
+            delta.retracted.extend(hit for _, hit in old_hits if id(hit) not in kept)
+
+            if bool(old_hits) != bool(new_hits):
+                fired_changed = True
+            if new_hits:
+                self._semantic_hits[marker_id] = new_hits
+            else:
+                self._semantic_hits.pop(marker_id, None)
+        self._tail_markers = tail_markers
+
+        # Phase 3/4: nur wenn sich die Menge der gefeuerten Semantic Marker ändert
+        # (beim ersten Aufruf immer, Marker mit Schwelle 0 feuern ohne Eingänge)
+        if fired_changed or self._clusters is None:
+            clusters = hierarchy.triggered('cluster', hierarchy.mask('semantic', self._semantic_hits))
+            self._diff_ids(self._clusters or [], clusters,
+                           lambda marker_id: self.engine._cluster_hit(marker_id, self._length), delta)
+            if clusters != self._clusters:
+                self._clusters = clusters
+                metas = hierarchy.triggered('meta', hierarchy.mask('cluster', clusters))
+                self._diff_ids(self._metas, metas, self.engine._meta_hit, delta)
+                self._metas = metas
+
+        return delta
+
+    def _semantic_hit(self, marker_id: str, window: Tuple[int, int]) -> MarkerHit:
+        return self.engine._semantic_hit(marker_id, window[0], window[1], self.messages, self._length)
+
+    @staticmethod
+    def _diff(old_hits: List[MarkerHit], new_hits: List[MarkerHit], delta: AnalysisDelta):
+        old_keys = {_hit_key(hit) for hit in old_hits}
+        new_keys = {_hit_key(hit) for hit in new_hits}
+        delta.retracted.extend(hit for hit in old_hits if _hit_key(hit) not in new_keys)
+        delta.added.extend(hit for hit in new_hits if _hit_key(hit) not in old_keys)
+
+    @staticmethod
+    def _diff_ids(old_ids: List[str], new_ids: List[str], make_hit, delta: AnalysisDelta):
+        old_set, new_set = set(old_ids), set(new_ids)
+        delta.retracted.extend(make_hit(marker_id) for marker_id in old_ids if marker_id not in new_set)
+        delta.added.extend(make_hit(marker_id) for marker_id in new_ids if marker_id not in old_set)
+
+    def result(self) -> AnalysisResult:
+        """Vollständiges Ergebnis des bisherigen Chats (wie MarkerEngine.analyze)"""
+        engine = self.engine
+        result = AnalysisResult(messages=self.messages)
+        result.atomic_hits = [hit for hits in self._atomic_hits for hit in hits]
+        result.semantic_hits = [
+            self._semantic_hit(marker_id, window)
+            for marker_id in engine.semantic_markers if marker_id in self._semantic_hits
+            for window, _ in self._semantic_hits[marker_id]
+        ]
+        result.cluster_hits = [engine._cluster_hit(marker_id, self._length) for marker_id in self._clusters or []]
+        result.meta_hits = [engine._meta_hit(marker_id) for marker_id in self._metas]
+        result.statistics = engine._calculate_statistics(result)
+        result.insights = engine._generate_insights(result)
+        return result
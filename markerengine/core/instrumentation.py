@@ -0,0 +1,134 @@
+"""
+MarkerEngine Instrumentation - Laufzeit und Zähler pro Phase
+Misst Ladephase und Analyse-Phasen (Wall-/CPU-Zeit, Pattern-Auswertungen,
+Treffer, gescannte Bytes). Ausgeschaltet wird ein Null-Objekt verwendet,
+dessen Aufrufe nichts tun.
+"""
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class PhaseMetrics:
+    """Messwerte einer Phase"""
+    name: str
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    # Pattern-Durchläufe über den Text (der Phrasen-Automat zählt als einer)
+    regex_evaluations: int = 0
+    hits: int = 0
+    bytes_scanned: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+MetricsCallback = Callable[[PhaseMetrics], None]
+
+
+class _PhaseTimer:
+    """Context Manager für eine gemessene Phase"""
+
+    __slots__ = ('_run', 'metrics', '_wall', '_cpu')
+
+    def __init__(self, run: 'MetricsRun', metrics: PhaseMetrics):
+        self._run = run
+        self.metrics = metrics
+
+    def __enter__(self) -> '_PhaseTimer':
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.metrics.wall_time = time.perf_counter() - self._wall
+        self.metrics.cpu_time = time.process_time() - self._cpu
+        self._run._finish(self.metrics)
+        return False
+
+    def count(self, hits: int = 0, regex_evaluations: int = 0, bytes_scanned: int = 0):
+        """Addiert Zähler zur laufenden Phase"""
+        metrics = self.metrics
+        metrics.hits += hits
+        metrics.regex_evaluations += regex_evaluations
+        metrics.bytes_scanned += bytes_scanned
+
+
+class _NullPhase:
+    """Phase ohne Messung"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullPhase':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    def count(self, hits: int = 0, regex_evaluations: int = 0, bytes_scanned: int = 0):
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class MetricsRun:
+    """Messwerte eines Durchlaufs (z.B. eines analyze()-Aufrufs)"""
+
+    enabled = True
+
+    def __init__(self, callback: Optional[MetricsCallback] = None):
+        self.callback = callback
+        self.phases: List[PhaseMetrics] = []
+
+    def phase(self, name: str, bytes_scanned: int = 0) -> _PhaseTimer:
+        """Startet eine Phase: `with run.phase('atomic', n) as phase: ...`"""
+        return _PhaseTimer(self, PhaseMetrics(name, bytes_scanned=bytes_scanned))
+
+    def _finish(self, metrics: PhaseMetrics):
+        self.phases.append(metrics)
+        if self.callback is not None:
+            self.callback(metrics)
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Messwerte pro Phase, in Ausführungs-Reihenfolge"""
+        return {metrics.name: metrics.as_dict() for metrics in self.phases}
+
+
+class _NullRun:
+    """Durchlauf ohne Messung"""
+
+    enabled = False
+    phases: List[PhaseMetrics] = []
+
+    def phase(self, name: str, bytes_scanned: int = 0) -> _NullPhase:
+        return _NULL_PHASE
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {}
+
+
+_NULL_RUN = _NullRun()
+
+
+class Instrumentation:
+    """
+    Schalter + Callback für die Messung
+
+    Pro Durchlauf wird mit run() ein eigener MetricsRun erzeugt, damit eine
+    geteilte Engine aus mehreren Threads gemessen werden kann.
+    """
+
+    def __init__(self, enabled: bool = True, callback: Optional[MetricsCallback] = None):
+        self.enabled = enabled
+        self.callback = callback
+
+    def run(self):
+        """Neuer Durchlauf (Null-Objekt wenn ausgeschaltet)"""
+        if not self.enabled:
+            return _NULL_RUN
+        return MetricsRun(self.callback)
+
+
+NULL_INSTRUMENTATION = Instrumentation(enabled=False)
@@ -0,0 +1,149 @@
+"""
+MarkerEngine Marker Cache - Persistenter Cache für geparste Marker-YAMLs
+Spart beim Start das YAML-Parsing; invalidiert pro Datei über einen Content-Hash
+"""
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import yaml
+
+from .marker_loader import parse_marker_bytes
+
+logger = logging.getLogger(__name__)
+
+# Bei Format-Änderungen erhöhen, alte Caches werden dann verworfen
+CACHE_VERSION = 1
+
+
+def default_cache_dir() -> Path:
+    """Cache-Verzeichnis (überschreibbar via MARKERENGINE_CACHE_DIR)"""
+    env_dir = os.getenv("MARKERENGINE_CACHE_DIR")
+    if env_dir:
+        return Path(env_dir)
+    xdg_cache = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(xdg_cache) / "markerengine"
+
+
+class MarkerCache:
+    """
+    Cache der geparsten YAML-Inhalte eines Marker-Verzeichnisses
+
+    Einträge sind über den relativen Dateipfad adressiert und tragen den
+    SHA-256 des Dateiinhalts. Ändert sich eine Datei, wird nur sie neu geparst;
+    Einträge gelöschter Dateien fallen beim Speichern heraus.
+    Auch Parse-Fehler werden gecacht, damit defekte Dateien nicht bei jedem
+    Start erneut geparst werden.
+    """
+
+    def __init__(self, marker_base_path, cache_dir: Optional[str] = None, enabled: bool = True):
+        self.marker_base_path = Path(marker_base_path).resolve()
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.enabled = enabled
+
+        path_key = hashlib.sha1(str(self.marker_base_path).encode('utf-8')).hexdigest()[:16]
+        self.cache_file = self.cache_dir / f"markers-{path_key}.pickle"
+
+        # rel_path -> (sha256, data, error)
+        self._entries: Dict[str, Tuple[str, Any, Optional[str]]] = {}
+        self._seen = set()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+        if self.enabled:
+            self._read()
+
+    def _read(self):
+        """Liest die Cache-Datei (fehlende oder veraltete Caches werden ignoriert)"""
+        try:
+            with open(self.cache_file, 'rb') as f:
+                payload = pickle.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.debug(f"Marker-Cache unlesbar, wird neu aufgebaut: {e}")
+            return
+
+        if isinstance(payload, dict) and payload.get('version') == CACHE_VERSION:
+            self._entries = payload.get('entries', {})
+
+    def _key(self, yaml_file: Path) -> str:
+        try:
+            return str(Path(yaml_file).resolve().relative_to(self.marker_base_path))
+        except ValueError:
+            return str(Path(yaml_file).resolve())
+
+    def lookup(self, yaml_file: Path, raw: bytes) -> Optional[Tuple[str, Any, Optional[str]]]:
+        """Liefert den Cache-Eintrag, falls er zum aktuellen Dateiinhalt passt"""
+        digest = hashlib.sha256(raw).hexdigest()
+        key = self._key(yaml_file)
+        self._seen.add(key)
+        entry = self._entries.get(key) if self.enabled else None
+        if entry is not None and entry[0] == digest:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def store(self, yaml_file: Path, raw: bytes, data: Any, error: Optional[str] = None):
+        """Legt das Parse-Ergebnis einer Datei im Cache ab"""
+        if not self.enabled:
+            return
+        key = self._key(yaml_file)
+        self._seen.add(key)
+        self._entries[key] = (hashlib.sha256(raw).hexdigest(), data, error)
+        self._dirty = True
+
+    def load(self, yaml_file: Path) -> Any:
+        """
+        Lädt eine einzelne Marker-Datei, aus dem Cache oder frisch geparst
+
+        Raises:
+            yaml.YAMLError: wenn die Datei (auch laut Cache) nicht parsebar ist
+        """
+        raw = Path(yaml_file).read_bytes()
+        entry = self.lookup(yaml_file, raw)
+
+        if entry is not None:
+            _, data, error = entry
+        else:
+            data, error, _ = parse_marker_bytes(raw)
+            self.store(yaml_file, raw, data, error)
+
+        if error is not None:
+            raise yaml.YAMLError(error)
+        return data
+
+    def save(self):
+        """Schreibt den Cache atomar zurück und entfernt Einträge gelöschter Dateien"""
+        stale = [key for key in set(self._entries) - self._seen
+                 if not (self.marker_base_path / key).exists()]
+        if stale:
+            for key in stale:
+                del self._entries[key]
+            self._dirty = True
+
+        if not self.enabled or not self._dirty:
+            return
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump({'version': CACHE_VERSION, 'entries': self._entries},
+                                f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self.cache_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            self._dirty = False
+            logger.debug(f"Marker-Cache gespeichert: {self.cache_file} "
+                         f"({self.hits} Treffer, {self.misses} neu geparst)")
+        except OSError as e:
+            logger.debug(f"Marker-Cache konnte nicht geschrieben werden: {e}")
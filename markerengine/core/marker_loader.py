@@ -0,0 +1,166 @@
+"""
+MarkerEngine Marker Loader - Paralleles Parsen der Marker-YAMLs
+Nutzt den libyaml C-Loader (yaml.CSafeLoader) wenn verfügbar und verteilt
+nicht gecachte Dateien auf einen Prozess-Pool
+"""
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+    LIBYAML_AVAILABLE = True
+except ImportError:
+    from yaml import SafeLoader
+    LIBYAML_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Verzeichnisse der vier Marker-Ebenen
+MARKER_LEVEL_DIRS = ('atomic', 'semantic', 'cluster', 'meta_marker')
+
+# Unterhalb dieser Anzahl zu parsender Dateien lohnt sich kein Prozess-Pool
+PARALLEL_MIN_FILES = 32
+
+
+@dataclass
+class LoadedMarkerFile:
+    """Parse-Ergebnis einer Marker-Datei inkl. Zeitmessung"""
+    path: Path
+    data: Any
+    parse_time: float
+    cached: bool = False
+    error: Optional[str] = None
+    size: int = 0
+
+    def result(self) -> Any:
+        """Liefert die geparsten Daten oder wirft den Parse-Fehler"""
+        if self.error is not None:
+            raise yaml.YAMLError(self.error)
+        return self.data
+
+
+def parse_marker_bytes(raw: bytes) -> Tuple[Any, Optional[str], float]:
+    """
+    Parst den Inhalt einer Marker-Datei
+
+    Returns:
+        (Daten, Fehlermeldung oder None, Parse-Zeit in Sekunden)
+    """
+    start = time.perf_counter()
+    try:
+        data, error = yaml.load(raw.decode('utf-8'), Loader=SafeLoader), None
+    except (yaml.YAMLError, UnicodeDecodeError) as e:
+        data, error = None, str(e)
+    return data, error, time.perf_counter() - start
+
+
+def _parse_serial(raws: List[bytes]) -> List[Tuple[Any, Optional[str], float]]:
+    return [parse_marker_bytes(raw) for raw in raws]
+
+
+def _parse_parallel(raws: List[bytes], workers: int) -> List[Tuple[Any, Optional[str], float]]:
+    chunksize = max(1, len(raws) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(parse_marker_bytes, raws, chunksize=chunksize))
+
+
+def load_marker_files(yaml_files: Iterable[Path],
+                      cache=None,
+                      workers: Optional[int] = None) -> List[LoadedMarkerFile]:
+    """
+    Lädt Marker-Dateien, gecachte Einträge direkt, den Rest (parallel) geparst
+
+    Args:
+        yaml_files: Zu ladende YAML-Dateien
+        cache: Optionaler MarkerCache
+        workers: Anzahl Prozesse (None = CPU-Anzahl, 1 = seriell)
+
+    Returns:
+        LoadedMarkerFile pro Datei, in Eingabe-Reihenfolge
+    """
+    results: List[Optional[LoadedMarkerFile]] = []
+    pending: List[Tuple[int, Path, bytes]] = []
+
+    for yaml_file in yaml_files:
+        try:
+            raw = Path(yaml_file).read_bytes()
+        except OSError as e:
+            results.append(LoadedMarkerFile(Path(yaml_file), None, 0.0, error=str(e)))
+            continue
+
+        entry = cache.lookup(yaml_file, raw) if cache is not None else None
+        if entry is not None:
+            _, data, error = entry
+            results.append(LoadedMarkerFile(Path(yaml_file), data, 0.0, cached=True, error=error,
+                                            size=len(raw)))
+        else:
+            pending.append((len(results), Path(yaml_file), raw))
+            results.append(None)
+
+    if pending:
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, len(pending))
+        raws = [raw for _, _, raw in pending]
+
+        parsed = None
+        if workers > 1 and len(pending) >= PARALLEL_MIN_FILES:
+            try:
+                parsed = _parse_parallel(raws, workers)
+            except Exception as e:
+                logger.debug(f"Paralleles Marker-Parsing nicht möglich, parse seriell: {e}")
+        if parsed is None:
+            parsed = _parse_serial(raws)
+
+        for (index, yaml_file, raw), (data, error, parse_time) in zip(pending, parsed):
+            results[index] = LoadedMarkerFile(yaml_file, data, parse_time, error=error, size=len(raw))
+            if cache is not None:
+                cache.store(yaml_file, raw, data, error)
+
+    return results
+
+
+def load_marker_directories(base_path,
+                            subdirs: Iterable[str] = MARKER_LEVEL_DIRS,
+                            cache=None,
+                            workers: Optional[int] = None) -> Dict[str, List[LoadedMarkerFile]]:
+    """
+    Lädt die *.yaml-Dateien mehrerer Marker-Verzeichnisse in einem Durchgang
+
+    Alle Dateien teilen sich einen Pool, damit auch kleine Ebenen parallel laufen.
+    Fehlende Verzeichnisse ergeben leere Listen.
+    """
+    base_path = Path(base_path)
+    subdirs = list(subdirs)
+
+    files_by_dir = {}
+    for subdir in subdirs:
+        directory = base_path / subdir
+        files_by_dir[subdir] = list(directory.glob("*.yaml")) if directory.exists() else []
+
+    all_files = [f for subdir in subdirs for f in files_by_dir[subdir]]
+    loaded = load_marker_files(all_files, cache=cache, workers=workers)
+
+    result = {}
+    offset = 0
+    for subdir in subdirs:
+        count = len(files_by_dir[subdir])
+        result[subdir] = loaded[offset:offset + count]
+        offset += count
+
+    parsed = [f for f in loaded if not f.cached]
+    if parsed:
+        total = sum(f.parse_time for f in parsed)
+        slowest = max(parsed, key=lambda f: f.parse_time)
+        logger.debug(f"{len(parsed)} Marker-Dateien geparst in {total * 1000:.0f} ms "
+                     f"(libyaml: {LIBYAML_AVAILABLE}, langsamste: {slowest.path.name} "
+                     f"{slowest.parse_time * 1000:.1f} ms)")
+
+    return result
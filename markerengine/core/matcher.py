@@ -0,0 +1,124 @@
+"""
+MarkerEngine Phrase Matcher - Aho-Corasick Automat für exakte Beispiel-Phrasen
+Scannt den Text in einem einzigen Durchlauf statt eine Regex pro Beispiel
+"""
+from collections import deque
+from typing import Any, Dict, Hashable, Iterator, List, Tuple
+
+
+def fold_case(text: str) -> str:
+    """
+    Kleinschreibung mit garantiert gleicher Länge, damit Offsets gültig bleiben
+
+    str.lower() kann einzelne Zeichen verlängern (z.B. 'İ'); diese Zeichen
+    bleiben dann unverändert.
+    """
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    return ''.join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+class PhraseMatcher:
+    """
+    Multi-Pattern Matcher (Aho-Corasick) für case-insensitive Literal-Phrasen
+
+    Jede Phrase wird mit einem oder mehreren Keys registriert. search() liefert
+    pro Key dieselben Treffer wie re.finditer(re.escape(phrase), re.IGNORECASE):
+    alle nicht-überlappenden Vorkommen von links nach rechts.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        self._phrases: List[Tuple[int, List[Hashable]]] = []
+        self._phrase_ids: Dict[str, int] = {}
+        self._built = False
+
+    def __len__(self) -> int:
+        return len(self._phrases)
+
+    def add(self, phrase: str, key: Hashable):
+        """Registriert eine Phrase für einen Key (z.B. (marker_id, pattern_index))"""
+        folded = fold_case(phrase)
+        if not folded:
+            return
+
+        phrase_id = self._phrase_ids.get(folded)
+        if phrase_id is not None:
+            self._phrases[phrase_id][1].append(key)
+            return
+
+        state = 0
+        for char in folded:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+
+        phrase_id = len(self._phrases)
+        self._phrase_ids[folded] = phrase_id
+        self._phrases.append((len(folded), [key]))
+        self._output[state].append(phrase_id)
+        self._built = False
+
+    def build(self):
+        """Berechnet die Failure-Links (Breitensuche über den Trie)"""
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                # Outputs der Suffix-Zustände übernehmen
+                self._output[next_state] = (
+                    self._output[next_state] + self._output[self._fail[next_state]]
+                )
+
+        self._built = True
+
+    def search(self, text: str) -> Iterator[Tuple[Any, int, int]]:
+        """
+        Scannt den Text einmal und liefert (key, start, end) für jeden Treffer
+
+        Treffer kommen in Reihenfolge ihrer End-Position.
+        """
+        if not self._phrases:
+            return
+        if not self._built:
+            self.build()
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        phrases = self._phrases
+        last_end = {}
+
+        state = 0
+        for pos, char in enumerate(fold_case(text)):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            if output[state]:
+                end = pos + 1
+                for phrase_id in output[state]:
+                    start = end - phrases[phrase_id][0]
+                    # Wie finditer: keine Überlappung innerhalb derselben Phrase
+                    if start < last_end.get(phrase_id, 0):
+                        continue
+                    last_end[phrase_id] = end
+                    for key in phrases[phrase_id][1]:
+                        yield key, start, end
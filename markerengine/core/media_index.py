@@ -0,0 +1,168 @@
+"""
+MarkerEngine Media Index - Einmal gescannter Medien-Ordner eines WhatsApp-Exports
+Der Ordner wird beim Öffnen des Exports genau einmal mit os.scandir gelesen;
+Audio-Referenzen aus dem Chat werden danach über Dictionaries aufgelöst
+(Dateiname, WhatsApp-Schema Typ-Datum-WA<Nummer>, Datum) statt pro
+Sprachnachricht mehrfach zu globben.
+"""
+import os
+import re
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Audio-Endungen, die als Sprachnachricht in Frage kommen
+AUDIO_SUFFIXES = ('.opus', '.mp4')
+
+# WhatsApp-Schema, z.B. PTT-20240701-WA0001.opus (iOS-Exporte mit Präfix
+# "00000012-PTT-..." werden über das Suffix gefunden)
+WA_NAME = re.compile(r'(?P<kind>[A-Z]+)-(?P<date>\d{8})-WA(?P<seq>\d+)(?P<suffix>\.\w+)$')
+
+# Chat-Datum 01.07.24 bzw. 07/01/24 (Tag und Monat wie im Export)
+CHAT_DATE = re.compile(r'(\d{2})[./](\d{2})[./](\d{2})')
+
+# Typen der Sprachnachricht-Fallbacks in der bisherigen Reihenfolge
+FALLBACK_KINDS = (('AUD', '.opus'), ('PTT', '.opus'), ('VID', '.mp4'))
+
+WAKey = Tuple[str, str, int, str]
+
+
+def wa_key(name: str) -> Optional[WAKey]:
+    """(Typ, Datum JJJJMMTT, WA-Nummer, Endung) eines WhatsApp-Dateinamens"""
+    match = WA_NAME.search(name)
+    if match is None:
+        return None
+    return (match.group('kind'), match.group('date'), int(match.group('seq')),
+            match.group('suffix').lower())
+
+
+def chat_dates(timestamp: str) -> List[str]:
+    """Mögliche Daten eines Chat-Zeitstempels im Format der Dateinamen (JJJJMMTT)"""
+    match = CHAT_DATE.match(timestamp)
+    if match is None:
+        return []
+    first, second, year = match.groups()
+    dates = [f"20{year}{second}{first}"]
+    if '/' in match.group(0):
+        # Englische Exporte: TT/MM/JJ oder MM/TT/JJ
+        dates.append(f"20{year}{first}{second}")
+    return dates
+
+
+class MediaIndex:
+    """
+    Index der Dateien eines Medien-Ordners
+
+    by_name:  Dateiname -> Pfad
+    by_reversed: umgekehrte Dateinamen, sortiert (Suffix-Suche per bisect
+              über alle Dateien, auch Nicht-Audio-Anhänge)
+    by_wa:    (Typ, Datum, WA-Nummer, Endung) -> Pfad
+    by_date:  (Typ, Datum) -> Pfade nach WA-Nummer sortiert
+    first_of_kind: Typ -> erste Datei nach (Datum, WA-Nummer)
+    other:    Audio-Dateien außerhalb des WhatsApp-Schemas (für die
+              Zeitstempel-Suche, typischerweise leer)
+    """
+
+    def __init__(self, media_path):
+        self.media_path = Path(media_path)
+        self.by_name: Dict[str, Path] = {}
+        self.by_reversed: List[str] = []
+        self.by_wa: Dict[WAKey, Path] = {}
+        self.by_date: Dict[Tuple[str, str], List[Path]] = {}
+        self.first_of_kind: Dict[str, Path] = {}
+        self.other: List[Path] = []
+        self.audio_count = 0
+        self._scan()
+
+    def _scan(self):
+        try:
+            entries = sorted(
+                (entry.name, entry.path) for entry in os.scandir(self.media_path)
+                if entry.is_file()
+            )
+        except OSError:
+            entries = []
+
+        sequenced = []
+        for name, path in entries:
+            path = Path(path)
+            self.by_name[name] = path
+            if not name.lower().endswith(AUDIO_SUFFIXES):
+                continue
+            self.audio_count += 1
+            key = wa_key(name)
+            if key is None:
+                self.other.append(path)
+                continue
+            self.by_wa.setdefault(key, path)
+            sequenced.append((key, path))
+
+        self.by_reversed = sorted(name[::-1] for name in self.by_name)
+
+        for (kind, date, _, suffix), path in sorted(sequenced):
+            self.by_date.setdefault((kind + suffix, date), []).append(path)
+            self.first_of_kind.setdefault(kind + suffix, path)
+
+    def __len__(self) -> int:
+        return len(self.by_name)
+
+    @property
+    def has_audio(self) -> bool:
+        """Enthält der Ordner .opus- oder .mp4-Dateien?"""
+        return self.audio_count > 0
+
+    def find_suffix(self, suffix: str) -> Optional[Path]:
+        """Datei, deren Name auf suffix endet (bei mehreren die erste nach Namen)"""
+        if not suffix:
+            return None
+        prefix = suffix[::-1]
+        index = bisect_left(self.by_reversed, prefix)
+        names = []
+        while index < len(self.by_reversed) and self.by_reversed[index].startswith(prefix):
+            names.append(self.by_reversed[index][::-1])
+            index += 1
+        return self.by_name[min(names)] if names else None
+
+    def find_audio(self, audio_file: str, timestamp: str) -> Optional[Path]:
+        """
+        Löst eine Audio-Referenz aus dem Chat auf
+
+        Reihenfolge wie bisher: exakter Name, Name als Suffix (über alle
+        Dateien), Zeitstempel im Namen, WhatsApp-Sprachnachricht (bevorzugt
+        vom selben Tag), Zeitstempel ohne Trennzeichen im Namen.
+        """
+        path = self.by_name.get(audio_file)
+        if path is not None:
+            return path
+
+        path = self.find_suffix(audio_file)
+        if path is not None:
+            return path
+        key = wa_key(audio_file)
+        if key is not None and key in self.by_wa:
+            return self.by_wa[key]
+
+        # Zeitstempel im Dateinamen (nur außerhalb des WhatsApp-Schemas möglich)
+        dashed = timestamp.replace(':', '-').replace('.', '-')
+        for suffix in AUDIO_SUFFIXES:
+            for other in self.other:
+                if dashed in other.name and other.name.endswith(suffix):
+                    return other
+
+        dates = chat_dates(timestamp)
+        for kind, suffix in FALLBACK_KINDS:
+            for date in dates:
+                candidates = self.by_date.get((kind + suffix, date))
+                if candidates:
+                    return candidates[0]
+        for kind, suffix in FALLBACK_KINDS:
+            path = self.first_of_kind.get(kind + suffix)
+            if path is not None:
+                return path
+
+        compact = timestamp.replace('.', '').replace(',', '').replace(':', '')
+        for suffix in AUDIO_SUFFIXES:
+            for other in self.other:
+                if compact in str(other) and other.name.endswith(suffix):
+                    return other
+        return None
@@ -0,0 +1,165 @@
+"""
+MarkerEngine Parallel - Atomic-Erkennung über mehrere Prozesse
+Der Text wird an Nachrichtengrenzen in Abschnitte geteilt; jeder Abschnitt
+wird (wie im chunked_reader) um eine Überlappung erweitert und in einem
+Worker gescannt. Die kompilierten Marker erhält jeder Worker genau einmal
+über den Pool-Initializer; zurück kommen nur Offsets, die Treffer-Objekte
+entstehen im Hauptprozess mit globalen Positionen.
+"""
+import os
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .chat_parser import MessageTable, parse_chat
+from .chunked_reader import TextWindow
+
+# Unterhalb dieser Textlänge (Zeichen) lohnt sich kein Prozess-Pool
+PARALLEL_MIN_CHARS = 256 * 1024
+
+# Überlappung der Abschnitte in Zeichen (größer als der längste Treffer + Kontext)
+PARTITION_OVERLAP = 4096
+
+# Abschnitte pro Worker (kleinere Abschnitte gleichen Lastunterschiede aus)
+PARTITIONS_PER_WORKER = 4
+
+# Attribute, die ein Worker zum Scannen braucht
+_MARKER_ENGINE_STATE = ('phrase_matcher', 'fallback_patterns', 'overlap_policy', 'overlap_scope')
+_PATTERN_ENGINE_STATE = ('compiled_patterns', 'overlap_policy', 'overlap_scope')
+
+# Zustand im Worker-Prozess (vom Initializer gesetzt)
+_worker: Dict[str, Any] = {}
+
+
+def partition_text(text: str, parts: int, messages: Optional[MessageTable] = None,
+                   overlap: int = PARTITION_OVERLAP) -> List[TextWindow]:
+    """
+    Teilt den Text in höchstens `parts` Fenster, deren Kerne an Nachrichtengrenzen liegen
+
+    Die Kerne schließen lückenlos aneinander an; die Überlappung wird auf
+    Zeilengrenzen gerundet, wenn innerhalb von `overlap` Zeichen eine liegt.
+    """
+    if not text:
+        return []
+    if messages is None:
+        messages = parse_chat(text)
+    length = len(text)
+    starts = messages.starts
+
+    cuts = [0]
+    for i in range(1, max(1, parts)):
+        # Erste Nachricht, die am oder hinter dem Zielpunkt beginnt
+        index = bisect_left(starts, length * i // parts)
+        cut = starts[index] if index < len(starts) else length
+        if cut > cuts[-1]:
+            cuts.append(cut)
+    if cuts[-1] < length:
+        cuts.append(length)
+
+    windows = []
+    for core_start, core_end in zip(cuts, cuts[1:]):
+        left = max(0, core_start - overlap)
+        if left > 0:
+            newline = text.rfind('\n', max(0, left - overlap), left)
+            left = newline + 1 if newline != -1 else left
+        right = min(length, core_end + overlap)
+        if right < length:
+            newline = text.find('\n', right, right + overlap)
+            right = newline + 1 if newline != -1 else right
+        windows.append(TextWindow(text[left:right], left, core_start - left, core_end - left))
+    return windows
+
+
+def _scan_state(engine) -> Tuple[str, Dict[str, Any]]:
+    """Kompilierter Marker-Satz einer Engine für die Worker"""
+    from .engine import MarkerEngine
+
+    if isinstance(engine, MarkerEngine):
+        return 'marker', {name: getattr(engine, name) for name in _MARKER_ENGINE_STATE}
+    return 'pattern', {name: getattr(engine, name) for name in _PATTERN_ENGINE_STATE}
+
+
+def _init_worker(kind: str, state: Dict[str, Any]):
+    """Pool-Initializer: baut die Scan-Engine des Workers aus dem Marker-Satz"""
+    if kind == 'marker':
+        from .engine import MarkerEngine as engine_class
+    else:
+        from .pattern_engine import MarkerPatternEngine as engine_class
+
+    # Ohne __init__: kein erneutes Laden, nur die zum Scannen nötigen Attribute
+    engine = engine_class.__new__(engine_class)
+    engine.__dict__.update(state)
+    engine.scan_workers = 1
+    _worker['kind'] = kind
+    _worker['engine'] = engine
+
+
+def _scan_window(task: Tuple[TextWindow, str]) -> List[tuple]:
+    """
+    Scannt ein Fenster im Worker; liefert nur Treffer, die im Kern beginnen
+
+    Überlappungen werden nicht hier, sondern im Hauptprozess über alle
+    Fenster aufgelöst (ein Treffer kann einen aus dem Nachbar-Fenster verdrängen).
+    """
+    window, level = task
+    engine = _worker['engine']
+    offset = window.offset
+
+    if _worker['kind'] == 'marker':
+        return [
+            (marker_id, pattern_index, start + offset, end + offset)
+            for marker_id, pattern_index, start, end in engine._raw_atomic_spans(window.text)
+            if window.owns(start)
+        ]
+
+    return [
+        (marker_id, pattern_index, start + offset, end + offset, confidence)
+        for marker_id, pattern_index, start, end, confidence in engine._pattern_spans(window.text, level)
+        if window.owns(start)
+    ]
+
+
+class ParallelScanner:
+    """
+    Prozess-Pool für die Atomic-Erkennung einer Engine
+
+    Der Pool wird beim ersten Scan gestartet und bleibt bis close() bestehen,
+    damit der Marker-Satz nur einmal pro Worker übertragen wird.
+    """
+
+    def __init__(self, engine, workers: Optional[int] = None,
+                 overlap: int = PARTITION_OVERLAP):
+        self.engine = engine
+        self.workers = workers or os.cpu_count() or 1
+        self.overlap = overlap
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            kind, state = _scan_state(self.engine)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(kind, state)
+            )
+        return self._pool
+
+    def _scan(self, text: str, level: str, messages: Optional[MessageTable]) -> List[tuple]:
+        windows = partition_text(text, self.workers * PARTITIONS_PER_WORKER, messages, self.overlap)
+        results = []
+        for found in self._get_pool().map(_scan_window, [(window, level) for window in windows]):
+            results.extend(found)
+        return results
+
+    def atomic_spans(self, text: str, messages: Optional[MessageTable] = None) -> List[Tuple[str, int, int, int]]:
+        """Wie MarkerEngine._raw_atomic_spans() mit globalen Offsets"""
+        return self._scan(text, 'atomic', messages)
+
+    def pattern_matches(self, text: str, level: str = 'atomic',
+                        messages: Optional[MessageTable] = None) -> List[Tuple[str, int, int, int, float]]:
+        """Wie MarkerPatternEngine._pattern_spans() mit globalen Offsets"""
+        return self._scan(text, level, messages)
+
+    def close(self):
+        """Beendet den Prozess-Pool"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
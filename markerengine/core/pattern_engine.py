@@ -2,25 +2,112 @@
 MarkerEngine Pattern Detector - Richtige Pattern-Erkennung
 """
 import re
+import threading
+import time
 import yaml
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 import logging
 
+from .chunked_reader import DEFAULT_CHUNK_SIZE, DEFAULT_OVERLAP, iter_text_windows
+from .marker_cache import MarkerCache
+from .marker_loader import load_marker_directories
+from .proximity import ProximityPattern, TokenIndex
+from .spans import POLICIES, SCOPES, resolve_overlaps
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Standard-Pfad zum markers/ Verzeichnis im Projekt-Wurzelverzeichnis
+DEFAULT_MARKERS_PATH = Path(__file__).parent.parent.parent / "markers"
+
+# Maximal erlaubte Tokens zwischen zwei Keywords eines Fuzzy-Patterns
+FUZZY_MAX_GAP = 8
+
+# Zeichen Kontext links und rechts eines Matches
+CONTEXT_CHARS = 50
+
 class PatternMatch:
-    """Repräsentiert einen Pattern-Match"""
-    marker_id: str
-    marker_name: str
-    pattern: str
-    match_text: str
-    start_pos: int
-    end_pos: int
-    confidence: float
-    context: str
+    """
+    Repräsentiert einen Pattern-Match
+    
+    Kompakt (__slots__): Matches aus from_source() halten nur Offsets sowie
+    Referenzen auf Quelltext, Pattern und Marker-Daten; match_text, context,
+    pattern und marker_name werden erst beim Zugriff erzeugt.
+    """
+    
+    __slots__ = ('marker_id', 'start_pos', 'end_pos', 'confidence',
+                 '_marker_name', '_pattern', '_match_text', '_context', '_source', '_data')
+    
+    def __init__(self, marker_id: str, marker_name: str, pattern: str, match_text: str,
+                 start_pos: int, end_pos: int, confidence: float, context: str):
+        self.marker_id = marker_id
+        self.start_pos = start_pos
+        self.end_pos = end_pos
+        self.confidence = confidence
+        self._marker_name = marker_name
+        self._pattern = pattern
+        self._match_text = match_text
+        self._context = context
+        self._source = None
+        self._data = None
+        
+    @classmethod
+    def from_source(cls, marker_id: str, source: str, start_pos: int, end_pos: int,
+                    confidence: float, pattern: Any, marker_data: Dict) -> 'PatternMatch':
+        """Match, dessen Texte aus source, pattern und marker_data abgeleitet werden"""
+        match = cls.__new__(cls)
+        match.marker_id = marker_id
+        match.start_pos = start_pos
+        match.end_pos = end_pos
+        match.confidence = confidence
+        match._marker_name = None
+        match._pattern = pattern
+        match._match_text = None
+        match._context = None
+        match._source = source
+        match._data = marker_data
+        return match
+        
+    @property
+    def marker_name(self) -> str:
+        if self._marker_name is None and self._data is not None:
+            return self._data.get('beschreibung', '')[:100]
+        return self._marker_name
+        
+    @property
+    def pattern(self) -> str:
+        return self._pattern if isinstance(self._pattern, str) else self._pattern.pattern
+        
+    @property
+    def match_text(self) -> str:
+        if self._match_text is None and self._source is not None:
+            return self._source[self.start_pos:self.end_pos]
+        return self._match_text
+        
+    @property
+    def context(self) -> str:
+        if self._context is None and self._source is not None:
+            start = max(0, self.start_pos - CONTEXT_CHARS)
+            end = min(len(self._source), self.end_pos + CONTEXT_CHARS)
+            return self._source[start:end]
+        return self._context
+        
+    def _fields(self) -> tuple:
+        return (self.marker_id, self.marker_name, self.pattern, self.match_text,
+                self.start_pos, self.end_pos, self.confidence, self.context)
+        
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+        
+    __hash__ = None
+        
+    def __repr__(self) -> str:
+        return (f"PatternMatch(marker_id={self.marker_id!r}, marker_name={self.marker_name!r}, "
+                f"pattern={self.pattern!r}, match_text={self.match_text!r}, "
+                f"start_pos={self.start_pos!r}, end_pos={self.end_pos!r}, "
+                f"confidence={self.confidence!r}, context={self.context!r})")
 
 class MarkerPatternEngine:
     """
@@ -28,13 +115,41 @@ class MarkerPatternEngine:
     Unterstützt verschiedene Matching-Strategien
     """
     
-    def __init__(self, markers_path: str = None):
-        """Initialisiert die Pattern Engine"""
+    def __init__(self, markers_path: str = None, use_cache: bool = True,
+                 load_workers: Optional[int] = None, overlap_policy: str = 'confidence',
+                 overlap_scope: str = 'global', scan_workers: Optional[int] = 1):
+        """
+        Initialisiert die Pattern Engine
+        
+        Args:
+            markers_path: Pfad zum markers/ Verzeichnis
+            use_cache: Geparste YAMLs aus dem persistenten Marker-Cache laden
+            load_workers: Prozesse für das YAML-Parsing (None = CPU-Anzahl, 1 = seriell)
+            overlap_policy: Welcher überlappende Match bleibt ('confidence',
+                'longest', 'first'; siehe spans.POLICIES)
+            overlap_scope: 'global' (alle Marker konkurrieren) oder 'marker'
+                (nur Matches desselben Markers)
+            scan_workers: Prozesse für detect_patterns() auf großen Texten
+                (1 = seriell, None = CPU-Anzahl; siehe parallel.ParallelScanner)
+        """
+        if overlap_policy not in POLICIES:
+            raise ValueError(f"Unbekannte Overlap-Policy: {overlap_policy}")
+        if overlap_scope not in SCOPES:
+            raise ValueError(f"Unbekannter Overlap-Scope: {overlap_scope}")
+        self.overlap_policy = overlap_policy
+        self.overlap_scope = overlap_scope
+        
         if markers_path is None:
-            base_path = Path(__file__).parent.parent.parent
-            markers_path = base_path / "markers"
+            markers_path = DEFAULT_MARKERS_PATH
         
         self.markers_path = Path(markers_path)
+        self._marker_cache = MarkerCache(self.markers_path, enabled=use_cache)
+        self.load_workers = load_workers
+        self.scan_workers = scan_workers
+        self._scanner = None
+        # Geteilte Engines (Registry): der Pool wird nur einmal gestartet
+        self._scanner_lock = threading.Lock()
+        self.load_report = []
         self.compiled_patterns = {
             'atomic': {},
             'semantic': {},
@@ -47,29 +162,31 @@ class MarkerPatternEngine:
     
     def _compile_all_patterns(self):
         """Lädt und kompiliert alle Marker-Patterns"""
+        marker_files = load_marker_directories(
+            self.markers_path, ('atomic',), cache=self._marker_cache, workers=self.load_workers
+        )
+        self.load_report = marker_files['atomic']
         
         # Atomic Markers
-        atomic_path = self.markers_path / "atomic"
-        if atomic_path.exists():
-            for yaml_file in atomic_path.glob("*.yaml"):
-                try:
-                    with open(yaml_file, 'r', encoding='utf-8') as f:
-                        data = yaml.safe_load(f)
-                        if data:
-                            patterns = self._extract_patterns_from_marker(data)
-                            if patterns:
-                                marker_id = data.get('marker_name', yaml_file.stem)
-                                self.compiled_patterns['atomic'][marker_id] = {
-                                    'data': data,
-                                    'patterns': patterns
-                                }
-                                logger.info(f"Compiled {len(patterns)} patterns for {marker_id}")
-                except Exception as e:
-                    logger.error(f"Error loading {yaml_file}: {e}")
+        for marker_file in marker_files['atomic']:
+            try:
+                data = marker_file.result()
+                if data:
+                    patterns = self._extract_patterns_from_marker(data)
+                    if patterns:
+                        marker_id = data.get('marker_name', marker_file.path.stem)
+                        self.compiled_patterns['atomic'][marker_id] = {
+                            'data': data,
+                            'patterns': patterns
+                        }
+                        logger.info(f"Compiled {len(patterns)} patterns for {marker_id}")
+            except Exception as e:
+                logger.error(f"Error loading {marker_file.path}: {e}")
         
+        self._marker_cache.save()
         print(f"✅ Pattern Engine bereit: {len(self.compiled_patterns['atomic'])} Atomic Marker geladen")
     
-    def _extract_patterns_from_marker(self, marker_data: Dict) -> List[re.Pattern]:
+    def _extract_patterns_from_marker(self, marker_data: Dict) -> List[Any]:
         """Extrahiert und kompiliert Patterns aus Marker-Daten"""
         patterns = []
         
@@ -113,12 +230,10 @@ class MarkerPatternEngine:
                         # Extrahiere Schlüsselwörter
                         keywords = self._extract_keywords(clean)
                         if len(keywords) >= 2:
-                            # Erstelle Pattern mit Wildcards zwischen Keywords
-                            fuzzy_pattern = r'\b' + r'.*?'.join(re.escape(kw) for kw in keywords) + r'\b'
-                            try:
-                                patterns.append(re.compile(fuzzy_pattern, re.IGNORECASE))
-                            except:
-                                pass
+                            # Keywords in Reihenfolge, begrenzter Token-Abstand statt .*?
+                            fuzzy_pattern = ProximityPattern(keywords, max_gap=FUZZY_MAX_GAP)
+                            if len(fuzzy_pattern.tokens) >= 2:
+                                patterns.append(fuzzy_pattern)
         
         return patterns
     
@@ -140,62 +255,166 @@ class MarkerPatternEngine:
         
         return keywords
     
-    def detect_patterns(self, text: str, level: str = 'atomic') -> List[PatternMatch]:
+    def detect_patterns(self, text: str, level: str = 'atomic',
+                        profiler=None) -> List[PatternMatch]:
         """
         Erkennt Patterns im Text
         
         Args:
             text: Der zu analysierende Text
             level: Marker-Level (atomic, semantic, etc.)
+            profiler: Optionaler MarkerProfiler (Laufzeit/Treffer pro Pattern)
             
         Returns:
             Liste von PatternMatch-Objekten
         """
-        matches = []
+        if profiler is None and self.scan_workers != 1:
+            from .parallel import PARALLEL_MIN_CHARS
+            if len(text) >= PARALLEL_MIN_CHARS:
+                return self._detect_patterns_parallel(text, level)
+            
+        matches = self._build_matches(text, level, self._pattern_spans(text, level, profiler))
+        
+        # Dedupliziere überlappende Matches
+        matches = self._deduplicate_matches(matches)
+        
+        return matches
+    
+    def _pattern_spans(self, text: str, level: str = 'atomic',
+                       profiler=None) -> List[Tuple[str, int, int, int, float]]:
+        """
+        Alle Matches als (Marker-ID, Pattern-Index, Start, Ende, Konfidenz)
+        
+        In Reihenfolge Marker -> Pattern -> Position, Überlappungen noch nicht
+        aufgelöst (die Worker des Prozess-Pools liefern genau diese Spans).
+        """
+        spans = []
+        token_index = None
         
         for marker_id, marker_info in self.compiled_patterns[level].items():
-            patterns = marker_info['patterns']
-            data = marker_info['data']
-            
-            for pattern in patterns:
+            for pattern_index, pattern in enumerate(marker_info['patterns']):
+                # Keyword-Patterns laufen über den (einmal aufgebauten) Token-Index
+                if isinstance(pattern, ProximityPattern) and token_index is None:
+                    started = time.perf_counter()
+                    token_index = TokenIndex(text)
+                    if profiler is not None:
+                        profiler.record_shared("<Token-Index>", time.perf_counter() - started)
+                        
+                started = time.perf_counter() if profiler is not None else 0.0
+                before = len(spans)
                 try:
-                    # Finde alle Matches
-                    for match in pattern.finditer(text):
-                        # Extrahiere Kontext
-                        start = max(0, match.start() - 50)
-                        end = min(len(text), match.end() + 50)
-                        context = text[start:end]
+                    if isinstance(pattern, ProximityPattern):
+                        found = pattern.finditer(token_index)
+                    else:
+                        found = pattern.finditer(text)
                         
+                    # Finde alle Matches
+                    for match in found:
                         # Berechne Konfidenz
                         confidence = self._calculate_confidence(match, pattern, text)
-                        
-                        pattern_match = PatternMatch(
-                            marker_id=marker_id,
-                            marker_name=data.get('beschreibung', '')[:100],
-                            pattern=pattern.pattern,
-                            match_text=match.group(0),
-                            start_pos=match.start(),
-                            end_pos=match.end(),
-                            confidence=confidence,
-                            context=context
-                        )
-                        
-                        matches.append(pattern_match)
+                        spans.append((marker_id, pattern_index, match.start(), match.end(), confidence))
                         
                 except Exception as e:
                     logger.debug(f"Pattern matching error for {marker_id}: {e}")
+                    
+                if profiler is not None:
+                    profiler.record(marker_id, pattern, time.perf_counter() - started,
+                                    len(spans) - before)
         
-        # Dedupliziere überlappende Matches
-        matches = self._deduplicate_matches(matches)
-        
+        return spans
+    
+    def _build_matches(self, text: str, level: str,
+                       spans: List[Tuple[str, int, int, int, float]]) -> List[PatternMatch]:
+        """PatternMatches aus Spans (Kontext, Match-Text und Name werden erst bei Bedarf gelesen)"""
+        compiled = self.compiled_patterns[level]
+        matches = []
+        for marker_id, pattern_index, start, end, confidence in spans:
+            info = compiled[marker_id]
+            matches.append(PatternMatch.from_source(
+                marker_id, text, start, end, confidence,
+                info['patterns'][pattern_index], info['data']
+            ))
         return matches
     
-    def _calculate_confidence(self, match: re.Match, pattern: re.Pattern, text: str) -> float:
+    def _get_scanner(self):
+        """Prozess-Pool der Engine (beim ersten Aufruf gestartet, thread-sicher)"""
+        with self._scanner_lock:
+            if self._scanner is None:
+                from .parallel import ParallelScanner
+                self._scanner = ParallelScanner(self, self.scan_workers)
+            return self._scanner
+    
+    def _detect_patterns_parallel(self, text: str, level: str) -> List[PatternMatch]:
+        """
+        detect_patterns() über den Prozess-Pool
+        
+        Die Worker liefern die Spans ihrer Abschnitte ohne Überlappungs-
+        Auflösung; sie erfolgt hier über alle Abschnitte, wie seriell.
+        """
+        spans = self._get_scanner().pattern_matches(text, level)
+        return self._deduplicate_matches(self._build_matches(text, level, spans))
+    
+    def close(self):
+        """Beendet einen gestarteten Scan-Prozess-Pool"""
+        with self._scanner_lock:
+            if self._scanner is not None:
+                self._scanner.close()
+                self._scanner = None
+    
+    def detect_patterns_file(self, file_path: str, level: str = 'atomic',
+                             chunk_size: int = DEFAULT_CHUNK_SIZE,
+                             overlap: int = DEFAULT_OVERLAP) -> Tuple[List[PatternMatch], int]:
+        """
+        Wie detect_patterns(), liest die Datei aber per mmap in überlappenden Blöcken
+        
+        Matches halten Match-Text und Kontext selbst (kein Verweis auf den Block),
+        Positionen sind Zeichen-Offsets im Gesamttext.
+        
+        Returns:
+            (Matches, Textlänge in Zeichen)
+        """
+        matches = []
+        text_length = 0
+        for block, text_length in self.iter_patterns_file(file_path, level, chunk_size, overlap):
+            matches.extend(block)
+        return matches, text_length
+    
+    def iter_patterns_file(self, file_path: str, level: str = 'atomic',
+                           chunk_size: int = DEFAULT_CHUNK_SIZE,
+                           overlap: int = DEFAULT_OVERLAP) -> Iterator[Tuple[List[PatternMatch], int]]:
+        """
+        Matches blockweise, sobald ein Block gescannt ist
+        
+        Yields:
+            (Matches des Blocks nach Position sortiert, bisher gelesene Zeichen);
+            die Blöcke folgen in Textreihenfolge, zusammen ergeben sie die
+            sortierte Liste von detect_patterns_file()
+        """
+        for window in iter_text_windows(file_path, chunk_size, overlap):
+            offset = window.offset
+            block = []
+            for match in self.detect_patterns(window.text, level):
+                if window.owns(match.start_pos):
+                    block.append(PatternMatch(
+                        marker_id=match.marker_id,
+                        marker_name=match.marker_name,
+                        pattern=match.pattern,
+                        match_text=match.match_text,
+                        start_pos=match.start_pos + offset,
+                        end_pos=match.end_pos + offset,
+                        confidence=match.confidence,
+                        context=match.context
+                    ))
+            block.sort(key=lambda m: (m.start_pos, m.end_pos))
+            yield block, window.end_offset
+    
+    def _calculate_confidence(self, match: re.Match, pattern: Any, text: str) -> float:
         """Berechnet Konfidenz-Score für einen Match"""
         confidence = 0.8  # Basis-Konfidenz
         
         # Exakte Matches haben höhere Konfidenz
-        if not any(meta in pattern.pattern for meta in ['.*', '.+', '\\b']):
+        is_fuzzy = isinstance(pattern, ProximityPattern)
+        if not is_fuzzy and not any(meta in pattern.pattern for meta in ['.*', '.+', '\\b']):
             confidence = 0.95
         
         # Längere Matches sind vertrauenswürdiger
@@ -214,39 +433,33 @@ class MarkerPatternEngine:
         return min(1.0, max(0.1, confidence))
     
     def _deduplicate_matches(self, matches: List[PatternMatch]) -> List[PatternMatch]:
-        """Entfernt überlappende Matches, behält die mit höchster Konfidenz"""
+        """Entfernt überlappende Matches gemäß overlap_policy / overlap_scope"""
         if not matches:
             return []
         
-        # Sortiere nach Position und Konfidenz
-        sorted_matches = sorted(matches, key=lambda m: (m.start_pos, -m.confidence))
-        
-        deduplicated = []
-        last_end = -1
-        
-        for match in sorted_matches:
-            # Keine Überlappung
-            if match.start_pos >= last_end:
-                deduplicated.append(match)
-                last_end = match.end_pos
-            # Überlappung, aber höhere Konfidenz
-            elif deduplicated and match.confidence > deduplicated[-1].confidence:
-                # Ersetze den letzten Match
-                deduplicated[-1] = match
-                last_end = match.end_pos
+        deduplicated = resolve_overlaps(
+            matches,
+            start=lambda m: m.start_pos,
+            end=lambda m: m.end_pos,
+            confidence=lambda m: m.confidence,
+            group=(lambda m: m.marker_id) if self.overlap_scope == 'marker' else None,
+            policy=self.overlap_policy
+        )
         
+        # Sortiere nach Position
+        deduplicated.sort(key=lambda m: (m.start_pos, m.end_pos))
         return deduplicated
 
 # Integration in den Real Analyzer
 def enhance_real_analyzer():
     """Erweitert den Real Analyzer mit der Pattern Engine"""
     
-    from .real_analyzer import RealMarkerAnalyzer, MarkerResult
+    from .real_analyzer import RealMarkerAnalyzer
     
     # Monkey-patch die detect-Methode
     original_analyze = RealMarkerAnalyzer.analyze_text
     
-    def enhanced_analyze_text(self, text: str) -> Dict[str, Any]:
+    def enhanced_analyze_text(self, text: str, on_hits=None) -> Dict[str, Any]:
         """Erweiterte Analyse mit Pattern Engine"""
         
         # Verwende Pattern Engine
@@ -256,42 +469,9 @@ def enhance_real_analyzer():
         # Erkenne Patterns
         pattern_matches = self.pattern_engine.detect_patterns(text, 'atomic')
         
-        # Konvertiere zu MarkerResults
-        results = {
-            'timestamp': datetime.now().isoformat(),
-            'text_length': len(text),
-            'atomic_hits': [],
-            'semantic_hits': [],
-            'cluster_hits': [],
-            'meta_hits': [],
-            'statistics': {},
-            'risk_score': 0.0
-        }
-        
-        # Konvertiere PatternMatches zu MarkerResults
-        for match in pattern_matches:
-            marker_result = MarkerResult(
-                marker_id=match.marker_id,
-                marker_name=match.marker_name,
-                level='atomic',
-                matches=[match.match_text],
-                confidence=match.confidence,
-                position=match.start_pos,
-                context=match.context
-            )
-            results['atomic_hits'].append(marker_result)
-        
-        # Berechne Statistiken
-        results['statistics'] = {
-            'total_atomic_hits': len(results['atomic_hits']),
-            'unique_atomic_markers': len(set(h.marker_id for h in results['atomic_hits'])),
-            'high_risk_markers': self._count_high_risk_markers(results['atomic_hits'])
-        }
-        
-        # Berechne Risk Score
-        results['risk_score'] = self._calculate_risk_score(results)
-        
-        return results
+        # Konvertiere PatternMatches zu MarkerResults, Statistiken und Risk Score
+        atomic_hits = [self._marker_result(match) for match in pattern_matches]
+        return self._finish_results(len(text), atomic_hits, on_hits)
     
     # Ersetze die Methode
     RealMarkerAnalyzer.analyze_text = enhanced_analyze_text
@@ -0,0 +1,194 @@
+"""
+MarkerEngine Profiler - Kosten pro Marker und pro Pattern
+Sammelt während detect_patterns() / _detect_atomic_markers() die kumulierte
+Laufzeit und Trefferzahl jedes Patterns und erstellt daraus eine Rangliste,
+um teure Marker der Bibliothek zu finden.
+
+    python -m markerengine.core.profiler chat.txt --engine pattern --top 20
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional
+
+from .proximity import ProximityPattern
+
+# Pseudo-Marker für geteilte Durchläufe (Phrasen-Automat, Token-Index)
+SHARED = '*'
+
+
+class PatternStats:
+    """Kumulierte Messwerte eines Patterns"""
+
+    __slots__ = ('marker_id', 'pattern', 'kind', 'calls', 'time', 'hits')
+
+    def __init__(self, marker_id: str, pattern: str, kind: str):
+        self.marker_id = marker_id
+        self.pattern = pattern
+        self.kind = kind
+        self.calls = 0
+        self.time = 0.0
+        self.hits = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'marker_id': self.marker_id,
+            'pattern': self.pattern,
+            'kind': self.kind,
+            'calls': self.calls,
+            'time': self.time,
+            'time_per_call': self.time / self.calls if self.calls else 0.0,
+            'hits': self.hits,
+        }
+
+
+def _pattern_kind(pattern: Any) -> str:
+    if isinstance(pattern, ProximityPattern):
+        return 'proximity'
+    if isinstance(pattern, str):
+        return 'shared'
+    return 'regex'
+
+
+class MarkerProfiler:
+    """
+    Sammelt Laufzeit und Treffer pro (Marker, Pattern)
+
+    Wird als `profiler=` an detect_patterns() bzw. _detect_atomic_markers()
+    übergeben; ohne Profiler laufen beide unverändert.
+    """
+
+    def __init__(self):
+        self._patterns: Dict[tuple, PatternStats] = {}
+        # Treffer aus geteilten Durchläufen, den Markern zugeordnet
+        self._shared_hits: Dict[str, int] = {}
+
+    def record(self, marker_id: str, pattern: Any, elapsed: float, hits: int = 0):
+        """Verbucht einen Pattern-Durchlauf"""
+        text = pattern if isinstance(pattern, str) else pattern.pattern
+        key = (marker_id, text)
+        stats = self._patterns.get(key)
+        if stats is None:
+            stats = PatternStats(marker_id, text, _pattern_kind(pattern))
+            self._patterns[key] = stats
+        stats.calls += 1
+        stats.time += elapsed
+        stats.hits += hits
+
+    def record_shared(self, name: str, elapsed: float, hits_by_marker: Optional[Dict[str, int]] = None):
+        """Verbucht einen Durchlauf, der alle Marker zugleich bedient (z.B. Phrasen-Automat)"""
+        hits_by_marker = hits_by_marker or {}
+        self.record(SHARED, name, elapsed, sum(hits_by_marker.values()))
+        for marker_id, hits in hits_by_marker.items():
+            self._shared_hits[marker_id] = self._shared_hits.get(marker_id, 0) + hits
+
+    def reset(self):
+        self._patterns.clear()
+        self._shared_hits.clear()
+
+    @property
+    def total_time(self) -> float:
+        return sum(stats.time for stats in self._patterns.values())
+
+    def patterns(self) -> List[PatternStats]:
+        """Alle Patterns, teuerste zuerst"""
+        return sorted(self._patterns.values(), key=lambda s: s.time, reverse=True)
+
+    def markers(self) -> List[Dict[str, Any]]:
+        """Kosten pro Marker (Summe seiner Patterns), teuerste zuerst"""
+        by_marker: Dict[str, Dict[str, Any]] = {}
+        for stats in self._patterns.values():
+            entry = by_marker.setdefault(stats.marker_id, {
+                'marker_id': stats.marker_id, 'time': 0.0, 'hits': 0, 'patterns': 0
+            })
+            entry['time'] += stats.time
+            entry['hits'] += stats.hits
+            entry['patterns'] += 1
+        for marker_id, hits in self._shared_hits.items():
+            entry = by_marker.setdefault(marker_id, {
+                'marker_id': marker_id, 'time': 0.0, 'hits': 0, 'patterns': 0
+            })
+            entry['hits'] += hits
+
+        total = self.total_time
+        for entry in by_marker.values():
+            entry['share'] = entry['time'] / total if total else 0.0
+        return sorted(by_marker.values(), key=lambda e: e['time'], reverse=True)
+
+    def report(self, top: Optional[int] = None) -> Dict[str, Any]:
+        """Rangliste als JSON-fähiges Dict"""
+        return {
+            'total_time': self.total_time,
+            'markers': self.markers()[:top],
+            'patterns': [stats.as_dict() for stats in self.patterns()[:top]],
+        }
+
+    def format_report(self, top: int = 20) -> str:
+        """Rangliste als Text"""
+        total = self.total_time
+        lines = [f"Gesamt: {total * 1000:.1f} ms", "", f"Teuerste Marker (Top {top}):"]
+        for entry in self.markers()[:top]:
+            lines.append(f"  {entry['time'] * 1000:9.2f} ms  {entry['share'] * 100:5.1f}%  "
+                         f"{entry['hits']:6d} Treffer  {entry['patterns']:3d} Patterns  {entry['marker_id']}")
+        lines += ["", f"Teuerste Patterns (Top {top}):"]
+        for stats in self.patterns()[:top]:
+            pattern = stats.pattern if len(stats.pattern) <= 60 else stats.pattern[:57] + '...'
+            lines.append(f"  {stats.time * 1000:9.2f} ms  {stats.hits:6d} Treffer  "
+                         f"{stats.kind:<9}  {stats.marker_id}: {pattern}")
+        return '\n'.join(lines)
+
+
+def profile_text(text: str, engine: str = 'pattern', path: Optional[str] = None,
+                 repeats: int = 1) -> MarkerProfiler:
+    """
+    Profiliert die Atomic-Erkennung einer Engine über einen Text
+
+    Args:
+        engine: 'pattern' (MarkerPatternEngine.detect_patterns) oder
+            'marker' (MarkerEngine._detect_atomic_markers)
+        path: Marker-Verzeichnis der Engine (Standard der jeweiligen Engine)
+        repeats: Anzahl Durchläufe (Zeiten werden aufsummiert)
+    """
+    from .registry import get_marker_engine, get_pattern_engine
+
+    profiler = MarkerProfiler()
+    if engine == 'marker':
+        marker_engine = get_marker_engine(path)
+        for _ in range(repeats):
+            marker_engine._detect_atomic_markers(text, profiler=profiler)
+    elif engine == 'pattern':
+        pattern_engine = get_pattern_engine(path)
+        for _ in range(repeats):
+            pattern_engine.detect_patterns(text, profiler=profiler)
+    else:
+        raise ValueError(f"Unbekannte Engine: {engine}")
+    return profiler
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Kosten pro Marker und Pattern messen")
+    parser.add_argument('chat_file', help="Text- bzw. WhatsApp-Datei")
+    parser.add_argument('--engine', choices=('pattern', 'marker'), default='pattern')
+    parser.add_argument('--path', help="Marker-Verzeichnis")
+    parser.add_argument('--repeats', type=int, default=1)
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--json', dest='json_file', help="Vollständige Rangliste als JSON")
+    args = parser.parse_args(argv)
+
+    with open(args.chat_file, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    profiler = profile_text(text, args.engine, args.path, args.repeats)
+    print(profiler.format_report(args.top))
+
+    if args.json_file:
+        report = profiler.report()
+        report.update(engine=args.engine, chat_file=args.chat_file, repeats=args.repeats)
+        with open(args.json_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Report gespeichert: {args.json_file}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
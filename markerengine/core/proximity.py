@@ -0,0 +1,139 @@
+"""
+MarkerEngine Proximity Matcher - Keyword-Folgen mit begrenztem Token-Abstand
+Ersetzt Regexes wie r'kw1.*?kw2' bzw. r'kw1.{0,20}kw2', die auf langen Chats
+quadratisch backtracken: der Text wird einmal tokenisiert, danach laufen alle
+Keyword-Patterns über Positions-Indizes der Tokens
+"""
+import re
+from array import array
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional
+
+from .matcher import fold_case
+
+# Wörter inkl. Apostroph-Formen (knallt's, can’t) sowie Zeilenumbrüche
+TOKEN_PATTERN = re.compile(r"\w+(?:['’]\w+)*|\n")
+
+
+def tokenize(text: str) -> List[str]:
+    """Zerlegt einen Text in kleingeschriebene Tokens (ohne Zeilenumbrüche)"""
+    return [fold_case(m.group(0)) for m in TOKEN_PATTERN.finditer(text) if m.group(0) != '\n']
+
+
+class TokenIndex:
+    """
+    Einmalige Tokenisierung eines Textes
+
+    Hält pro Token Start-/End-Offset und Zeilennummer sowie pro Token-Text
+    die sortierte Liste seiner Positionen.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.starts = array('l')
+        self.ends = array('l')
+        self.lines = array('l')
+        self.positions: Dict[str, List[int]] = defaultdict(list)
+
+        line = 0
+        for match in TOKEN_PATTERN.finditer(text):
+            token = match.group(0)
+            if token == '\n':
+                line += 1
+                continue
+            self.positions[fold_case(token)].append(len(self.starts))
+            self.starts.append(match.start())
+            self.ends.append(match.end())
+            self.lines.append(line)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+class ProximityMatch:
+    """Treffer eines ProximityPattern (Schnittstelle wie re.Match)"""
+
+    __slots__ = ('_text', '_start', '_end')
+
+    def __init__(self, text: str, start: int, end: int):
+        self._text = text
+        self._start = start
+        self._end = end
+
+    def group(self, index: int = 0) -> str:
+        return self._text[self._start:self._end]
+
+    def start(self) -> int:
+        return self._start
+
+    def end(self) -> int:
+        return self._end
+
+    def span(self):
+        return self._start, self._end
+
+
+class ProximityPattern:
+    """
+    Keywords in fester Reihenfolge mit höchstens max_gap Tokens dazwischen
+
+    Trefferlogik wie finditer mit nicht-gierigen Lücken: von links nach
+    rechts, nicht überlappend, pro Start der kürzeste gültige Treffer.
+    Keywords werden als ganze Tokens (case-insensitive) verglichen.
+    """
+
+    def __init__(self, keywords: List[str], max_gap: int, same_line: bool = True):
+        self.tokens = [token for keyword in keywords for token in tokenize(keyword)]
+        self.max_gap = max_gap
+        self.same_line = same_line
+        self.pattern = f" <0-{max_gap}> ".join(self.tokens)
+
+    def __repr__(self) -> str:
+        return f"ProximityPattern({self.pattern!r})"
+
+    def finditer(self, index: TokenIndex) -> Iterator[ProximityMatch]:
+        """Findet alle Treffer im über den TokenIndex erschlossenen Text"""
+        if not self.tokens:
+            return
+
+        candidates = []
+        for token in self.tokens:
+            positions = index.positions.get(token)
+            if not positions:
+                return
+            candidates.append(positions)
+
+        # (Tiefe, Position)-Paare ohne gültige Fortsetzung; hält die Suche
+        # linear in der Anzahl der Kandidaten statt exponentiell
+        failed = set()
+        last_end = -1
+        for first in candidates[0]:
+            if first <= last_end:
+                continue
+            end = self._extend(index, candidates, 1, first, index.lines[first], failed)
+            if end is not None:
+                last_end = end
+                yield ProximityMatch(index.text, index.starts[first], index.ends[end])
+
+    def _extend(self, index: TokenIndex, candidates: List[List[int]],
+                depth: int, current: int, line: int, failed: set) -> Optional[int]:
+        """Tiefensuche über die Folge-Keywords, nächstgelegene Kandidaten zuerst"""
+        if depth == len(candidates):
+            return current
+        if (depth, current) in failed:
+            return None
+
+        positions = candidates[depth]
+        limit = current + self.max_gap + 1
+        i = bisect_right(positions, current)
+        while i < len(positions) and positions[i] <= limit:
+            position = positions[i]
+            if self.same_line and index.lines[position] != line:
+                break
+            end = self._extend(index, candidates, depth + 1, position, line, failed)
+            if end is not None:
+                return end
+            i += 1
+        failed.add((depth, current))
+        return None
@@ -7,11 +7,16 @@ import yaml
 import re
 import json
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, Iterable, List, Any, Optional, Sequence, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import logging
 
+from .chunked_reader import DEFAULT_CHUNK_SIZE, DEFAULT_OVERLAP, iter_text_windows
+from .hit_stats import FLAG_HIGH_RISK, MarkerFlags
+from .marker_cache import MarkerCache
+from .marker_loader import load_marker_directories
+
 # Import Pattern Engine
 try:
     from .pattern_engine import MarkerPatternEngine, PatternMatch
@@ -22,6 +27,12 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Standard-Pfad zum markers/ Verzeichnis im Projekt-Wurzelverzeichnis
+DEFAULT_MARKERS_PATH = Path(__file__).parent.parent.parent / "markers"
+
+# on_hits-Callback von analyze_text()/analyze_file(): Atomic Hits eines Blocks
+HitsCallback = Callable[[List['MarkerResult']], None]
+
 @dataclass
 class MarkerResult:
     """Ergebnis eines Marker-Treffers"""
@@ -36,105 +47,200 @@ class MarkerResult:
 class RealMarkerAnalyzer:
     """Echter Analyzer mit Pattern Engine"""
     
-    def __init__(self, markers_path: str = None):
+    def __init__(self, markers_path: str = None, use_cache: bool = True):
         """
         Initialisiert den Analyzer mit echten Markern
         
         Args:
             markers_path: Pfad zum markers/ Verzeichnis
+            use_cache: Geparste YAMLs aus dem persistenten Marker-Cache laden
         """
         if markers_path is None:
-            base_path = Path(__file__).parent.parent.parent
-            markers_path = base_path / "markers"
+            markers_path = DEFAULT_MARKERS_PATH
         
         self.markers_path = Path(markers_path)
         
         # Initialisiere Pattern Engine
         if PATTERN_ENGINE_AVAILABLE:
-            self.pattern_engine = MarkerPatternEngine(markers_path)
+            self.pattern_engine = MarkerPatternEngine(markers_path, use_cache=use_cache)
             print("✅ Pattern Engine aktiviert!")
         else:
             print("⚠️ Fallback auf einfache Suche")
             self.markers = {'atomic': {}, 'semantic': {}, 'cluster': {}, 'meta': {}}
+            self._marker_cache = MarkerCache(self.markers_path, enabled=use_cache)
             self._load_all_markers()
+        
+        # Risiko-Flags pro Marker-ID (beim Laden berechnet)
+        self.marker_flags = MarkerFlags()
+        if PATTERN_ENGINE_AVAILABLE:
+            self.marker_flags.register(self.pattern_engine.compiled_patterns.get('atomic', {}))
+        else:
+            self.marker_flags.register(self.markers['atomic'])
     
     def _load_all_markers(self):
         """Lädt alle Marker aus den YAML-Dateien (Fallback)"""
         # Nur für Fallback wenn Pattern Engine nicht verfügbar
-        atomic_path = self.markers_path / "atomic"
-        if atomic_path.exists():
-            for yaml_file in atomic_path.glob("*.yaml"):
-                try:
-                    with open(yaml_file, 'r', encoding='utf-8') as f:
-                        data = yaml.safe_load(f)
-                        if data and 'marker_name' in data:
-                            marker_id = data['marker_name']
-                            self.markers['atomic'][marker_id] = data
-                except Exception as e:
-                    logger.error(f"Error loading {yaml_file}: {e}")
+        marker_files = load_marker_directories(
+            self.markers_path, ('atomic',), cache=self._marker_cache
+        )
+        for marker_file in marker_files['atomic']:
+            try:
+                data = marker_file.result()
+                if data and 'marker_name' in data:
+                    marker_id = data['marker_name']
+                    self.markers['atomic'][marker_id] = data
+            except Exception as e:
+                logger.error(f"Error loading {marker_file.path}: {e}")
+        
+        self._marker_cache.save()
     
-    def analyze_text(self, text: str) -> Dict[str, Any]:
+    def analyze_text(self, text: str, on_hits: Optional[HitsCallback] = None) -> Dict[str, Any]:
         """
         Analysiert einen Text mit allen Markern
         
         Args:
             text: Der zu analysierende Text
+            on_hits: Erhält die Atomic Hits; sie werden dann nicht im
+                Ergebnis gehalten (siehe analyze_file)
             
         Returns:
             Analyse-Ergebnisse
         """
-        results = {
-            'timestamp': datetime.now().isoformat(),
-            'text_length': len(text),
-            'atomic_hits': [],
-            'semantic_hits': [],
-            'cluster_hits': [],
-            'meta_hits': [],
-            'statistics': {},
-            'risk_score': 0.0
-        }
+        atomic_hits = []
         
         # Verwende Pattern Engine wenn verfügbar
         if PATTERN_ENGINE_AVAILABLE and hasattr(self, 'pattern_engine'):
             # Pattern-basierte Erkennung
             pattern_matches = self.pattern_engine.detect_patterns(text, 'atomic')
-            
-            # Konvertiere zu MarkerResults
-            for match in pattern_matches:
-                marker_result = MarkerResult(
-                    marker_id=match.marker_id,
-                    marker_name=match.marker_name,
-                    level='atomic',
-                    matches=[match.match_text],
-                    confidence=match.confidence,
-                    position=match.start_pos,
-                    context=match.context
-                )
-                results['atomic_hits'].append(marker_result)
+            atomic_hits = [self._marker_result(match) for match in pattern_matches]
         else:
-            # Fallback: Einfache Suche
+            # Fallback: Einfache Suche (Text nur einmal in Kleinbuchstaben)
+            text_lower = text.lower()
             for marker_id, marker_data in self.markers['atomic'].items():
-                hits = self._detect_atomic_marker_simple(text, marker_data)
-                if hits:
-                    results['atomic_hits'].extend(hits)
+                atomic_hits.extend(self._detect_atomic_marker_simple(text, marker_data, text_lower))
         
         # TODO: Semantic, Cluster und Meta Marker basierend auf Atomic Hits
         
-        # Statistiken berechnen
-        results['statistics'] = {
-            'total_atomic_hits': len(results['atomic_hits']),
-            'unique_atomic_markers': len(set(h.marker_id for h in results['atomic_hits'])),
-            'high_risk_markers': self._count_high_risk_markers(results['atomic_hits'])
+        return self._finish_results(len(text), atomic_hits, on_hits)
+    
+    def analyze_file(self, file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     overlap: int = DEFAULT_OVERLAP,
+                     on_hits: Optional[HitsCallback] = None) -> Dict[str, Any]:
+        """
+        Wie analyze_text(), liest die Datei aber per mmap in überlappenden Blöcken
+        
+        Der Speicherbedarf für den Text hängt von chunk_size ab, nicht von der
+        Dateigröße. Mit on_hits gilt das auch für die Treffer: jeder Block
+        wird übergeben, sobald er gescannt ist, 'atomic_hits' im Ergebnis
+        bleibt leer und die Statistiken werden mitgezählt.
+        """
+        if PATTERN_ENGINE_AVAILABLE and hasattr(self, 'pattern_engine'):
+            blocks = (
+                ([self._marker_result(match) for match in matches], text_length)
+                for matches, text_length in self.pattern_engine.iter_patterns_file(
+                    file_path, 'atomic', chunk_size, overlap
+                )
+            )
+        else:
+            blocks = self._simple_file_blocks(file_path, chunk_size, overlap)
+        
+        if on_hits is None:
+            atomic_hits = []
+            text_length = 0
+            for hits, text_length in blocks:
+                atomic_hits.extend(hits)
+            return self._build_results(text_length, atomic_hits)
+        
+        counts: List[int] = []
+        total = 0
+        text_length = 0
+        for hits, text_length in blocks:
+            if hits:
+                on_hits(hits)
+            self.marker_flags.update(counts, hits)
+            total += len(hits)
+        return self._build_results(text_length, [], self._count_statistics(total, counts))
+    
+    def _simple_file_blocks(self, file_path: str, chunk_size: int,
+                            overlap: int) -> Iterable[Tuple[List[MarkerResult], int]]:
+        """Fallback: erstes Vorkommen pro Beispiel über alle Blöcke, blockweise"""
+        seen = set()
+        for window in iter_text_windows(file_path, chunk_size, overlap):
+            hits = []
+            text_lower = window.text.lower()
+            for marker_id, marker_data in self.markers['atomic'].items():
+                for hit in self._detect_atomic_marker_simple(window.text, marker_data, text_lower):
+                    key = (hit.marker_id, hit.matches[0])
+                    if key not in seen and window.owns(hit.position):
+                        seen.add(key)
+                        hit.position += window.offset
+                        hits.append(hit)
+            yield hits, window.end_offset
+    
+    def _marker_result(self, match: 'PatternMatch') -> MarkerResult:
+        """Konvertiert einen PatternMatch in ein MarkerResult"""
+        return MarkerResult(
+            marker_id=match.marker_id,
+            marker_name=match.marker_name,
+            level='atomic',
+            matches=[match.match_text],
+            confidence=match.confidence,
+            position=match.start_pos,
+            context=match.context
+        )
+    
+    def _build_results(self, text_length: int, atomic_hits: List[MarkerResult],
+                       statistics: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """Ergebnis-Dict mit Statistiken und Risk Score (statistics = bereits gezählt)"""
+        results = {
+            'timestamp': datetime.now().isoformat(),
+            'text_length': text_length,
+            'atomic_hits': atomic_hits,
+            'semantic_hits': [],
+            'cluster_hits': [],
+            'meta_hits': [],
+            'statistics': {},
+            'risk_score': 0.0
         }
         
+        # Statistiken berechnen
+        if statistics is None:
+            statistics = self._hit_statistics(atomic_hits)
+        results['statistics'] = statistics
+        
         # Risk Score berechnen
         results['risk_score'] = self._calculate_risk_score(results)
         
         return results
     
-    def _detect_atomic_marker_simple(self, text: str, marker_data: Dict) -> List[MarkerResult]:
-        """Einfache Marker-Erkennung (Fallback)"""
+    def _finish_results(self, text_length: int, atomic_hits: List[MarkerResult],
+                        on_hits: Optional[HitsCallback] = None) -> Dict[str, Any]:
+        """Ergebnis eines ganzen Textes; mit on_hits werden die Treffer abgegeben statt gehalten"""
+        if on_hits is None:
+            return self._build_results(text_length, atomic_hits)
+        statistics = self._hit_statistics(atomic_hits)
+        if atomic_hits:
+            on_hits(atomic_hits)
+        return self._build_results(text_length, [], statistics)
+    
+    def _hit_statistics(self, hits: List[MarkerResult]) -> Dict[str, int]:
+        """Statistiken aus einem Zähl-Durchlauf über die Marker-Codes der Treffer"""
+        return self._count_statistics(len(hits), self.marker_flags.counts(hits))
+    
+    def _count_statistics(self, total: int, counts: Sequence[int]) -> Dict[str, int]:
+        """Statistiken aus Treffern pro Marker-Code (siehe hit_stats.MarkerFlags)"""
+        return {
+            'total_atomic_hits': total,
+            'unique_atomic_markers': self.marker_flags.unique(counts),
+            'high_risk_markers': self.marker_flags.total(counts, FLAG_HIGH_RISK)
+        }
+    
+    def _detect_atomic_marker_simple(self, text: str, marker_data: Dict,
+                                     text_lower: Optional[str] = None) -> List[MarkerResult]:
+        """Einfache Marker-Erkennung (Fallback), text_lower = vorberechnetes text.lower()"""
         hits = []
+        if text_lower is None:
+            text_lower = text.lower()
         
         beispiele = marker_data.get('beispiele', []) or marker_data.get('examples', [])
         
@@ -142,8 +248,8 @@ class RealMarkerAnalyzer:
             if isinstance(beispiel, str):
                 clean = beispiel.strip().strip('"').strip('-').strip()
                 
-                if clean.lower() in text.lower():
-                    match_pos = text.lower().find(clean.lower())
+                match_pos = text_lower.find(clean.lower())
+                if match_pos != -1:
                     context = text[max(0, match_pos-50):min(len(text), match_pos+50)]
                     
                     hit = MarkerResult(
@@ -160,25 +266,15 @@ class RealMarkerAnalyzer:
         return hits
     
     def _count_high_risk_markers(self, hits: List[MarkerResult]) -> int:
-        """Zählt High-Risk Marker"""
-        high_risk_keywords = [
-            'SCAM', 'FRAUD', 'MANIPULATION', 'GASLIGHTING', 
-            'CRISIS', 'MONEY', 'BLAME', 'GUILT', 'SHIFT',
-            'PLATFORM_SWITCH', 'URGENCY', 'WEBCAM_EXCUSE'
-        ]
-        
-        count = 0
-        for hit in hits:
-            if any(keyword in hit.marker_id.upper() for keyword in high_risk_keywords):
-                count += 1
-        return count
+        """Zählt High-Risk Marker (Keywords siehe hit_stats.HIGH_RISK_KEYWORDS)"""
+        return self.marker_flags.total(self.marker_flags.counts(hits), FLAG_HIGH_RISK)
     
     def _calculate_risk_score(self, results: Dict) -> float:
         """Berechnet einen Risiko-Score basierend auf den Treffern"""
         score = 0.0
         
-        # Basis-Score aus Anzahl der Treffer
-        atomic_hits = len(results['atomic_hits'])
+        # Basis-Score aus Anzahl der Treffer (auch wenn sie gestreamt wurden)
+        atomic_hits = results['statistics']['total_atomic_hits']
         if atomic_hits > 0:
             score += min(atomic_hits * 0.15, 4.0)
         
@@ -206,14 +302,12 @@ def analyze_whatsapp_chat(file_path: str) -> Dict[str, Any]:
     Returns:
         Vollständige Analyse
     """
-    analyzer = RealMarkerAnalyzer()
-    
-    # Lese die Datei
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    # Geteilte Engine - wiederholte Analysen zahlen keine Ladezeit
+    from .registry import get_real_analyzer
+    analyzer = get_real_analyzer()
     
-    # Analysiere
-    results = analyzer.analyze_text(content)
+    # Analysiere (Datei wird blockweise per mmap gelesen)
+    results = analyzer.analyze_file(file_path)
     
     # Füge Datei-Info hinzu
     results['file_info'] = {
@@ -0,0 +1,86 @@
+"""
+MarkerEngine Registry - Prozess-weit geteilte, einmal kompilierte Engines
+GUI-Threads und Batch-Jobs holen sich ihre Engine hier statt sie neu zu bauen
+"""
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class EngineRegistry:
+    """
+    Thread-sicherer Speicher für Engine-Instanzen, eine pro Factory + Argumente
+
+    Parallele Anfragen nach derselben Engine warten auf einen einzigen Build;
+    verschiedene Engines können gleichzeitig gebaut werden. Die Instanzen
+    werden von allen Aufrufern geteilt und dürfen nach dem Laden nicht mehr
+    verändert werden.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._instances: Dict[Hashable, Any] = {}
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+
+    def get(self, factory: Callable[..., Any], *args, **kwargs) -> Any:
+        """Liefert die geteilte Instanz von factory(*args, **kwargs)"""
+        key = (factory, args, tuple(sorted(kwargs.items())))
+
+        instance = self._instances.get(key)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            instance = self._instances.get(key)
+            if instance is None:
+                instance = factory(*args, **kwargs)
+                self._instances[key] = instance
+        return instance
+
+    def clear(self):
+        """Verwirft alle Instanzen (z.B. nach Änderungen an den Marker-Dateien)"""
+        with self._lock:
+            self._instances.clear()
+            self._key_locks.clear()
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+
+_registry = EngineRegistry()
+
+
+def _normalize_path(path, default) -> str:
+    """Registry-Schlüssel eines Marker-Pfads; None = Standard-Pfad der Engine"""
+    return str(Path(default if path is None else path).resolve())
+
+
+def shared_instance(factory: Callable[..., Any], *args, **kwargs) -> Any:
+    """Geteilte Instanz einer beliebigen Factory (Argumente müssen hashbar sein)"""
+    return _registry.get(factory, *args, **kwargs)
+
+
+def get_marker_engine(marker_base_path: Optional[str] = None):
+    """Geteilte MarkerEngine für das Marker-Verzeichnis"""
+    from .engine import DEFAULT_MARKER_PATH, MarkerEngine
+    return _registry.get(MarkerEngine, _normalize_path(marker_base_path, DEFAULT_MARKER_PATH))
+
+
+def get_pattern_engine(markers_path: Optional[str] = None):
+    """Geteilte MarkerPatternEngine für das markers/ Verzeichnis"""
+    from .pattern_engine import DEFAULT_MARKERS_PATH, MarkerPatternEngine
+    return _registry.get(MarkerPatternEngine, _normalize_path(markers_path, DEFAULT_MARKERS_PATH))
+
+
+def get_real_analyzer(markers_path: Optional[str] = None):
+    """Geteilter RealMarkerAnalyzer für das markers/ Verzeichnis"""
+    from .real_analyzer import DEFAULT_MARKERS_PATH, RealMarkerAnalyzer
+    return _registry.get(RealMarkerAnalyzer, _normalize_path(markers_path, DEFAULT_MARKERS_PATH))
+
+
+def clear_registry():
+    """Verwirft alle geteilten Engines"""
+    _registry.clear()
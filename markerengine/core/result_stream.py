@@ -0,0 +1,115 @@
+"""
+MarkerEngine Result Stream - Ergebnisse als NDJSON statt eines großen Dicts
+Jede Zeile ist ein JSON-Record mit einem 'type' (header, audio, hit, chat,
+summary). Treffer werden pro Phase geschrieben, sobald sie vorliegen; die
+Zusammenfassung kommt zuletzt. Ziel ist ein Dateipfad, ein offenes
+File-Objekt, ein Socket oder eine Adresse 'tcp://host:port'.
+"""
+import json
+import socket
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+# Chat-Text wird in Records dieser Größe (Zeichen) aufgeteilt
+CHAT_RECORD_CHARS = 64 * 1024
+
+Sink = Union[str, Path, socket.socket, Any]
+
+
+def hit_record(level: str, hit: Any) -> Dict[str, Any]:
+    """Record eines Treffers (MarkerHit, PatternMatch oder MarkerResult)"""
+    if hasattr(hit, 'position_start'):
+        # MarkerHit (engine.py)
+        return {
+            'type': 'hit', 'level': level, 'id': hit.marker_id, 'name': hit.marker_name,
+            'start': hit.position_start, 'end': hit.position_end,
+            'confidence': hit.confidence, 'text': hit.text, 'metadata': hit.metadata,
+        }
+    if hasattr(hit, 'start_pos'):
+        # PatternMatch (pattern_engine.py)
+        return {
+            'type': 'hit', 'level': level, 'id': hit.marker_id, 'name': hit.marker_name,
+            'start': hit.start_pos, 'end': hit.end_pos, 'confidence': hit.confidence,
+            'text': hit.match_text, 'pattern': hit.pattern, 'context': hit.context,
+        }
+    if is_dataclass(hit):
+        # MarkerResult (real_analyzer.py) u.ä.
+        record = {'type': 'hit', 'level': level}
+        record.update(asdict(hit))
+        return record
+    raise TypeError(f"Unbekannter Treffer-Typ: {type(hit).__name__}")
+
+
+class NDJSONWriter:
+    """
+    Schreibt Records zeilenweise (ohne Einrückung) in ein Ziel
+
+    Selbst geöffnete Ziele (Pfad, tcp://-Adresse) werden mit close()
+    geschlossen; übergebene File-Objekte und Sockets nur geflusht.
+    """
+
+    def __init__(self, sink: Sink):
+        self._socket = None
+        self._owns_file = False
+
+        if isinstance(sink, socket.socket):
+            self._file = sink.makefile('w', encoding='utf-8', newline='\n')
+            self._owns_file = True
+        elif isinstance(sink, str) and sink.startswith('tcp://'):
+            host, _, port = sink[len('tcp://'):].rpartition(':')
+            self._socket = socket.create_connection((host, int(port)))
+            self._file = self._socket.makefile('w', encoding='utf-8', newline='\n')
+            self._owns_file = True
+        elif isinstance(sink, (str, Path)):
+            self._file = open(sink, 'w', encoding='utf-8', newline='\n')
+            self._owns_file = True
+        else:
+            self._file = sink
+
+        self.records = 0
+
+    def write(self, record: Dict[str, Any]):
+        """Schreibt einen Record als eine Zeile"""
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=str))
+        self._file.write('\n')
+        self.records += 1
+
+    def write_hits(self, level: str, hits: Iterable[Any]):
+        """Schreibt die Treffer einer Phase (passt als on_phase-Callback der MarkerEngine)"""
+        for hit in hits:
+            self.write(hit_record(level, hit))
+
+    def write_chat(self, chunks: Iterable[str]):
+        """Schreibt den Chat-Text als Folge von 'chat'-Records mit Zeichen-Offset"""
+        offset = 0
+        for chunk in chunks:
+            for start in range(0, len(chunk), CHAT_RECORD_CHARS):
+                part = chunk[start:start + CHAT_RECORD_CHARS]
+                self.write({'type': 'chat', 'offset': offset, 'text': part})
+                offset += len(part)
+
+    def close(self):
+        self._file.flush()
+        if self._owns_file:
+            self._file.close()
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def __enter__(self) -> 'NDJSONWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.close()
+        return False
+
+
+def read_records(source: Union[str, Path], record_type: Optional[str] = None) -> Iterable[Dict[str, Any]]:
+    """Liest die Records einer NDJSON-Datei (optional nur einen Typ)"""
+    with open(source, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                if record_type is None or record.get('type') == record_type:
+                    yield record
@@ -0,0 +1,144 @@
+"""
+MarkerEngine Spans - Auflösung überlappender Treffer
+Treffer werden nach Priorität (Policy) sortiert und gierig übernommen, wenn
+sie keinen bereits behaltenen Treffer überlappen. Die behaltenen Spans sind
+disjunkt; ein Fenwick-Baum über die sortierten Start-Koordinaten beantwortet
+die Überlappungsfrage in O(log n), insgesamt also O(n log n).
+"""
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar('T')
+
+# Prioritäts-Schlüssel (größer = wichtiger) aus (start, end, confidence)
+POLICIES: Dict[str, Callable[[int, int, float], Tuple]] = {
+    # Höchste Konfidenz, dann längster, dann frühester Treffer
+    'confidence': lambda start, end, confidence: (confidence, end - start, -start),
+    # Längster Treffer, dann höchste Konfidenz, dann frühester
+    'longest': lambda start, end, confidence: (end - start, confidence, -start),
+    # Leftmost-longest: frühester Start, bei gleichem Start der längste
+    'first': lambda start, end, confidence: (-start, end - start, confidence),
+}
+
+# 'marker': nur Treffer desselben Markers verdrängen sich, 'global': alle
+SCOPES = ('marker', 'global')
+
+
+class SpanIndex:
+    """
+    Menge disjunkter Spans [start, end) mit Überlappungs-Abfrage in O(log n)
+
+    Die möglichen Start-Koordinaten werden vorab übergeben (Koordinaten-
+    Kompression); ein Fenwick-Baum zählt die belegten Starts.
+    """
+
+    def __init__(self, starts: Sequence[int]):
+        self._starts = sorted(set(starts))
+        self._tree = [0] * (len(self._starts) + 1)
+        self._ends = [0] * len(self._starts)
+        self._count = 0
+        self._top = 1 << max(0, len(self._starts).bit_length() - 1) if self._starts else 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _prefix(self, index: int) -> int:
+        """Anzahl belegter Starts mit Koordinaten-Index < index"""
+        total = 0
+        while index > 0:
+            total += self._tree[index]
+            index &= index - 1
+        return total
+
+    def _kth(self, k: int) -> int:
+        """Koordinaten-Index des k-ten belegten Starts (1-basiert)"""
+        position = 0
+        step = self._top
+        tree = self._tree
+        while step:
+            following = position + step
+            if following < len(tree) and tree[following] < k:
+                position = following
+                k -= tree[following]
+            step >>= 1
+        return position
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """Überlappt [start, end) einen enthaltenen Span?"""
+        # Die Spans sind disjunkt: es genügt der letzte, der vor `end` beginnt
+        count = self._prefix(bisect_left(self._starts, end))
+        return count > 0 and self._ends[self._kth(count)] > start
+
+    def add(self, start: int, end: int):
+        """Nimmt einen Span auf (start muss bei der Konstruktion bekannt sein)"""
+        index = bisect_left(self._starts, start)
+        self._ends[index] = end
+        self._count += 1
+        index += 1
+        while index < len(self._tree):
+            self._tree[index] += 1
+            index += index & -index
+
+
+def resolve_overlaps(items: Sequence[T],
+                     start: Callable[[T], int],
+                     end: Callable[[T], int],
+                     confidence: Optional[Callable[[T], float]] = None,
+                     group: Optional[Callable[[T], Hashable]] = None,
+                     policy: str = 'confidence') -> List[T]:
+    """
+    Entfernt überlappende Treffer
+
+    Args:
+        items: Treffer beliebigen Typs
+        start / end: Zugriff auf die Offsets eines Treffers
+        confidence: Zugriff auf die Konfidenz (None = alle gleich)
+        group: Treffer verdrängen sich nur innerhalb derselben Gruppe
+            (z.B. Marker-ID); None = alle Treffer konkurrieren
+        policy: Schlüssel aus POLICIES
+
+    Returns:
+        Die behaltenen Treffer in Eingabe-Reihenfolge
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unbekannte Overlap-Policy: {policy}")
+    priority = POLICIES[policy]
+
+    groups: Dict[Hashable, List[int]] = defaultdict(list)
+    for i, item in enumerate(items):
+        groups[group(item) if group is not None else None].append(i)
+
+    keep = [False] * len(items)
+    for indexes in groups.values():
+        spans = [(start(items[i]), end(items[i])) for i in indexes]
+        keys = [
+            priority(s, e, confidence(items[i]) if confidence is not None else 1.0)
+            for i, (s, e) in zip(indexes, spans)
+        ]
+        # Stabil: bei gleicher Priorität gewinnt der frühere Eintrag
+        order = sorted(range(len(indexes)), key=lambda j: keys[j], reverse=True)
+
+        if policy == 'first':
+            # Aufsteigende Starts: ein linearer Sweep über das größte Ende genügt
+            last_end = None
+            for j in order:
+                s, e = spans[j]
+                if e <= s:
+                    keep[indexes[j]] = True
+                elif last_end is None or s >= last_end:
+                    keep[indexes[j]] = True
+                    last_end = e
+            continue
+
+        index = SpanIndex(s for s, _ in spans)
+        for j in order:
+            s, e = spans[j]
+            if e <= s:
+                # Leere Spans überlappen nichts
+                keep[indexes[j]] = True
+            elif not index.overlaps(s, e):
+                index.add(s, e)
+                keep[indexes[j]] = True
+
+    return [item for item, kept in zip(items, keep) if kept]
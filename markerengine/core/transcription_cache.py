@@ -0,0 +1,193 @@
+"""
+MarkerEngine Transcription Cache - Persistenter Cache für Whisper-Transkriptionen
+WhatsApp-Mediendateien ändern sich nie; Transkriptionen werden deshalb über den
+Inhalt der Audio-Datei adressiert (SHA-256 + Modell + Sprache + Optionen) und
+als JSON-Eintrag pro Audio abgelegt. Die Gesamtgröße ist begrenzt, verdrängt
+werden die am längsten nicht gelesenen Einträge (LRU über die mtime).
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .marker_cache import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Bei Format-Änderungen erhöhen, alte Einträge werden dann nicht mehr gefunden
+CACHE_VERSION = 1
+
+# Standard-Obergrenze des Cache-Verzeichnisses in Bytes
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Lesepuffer beim Hashen der Audio-Dateien
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 des Dateiinhalts"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _json_default(value: Any) -> Any:
+    # numpy-Skalare u.ä. in Whisper-Segmenten
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+class TranscriptionCache:
+    """
+    Content-adressierter Cache der Transkriptions-Ergebnisse
+
+    Ein Eintrag enthält text, language, segments und confidence. Der Hash
+    einer Audio-Datei wird pro Prozess über (Pfad, Größe, mtime) gemerkt,
+    damit eine Datei nur einmal gelesen wird.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES, enabled: bool = True):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir() / "transcriptions"
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+        # (Pfad, Größe, mtime_ns) -> SHA-256
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        self._lock = threading.Lock()
+
+        # Größe des Cache-Verzeichnisses (beim ersten Schreiben ermittelt)
+        self._total_bytes: Optional[int] = None
+
+    def audio_digest(self, audio_path: str) -> str:
+        """SHA-256 einer Audio-Datei (gemerkt, solange sie unverändert ist)"""
+        stat = os.stat(audio_path)
+        file_key = (os.path.abspath(audio_path), stat.st_size, stat.st_mtime_ns)
+        digest = self._digests.get(file_key)
+        if digest is None:
+            digest = file_digest(audio_path)
+            self._digests[file_key] = digest
+        return digest
+
+    def key(self, audio_path: str, model: str, language: str,
+            options: Optional[Dict[str, Any]] = None) -> str:
+        """Cache-Schlüssel aus Audio-Inhalt, Modell, Sprache und Optionen"""
+        identity = json.dumps(
+            [CACHE_VERSION, self.audio_digest(audio_path), model, language, options or {}],
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def lookup(self, audio_path: str, model: str, language: str,
+               options: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Gecachte Transkription oder None"""
+        if not self.enabled:
+            return None
+        entry_path = self._entry_path(self.key(audio_path, model, language, options))
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Transkriptions-Cache-Eintrag unlesbar: {entry_path}: {e}")
+            self.misses += 1
+            return None
+
+        # Zugriff vermerken (LRU)
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        self.hits += 1
+        return entry
+
+    def store(self, audio_path: str, model: str, language: str,
+              options: Optional[Dict[str, Any]], result: Dict[str, Any]):
+        """Legt ein Transkriptions-Ergebnis ab (atomar) und hält die Größengrenze ein"""
+        if not self.enabled:
+            return
+        entry = {
+            'text': result.get('text', ''),
+            'language': result.get('language', language),
+            'segments': result.get('segments', []),
+            'confidence': result.get('confidence', 0.0),
+        }
+        entry_path = self._entry_path(self.key(audio_path, model, language, options))
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=entry_path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(entry, f, ensure_ascii=False, default=_json_default)
+                os.replace(tmp_path, entry_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.debug(f"Transkription konnte nicht gecacht werden: {e}")
+            return
+
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += entry_path.stat().st_size
+            over_limit = self._total_bytes is None or self._total_bytes > self.max_bytes
+        if over_limit:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Entfernt die am längsten nicht gelesenen Einträge, bis der Cache
+        höchstens max_bytes groß ist
+
+        Returns:
+            Anzahl entfernter Einträge
+        """
+        with self._lock:
+            entries = []
+            total = 0
+            for entry_path in self.cache_dir.glob('*/*.json'):
+                try:
+                    stat = entry_path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry_path))
+                total += stat.st_size
+
+            removed = 0
+            if total > self.max_bytes:
+                for _, size, entry_path in sorted(entries):
+                    if total <= self.max_bytes:
+                        break
+                    try:
+                        entry_path.unlink()
+                    except OSError:
+                        continue
+                    total -= size
+                    removed += 1
+                logger.debug(f"Transkriptions-Cache: {removed} Einträge verdrängt")
+            self._total_bytes = total
+            return removed
+
+    def clear(self):
+        """Löscht alle Einträge"""
+        self._total_bytes = None
+        for entry_path in self.cache_dir.glob('*/*.json'):
+            try:
+                entry_path.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,141 @@
+"""
+MarkerEngine Transcription Scheduler - Sprachnachrichten über mehrere Prozesse
+Jeder Worker lädt sein eigenes Whisper-Modell genau einmal (Pool-Initializer).
+Die Aufträge werden nach Dateigröße absteigend verteilt (längste zuerst,
+damit am Ende keine lange Datei allein übrig bleibt); Ergebnisse werden
+eingesammelt, sobald sie fertig sind.
+"""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Fortschritt: (fertige Aufträge, Aufträge insgesamt)
+ProgressCallback = Callable[[int, int], None]
+
+# Zustand im Worker-Prozess (vom Initializer gesetzt)
+_worker: Dict[str, Any] = {}
+
+
+class ModelLoadError(RuntimeError):
+    """Das Whisper-Modell ließ sich in einem Worker-Prozess nicht laden"""
+
+
+@dataclass
+class TranscriptionJob:
+    """Eine zu transkribierende Audio-Datei"""
+    key: Any
+    audio_path: str
+    language: str = "de"
+    size: int = 0
+
+
+def _transcriber_config(transcriber) -> Dict[str, Any]:
+    """Argumente, mit denen ein Worker den gleichen Transcriber baut"""
+    return {
+        'model_size': transcriber.model_size,
+        'device': transcriber.device,
+        'use_cache': transcriber.cache.enabled,
+        'cache_dir': str(transcriber.cache.cache_dir),
+    }
+
+
+def _init_worker(config: Dict[str, Any], log_level: int):
+    """Pool-Initializer: lädt das Whisper-Modell des Workers"""
+    from .whisper_integration import WhisperTranscriber
+
+    logging.getLogger('markerengine').setLevel(log_level)
+    transcriber = WhisperTranscriber(**config)
+    try:
+        transcriber.model
+    except Exception as e:
+        # Nicht im Initializer scheitern (das bricht den Pool ohne Fehlermeldung
+        # ab), sondern den Fehler mit dem ersten Auftrag zurückmelden
+        _worker['load_error'] = f"{type(e).__name__}: {e}"
+    _worker['transcriber'] = transcriber
+
+
+def _transcribe_job(job: TranscriptionJob) -> Tuple[Any, Dict]:
+    if 'load_error' in _worker:
+        raise ModelLoadError(_worker['load_error'])
+    transcription = _worker['transcriber'].transcribe_audio(
+        job.audio_path, job.language, check_cache=False
+    )
+    return job.key, transcription
+
+
+class TranscriptionScheduler:
+    """
+    Verteilt Transkriptions-Aufträge auf `workers` Prozesse
+
+    Mit einem Worker wird im aufrufenden Prozess mit dem übergebenen
+    Transcriber gearbeitet (kein zweites Modell im Speicher). Scheitert das
+    Laden des Modells in den Workern, wird der Fehler wie beim seriellen
+    Laden in transcriber.load_error vermerkt.
+    """
+
+    def __init__(self, transcriber, workers: Optional[int] = 1):
+        self.transcriber = transcriber
+        self.workers = workers or os.cpu_count() or 1
+
+    def run(self, jobs: List[TranscriptionJob],
+            progress: Optional[ProgressCallback] = None) -> Dict[Any, Dict]:
+        """
+        Transkribiert alle Aufträge
+
+        Returns:
+            Auftrags-Schlüssel -> Transkriptions-Ergebnis
+        """
+        for job in jobs:
+            if not job.size:
+                try:
+                    job.size = os.path.getsize(job.audio_path)
+                except OSError:
+                    job.size = 0
+        # Längste zuerst (Dateigröße als Maß für die Dauer)
+        jobs = sorted(jobs, key=lambda job: job.size, reverse=True)
+
+        results: Dict[Any, Dict] = {}
+        total = len(jobs)
+        workers = min(self.workers, total)
+
+        def finish(key: Any, transcription: Dict):
+            results[key] = transcription
+            if progress is not None:
+                progress(len(results), total)
+
+        if workers <= 1:
+            for job in jobs:
+                finish(job.key, self.transcriber.transcribe_audio(
+                    job.audio_path, job.language, check_cache=False))
+            return results
+
+        log_level = logging.getLogger('markerengine').getEffectiveLevel()
+        # spawn: torch/CUDA vertragen keinen fork eines initialisierten Prozesses
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker,
+                                 initargs=(_transcriber_config(self.transcriber), log_level)) as pool:
+            futures = [pool.submit(_transcribe_job, job) for job in jobs]
+            try:
+                for future in as_completed(futures):
+                    finish(*future.result())
+            except ModelLoadError as e:
+                self.transcriber.load_error = e
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+            except BrokenProcessPool as e:
+                # Worker vor dem ersten Ergebnis abgestürzt (z.B. beim Laden des Modells)
+                if not results:
+                    self.transcriber.load_error = e
+                raise
+            except KeyboardInterrupt:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+        logger.info(f"{total} Sprachnachrichten mit {workers} Prozessen transkribiert")
+        return results
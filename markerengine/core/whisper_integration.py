@@ -1,19 +1,39 @@
 """
 Whisper v3 Integration für MarkerEngine
 Transkribiert WhatsApp Sprachnachrichten und fügt sie an den richtigen Stellen ein
+
+whisper und torch werden erst importiert (und das Modell erst geladen), wenn
+die erste Sprachnachricht tatsächlich transkribiert wird - reine Text-Analysen
+zahlen weder Importzeit noch Speicher dafür.
 """
 import os
 import re
-import whisper
-import torch
+import threading
+from importlib.util import find_spec
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 import logging
 from dataclasses import dataclass
 
+from .media_index import MediaIndex
+from .transcription_cache import TranscriptionCache
+from .transcription_scheduler import ProgressCallback, TranscriptionJob, TranscriptionScheduler
+
 logger = logging.getLogger(__name__)
 
+# Nur prüfen, ob whisper installiert ist (ohne den teuren Import)
+WHISPER_AVAILABLE = find_spec('whisper') is not None
+
+# Whisper v3 Options (gehen in den Schlüssel des Transkriptions-Caches ein)
+TRANSCRIBE_OPTIONS = {
+    'task': "transcribe",
+    'temperature': 0.0,  # Deterministisch
+    'word_timestamps': True,  # Für präzise Zeitstempel
+    'condition_on_previous_text': True,  # Besserer Kontext
+    'initial_prompt': "WhatsApp Sprachnachricht:"  # Kontext-Hinweis
+}
+
 @dataclass
 class AudioMessage:
     """Repräsentiert eine Audio-Nachricht"""
@@ -27,58 +47,97 @@ class AudioMessage:
 class WhisperTranscriber:
     """Whisper v3 Transcriber für WhatsApp Audio-Nachrichten"""
     
-    def __init__(self, model_size: str = "large-v3", device: str = None):
+    def __init__(self, model_size: str = "large-v3", device: str = None,
+                 use_cache: bool = True, cache_dir: Optional[str] = None):
         """
-        Initialisiert Whisper v3
+        Initialisiert Whisper v3 (das Modell wird erst bei Bedarf geladen)
         
         Args:
             model_size: Model size (tiny, base, small, medium, large, large-v3)
             device: Device (cuda, cpu, auto)
+            use_cache: Transkriptionen im persistenten Cache ablegen und
+                bereits transkribierte Audio-Dateien nicht erneut transkribieren
+            cache_dir: Verzeichnis des Transkriptions-Caches
         """
         self.model_size = model_size
-        
-        # Auto-detect device
-        if device is None:
-            self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        else:
-            self.device = device
-            
-        logger.info(f"Lade Whisper {model_size} auf {self.device}...")
-        
+        self.device = device
+        self.cache = TranscriptionCache(cache_dir, enabled=use_cache)
+        self._model = None
+        self._lock = threading.Lock()
+        self.load_error: Optional[Exception] = None
+    
+    @property
+    def loaded(self) -> bool:
+        """Ist das Modell bereits geladen?"""
+        return self._model is not None
+    
+    @property
+    def model(self):
+        """Whisper-Modell; importiert whisper/torch und lädt beim ersten Zugriff"""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._load_model()
+        return self._model
+    
+    def _load_model(self):
         try:
-            self.model = whisper.load_model(model_size, device=self.device)
+            import whisper
+            import torch
+            
+            # Auto-detect device
+            if self.device is None:
+                self.device = "cuda" if torch.cuda.is_available() else "cpu"
+                
+            logger.info(f"Lade Whisper {self.model_size} auf {self.device}...")
+            model = whisper.load_model(self.model_size, device=self.device)
             logger.info("✅ Whisper erfolgreich geladen!")
         except Exception as e:
             logger.error(f"❌ Fehler beim Laden von Whisper: {e}")
+            self.load_error = e
             raise
+        return model
+    
+    def cached_transcription(self, audio_path: str, language: str = "de") -> Optional[Dict]:
+        """Transkription aus dem Cache (ohne das Modell zu laden) oder None"""
+        try:
+            return self.cache.lookup(audio_path, self.model_size, language, TRANSCRIBE_OPTIONS)
+        except OSError as e:
+            logger.debug(f"Cache-Abfrage für {audio_path} fehlgeschlagen: {e}")
+            return None
     
-    def transcribe_audio(self, audio_path: str, language: str = "de") -> Dict:
+    def transcribe_audio(self, audio_path: str, language: str = "de",
+                         check_cache: bool = True) -> Dict:
         """
-        Transkribiert eine Audio-Datei
+        Transkribiert eine Audio-Datei (bzw. liefert sie aus dem Cache)
         
         Args:
             audio_path: Pfad zur Audio-Datei
             language: Sprache (Standard: Deutsch)
+            check_cache: False, wenn der Aufrufer den Cache bereits abgefragt hat
             
         Returns:
             Transkriptions-Ergebnis
         """
+        if check_cache:
+            cached = self.cached_transcription(audio_path, language)
+            if cached is not None:
+                return cached
+        
+        # Fehler beim Laden des Modells gehen an den Aufrufer, nicht in den Text
+        model = self.model
+        
         try:
             logger.info(f"Transkribiere: {audio_path}")
             
-            # Whisper v3 Options
-            result = self.model.transcribe(
+            result = model.transcribe(
                 audio_path,
                 language=language,
-                task="transcribe",
-                temperature=0.0,  # Deterministisch
-                word_timestamps=True,  # Für präzise Zeitstempel
                 fp16=self.device == "cuda",  # FP16 auf GPU
-                condition_on_previous_text=True,  # Besserer Kontext
-                initial_prompt="WhatsApp Sprachnachricht:"  # Kontext-Hinweis
+                **TRANSCRIBE_OPTIONS
             )
             
-            return {
+            transcription = {
                 'text': result['text'].strip(),
                 'language': result.get('language', language),
                 'segments': result.get('segments', []),
@@ -88,6 +147,10 @@ class WhisperTranscriber:
         except Exception as e:
             logger.error(f"Fehler bei Transkription von {audio_path}: {e}")
             return {'text': '[Transkription fehlgeschlagen]', 'confidence': 0.0}
+        
+        # Fehlgeschlagene Transkriptionen werden nicht gecacht
+        self.cache.store(audio_path, self.model_size, language, TRANSCRIBE_OPTIONS, transcription)
+        return transcription
     
     def _calculate_confidence(self, result: Dict) -> float:
         """Berechnet Konfidenz-Score aus Whisper-Ergebnis"""
@@ -106,8 +169,18 @@ class WhisperTranscriber:
 class WhatsAppAudioProcessor:
     """Verarbeitet WhatsApp Exports mit Audio-Nachrichten"""
     
-    def __init__(self, transcriber: WhisperTranscriber):
+    def __init__(self, transcriber: WhisperTranscriber, workers: Optional[int] = 1,
+                 progress: Optional[ProgressCallback] = None):
+        """
+        Args:
+            transcriber: Whisper-Transcriber (Modell, Gerät, Cache)
+            workers: Prozesse für die Transkription (1 = im aufrufenden Prozess,
+                None = CPU-Anzahl; siehe TranscriptionScheduler)
+            progress: Wird mit (fertige, alle) Sprachnachrichten aufgerufen
+        """
         self.transcriber = transcriber
+        self.scheduler = TranscriptionScheduler(transcriber, workers)
+        self.progress = progress
         
         # WhatsApp Audio-Patterns
         self.audio_patterns = [
@@ -121,73 +194,102 @@ class WhatsAppAudioProcessor:
         
     def process_chat_with_audio(self, 
                                chat_file: str, 
-                               media_folder: Optional[str] = None) -> Tuple[str, List[AudioMessage]]:
+                               media_folder: Optional[str] = None,
+                               media_index: Optional[MediaIndex] = None) -> Tuple[str, List[AudioMessage]]:
         """
         Verarbeitet WhatsApp-Chat und transkribiert Audio-Nachrichten
         
         Args:
             chat_file: Pfad zur _chat.txt Datei
             media_folder: Ordner mit Media-Dateien (optional)
+            media_index: Bereits gescannter Media-Ordner (statt media_folder)
             
         Returns:
             (Erweiterter Chat-Text, Liste der Audio-Messages)
         """
-        # Bestimme Media-Ordner
-        if media_folder is None:
-            # Versuche Standard WhatsApp Export Struktur
-            chat_path = Path(chat_file)
-            media_folder = chat_path.parent
+        if media_index is None:
+            # Bestimme Media-Ordner
+            if media_folder is None:
+                # Versuche Standard WhatsApp Export Struktur
+                chat_path = Path(chat_file)
+                media_folder = chat_path.parent
             
-        media_path = Path(media_folder)
+            # Ordner einmal scannen, danach nur noch Lookups
+            media_index = MediaIndex(media_folder)
         
         # Lese Chat
         with open(chat_file, 'r', encoding='utf-8') as f:
             chat_content = f.read()
         
-        # Finde alle Audio-Nachrichten
-        audio_messages = self._find_audio_messages(chat_content)
-        
-        # Transkribiere und füge ein
-        enhanced_chat = chat_content
-        transcribed_audios = []
+        # Finde alle Audio-Nachrichten (position = Zeilen-Index)
+        lines = chat_content.split('\n')
+        audio_messages = self._find_audio_messages(chat_content, lines)
         
-        for audio_msg in audio_messages:
+        # Audio-Dateien auflösen; bereits transkribierte kommen aus dem Cache
+        found = []
+        transcriptions = {}
+        jobs = []
+        for index, audio_msg in enumerate(audio_messages):
             # Finde Audio-Datei
-            audio_file = self._find_audio_file(audio_msg, media_path)
+            audio_file = self._find_audio_file(audio_msg, media_index)
             
             if audio_file:
-                # Transkribiere
-                logger.info(f"Transkribiere Audio von {audio_msg.sender} um {audio_msg.timestamp}")
-                transcription = self.transcriber.transcribe_audio(str(audio_file))
-                
-                audio_msg.transcription = transcription['text']
-                audio_msg.confidence = transcription['confidence']
-                
-                # Füge Transkription in Chat ein
-                insert_text = f"\n[🎤 SPRACHNACHRICHT TRANSKRIPTION: {audio_msg.transcription}]\n"
-                
-                # Finde Position im Chat
-                pattern = f"{re.escape(audio_msg.timestamp)} - {re.escape(audio_msg.sender)}:.*"
-                match = re.search(pattern, enhanced_chat)
-                
-                if match:
-                    # Füge nach der Audio-Nachricht ein
-                    insert_pos = match.end()
-                    enhanced_chat = (enhanced_chat[:insert_pos] + 
-                                   insert_text + 
-                                   enhanced_chat[insert_pos:])
-                
-                transcribed_audios.append(audio_msg)
+                found.append((index, audio_msg))
+                cached = self.transcriber.cached_transcription(str(audio_file))
+                if cached is not None:
+                    transcriptions[index] = cached
+                else:
+                    jobs.append(TranscriptionJob(index, str(audio_file)))
             else:
                 logger.warning(f"Audio-Datei nicht gefunden: {audio_msg.audio_file}")
         
-        return enhanced_chat, transcribed_audios
+        # Transkribiere die übrigen (längste zuerst, ggf. in mehreren Prozessen)
+        cached_count = len(transcriptions)
+        if self.progress is not None and cached_count:
+            self.progress(cached_count, len(found))
+        if jobs:
+            logger.info(f"Transkribiere {len(jobs)} Sprachnachrichten "
+                        f"({cached_count} aus dem Cache)")
+            progress = None
+            if self.progress is not None:
+                def progress(done: int, total: int):
+                    self.progress(cached_count + done, cached_count + total)
+            transcriptions.update(self.scheduler.run(jobs, progress))
+        
+        # Füge die Transkriptionen ein
+        transcribed_audios = []
+        insertions = {}
+        
+        for index, audio_msg in found:
+            transcription = transcriptions[index]
+            audio_msg.transcription = transcription['text']
+            audio_msg.confidence = transcription['confidence']
+            
+            # Transkription hinter der Zeile der Audio-Nachricht
+            insert_text = f"\n[🎤 SPRACHNACHRICHT TRANSKRIPTION: {audio_msg.transcription}]\n"
+            insertions.setdefault(audio_msg.position, []).append(insert_text)
+            
+            transcribed_audios.append(audio_msg)
+        
+        return self._splice_lines(lines, insertions), transcribed_audios
     
-    def _find_audio_messages(self, chat_content: str) -> List[AudioMessage]:
-        """Findet alle Audio-Nachrichten im Chat"""
+    @staticmethod
+    def _splice_lines(lines: List[str], insertions: Dict[int, List[str]]) -> str:
+        """Setzt den Chat in einem Durchlauf zusammen, Einfügungen hinter ihrer Zeile"""
+        if not insertions:
+            return '\n'.join(lines)
+        return '\n'.join(
+            line + ''.join(insertions[i]) if i in insertions else line
+            for i, line in enumerate(lines)
+        )
+    
+    def _find_audio_messages(self, chat_content: str,
+                             lines: Optional[List[str]] = None) -> List[AudioMessage]:
+        """Findet alle Audio-Nachrichten im Chat (lines = bereits geteilter Chat)"""
         audio_messages = []
         
-        lines = chat_content.split('\n')
+        if lines is None:
+            lines = chat_content.split('\n')
         for i, line in enumerate(lines):
             for pattern in self.audio_patterns:
                 match = re.match(pattern, line)
@@ -209,35 +311,9 @@ class WhatsAppAudioProcessor:
         
         return audio_messages
     
-    def _find_audio_file(self, audio_msg: AudioMessage, media_path: Path) -> Optional[Path]:
-        """Findet die tatsächliche Audio-Datei"""
-        # Versuche verschiedene Dateinamen
-        possible_names = [
-            audio_msg.audio_file,
-            f"*{audio_msg.audio_file}",
-            f"*{audio_msg.timestamp.replace(':', '-').replace('.', '-')}*.opus",
-            f"*{audio_msg.timestamp.replace(':', '-').replace('.', '-')}*.mp4",
-            f"AUD-*-WA*.opus",
-            f"PTT-*-WA*.opus",
-            f"VID-*-WA*.mp4"
-        ]
-        
-        for name_pattern in possible_names:
-            files = list(media_path.glob(name_pattern))
-            if files:
-                return files[0]
-        
-        # Suche nach Zeitstempel-basierten Dateien
-        timestamp_parts = audio_msg.timestamp.replace('.', '').replace(',', '').replace(':', '')
-        for audio_file in media_path.glob("*.opus"):
-            if timestamp_parts in str(audio_file):
-                return audio_file
-                
-        for audio_file in media_path.glob("*.mp4"):
-            if timestamp_parts in str(audio_file):
-                return audio_file
-        
-        return None
+    def _find_audio_file(self, audio_msg: AudioMessage, media_index: MediaIndex) -> Optional[Path]:
+        """Findet die tatsächliche Audio-Datei (siehe MediaIndex.find_audio)"""
+        return media_index.find_audio(audio_msg.audio_file, audio_msg.timestamp)
 
 def integrate_whisper_into_analysis(chat_file: str, 
                                   media_folder: Optional[str] = None,
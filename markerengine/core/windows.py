@@ -0,0 +1,115 @@
+"""
+MarkerEngine Windows - Fenster-Auswertung über Nachrichten-Indizes
+Sliding-Window / Two-Pointer über sortierte Treffer-Events: linear in der
+Anzahl der Atomic Hits statt paarweiser Vergleiche
+"""
+import heapq
+from collections import defaultdict, deque
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+def merge_events(positions_by_id: Dict[str, Sequence[int]],
+                 marker_ids: Iterable[str]) -> List[Tuple[int, str]]:
+    """
+    Führt die sortierten Nachrichten-Indizes mehrerer Marker zusammen
+
+    Returns:
+        (Nachrichten-Index, Marker-ID), sortiert nach Nachricht
+    """
+    streams = [
+        [(index, marker_id) for index in positions_by_id[marker_id]]
+        for marker_id in set(marker_ids) if marker_id in positions_by_id
+    ]
+    return list(heapq.merge(*streams))
+
+
+class CooccurrenceSweep:
+    """
+    Fortsetzbarer Two-Pointer über Treffer-Events (siehe cooccurrence_windows)
+
+    Events werden einzeln und nach Nachricht sortiert übergeben; der Zustand
+    umfasst nur die Events innerhalb des aktuellen Fensters.
+    """
+
+    def __init__(self, required: Iterable[str], window: int):
+        self.required = set(required)
+        self.window = max(1, int(window))
+        self.events: Deque[Tuple[int, str]] = deque()
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.missing = len(self.required)
+
+    def push(self, message: int, marker_id: str) -> Optional[Tuple[int, int]]:
+        """
+        Nimmt ein Event auf
+
+        Returns:
+            (erste Nachricht, letzte Nachricht) wenn damit ein Fenster
+            vollständig ist, sonst None
+        """
+        if marker_id not in self.required:
+            return None
+        events = self.events
+        counts = self.counts
+
+        events.append((message, marker_id))
+        counts[marker_id] += 1
+        if counts[marker_id] == 1:
+            self.missing -= 1
+
+        # Events, die aus dem Fenster gefallen sind, verwerfen
+        while len(events) > 1 and events[0][0] <= message - self.window:
+            left_id = events.popleft()[1]
+            counts[left_id] -= 1
+            if counts[left_id] == 0:
+                self.missing += 1
+
+        if self.missing:
+            return None
+
+        # Fenster auf das letzte nötige Vorkommen jedes Markers verkürzen
+        while counts[events[0][1]] > 1:
+            counts[events.popleft()[1]] -= 1
+        first = events[0][0]
+
+        # Nächstes Fenster beginnt hinter diesem (keine Überlappung)
+        self.restore(())
+        return first, message
+
+    def state(self) -> Tuple[Tuple[int, str], ...]:
+        """Momentaufnahme des Zustands (für restore)"""
+        return tuple(self.events)
+
+    def restore(self, state: Sequence[Tuple[int, str]]):
+        """Setzt den Zustand auf eine Momentaufnahme zurück"""
+        self.events = deque(state)
+        self.counts = defaultdict(int)
+        for _, marker_id in self.events:
+            self.counts[marker_id] += 1
+        self.missing = len(self.required) - len(self.counts)
+
+
+def cooccurrence_windows(events: Sequence[Tuple[int, str]],
+                         required: Iterable[str],
+                         window: int) -> List[Tuple[int, int]]:
+    """
+    Findet Fenster, in denen alle benötigten Marker gemeinsam auftreten
+
+    Ein Fenster umfasst höchstens `window` aufeinanderfolgende Nachrichten.
+    Geliefert werden minimale Fenster ohne gemeinsame Treffer, von links
+    nach rechts, als (erste Nachricht, letzte Nachricht).
+
+    Args:
+        events: (Nachrichten-Index, Marker-ID), nach Nachricht sortiert
+        required: Marker, die alle im Fenster vorkommen müssen
+        window: Fenstergröße in Nachrichten (>= 1)
+    """
+    sweep = CooccurrenceSweep(required, window)
+    if not sweep.required:
+        return []
+
+    windows = []
+    for message, marker_id in events:
+        found = sweep.push(message, marker_id)
+        if found is not None:
+            windows.append(found)
+    return windows
@@ -4,14 +4,16 @@ MarkerEngine Complete - Mit Whisper v3 Audio-Transkription
 """
 import sys
 import os
+from importlib.util import find_spec
 from pathlib import Path
 
-# Prüfe Dependencies
+# Prüfe Dependencies (ohne whisper/torch zu importieren - das passiert erst
+# bei der ersten Sprachnachricht)
 print("🔍 Prüfe Dependencies...")
-try:
-    import whisper
+WHISPER_AVAILABLE = find_spec('whisper') is not None
+if WHISPER_AVAILABLE:
     print("✅ Whisper v3 verfügbar")
-except ImportError:
+else:
     print("⚠️  Whisper nicht installiert - Audio-Transkription wird deaktiviert")
     print("    Installieren mit: pip install openai-whisper")
 
@@ -23,7 +25,7 @@ try:
     
     print("\n🚀 Starte MarkerEngine Complete...")
     print("📁 Marker-Verzeichnis: markers/")
-    print("🎤 Whisper v3 Audio-Transkription: Aktiviert")
+    print(f"🎤 Whisper v3 Audio-Transkription: {'Aktiviert' if WHISPER_AVAILABLE else 'Deaktiviert'}")
     print("✅ Alle Systeme bereit!\n")
     
     main()
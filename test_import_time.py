@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Import-Zeit-Test - Text-Analyse darf whisper/torch nicht laden
+Startet einen frischen Interpreter, importiert den Complete Analyzer und
+analysiert einen Text-Chat; whisper und torch dürfen dabei nicht importiert
+werden und der Import muss im Zeitbudget bleiben.
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+
+# Budget für den Import von complete_analyzer (Sekunden, ohne Marker-Laden)
+IMPORT_BUDGET_SECONDS = 1.5
+
+PROBE = r"""
+import json, logging, os, sys, tempfile, time
+logging.disable(logging.CRITICAL)
+started = time.perf_counter()
+from markerengine.core.complete_analyzer import CompleteWhatsAppAnalyzer
+import_seconds = time.perf_counter() - started
+
+with tempfile.NamedTemporaryFile('w', suffix='_chat.txt', delete=False, encoding='utf-8') as f:
+    f.write("01.07.24, 14:32 - Max: Lass uns auf WhatsApp wechseln\n")
+for enable_audio in (False, True):
+    analyzer = CompleteWhatsAppAnalyzer(enable_audio=enable_audio)
+    analyzer.analyze_whatsapp_export(f.name)
+os.unlink(f.name)
+
+heavy = sorted(name for name in ('whisper', 'torch') if name in sys.modules)
+print(json.dumps({'import_seconds': import_seconds, 'heavy_modules': heavy}))
+"""
+
+
+def measure():
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_text_only_startup():
+    result = measure()
+    assert result['heavy_modules'] == [], f"Text-Analyse importiert {result['heavy_modules']}"
+    assert result['import_seconds'] < IMPORT_BUDGET_SECONDS, (
+        f"Import dauert {result['import_seconds']:.2f}s (Budget {IMPORT_BUDGET_SECONDS}s)"
+    )
+
+
+if __name__ == "__main__":
+    result = measure()
+    print(f"⏱️  Import complete_analyzer: {result['import_seconds']:.3f}s "
+          f"(Budget {IMPORT_BUDGET_SECONDS}s)")
+    print(f"📦 Schwere Module geladen: {result['heavy_modules'] or 'keine'}")
+    test_text_only_startup()
+    print("✅ Text-Start ohne whisper/torch")
@@ -0,0 +1,58 @@
+"""
+Chat-Parser: Datums-Reihenfolge wird einmal pro Chat festgelegt
+"""
+import calendar
+
+from markerengine.core.chat_parser import ChatParser, parse_chat
+
+# EN-GB-Export: die ersten Daten sind mehrdeutig, erst 13/04 entscheidet
+EN_GB_CHAT = (
+    "03/04/24, 09:15 - Anna: Morning!\n"
+    "05/04/24, 18:02 - Ben: See you later\n"
+    "13/04/24, 10:00 - Anna: Happy weekend\n"
+    "02/05/24, 07:30 - Ben: Back home\n"
+)
+
+EN_US_CHAT = (
+    "4/3/24, 9:15 AM - Anna: Morning!\n"
+    "4/13/24, 10:00 AM - Ben: Happy weekend\n"
+    "5/2/24, 7:30 PM - Anna: Back home\n"
+)
+
+
+def _seconds(year, month, day, hour, minute):
+    return float(calendar.timegm((year, month, day, hour, minute, 0)))
+
+
+def test_dayfirst_decided_once_per_chat():
+    parser = ChatParser().feed(EN_GB_CHAT)
+    assert parser.dayfirst is True
+    assert list(parser.table.timestamps) == [
+        _seconds(2024, 4, 3, 9, 15),
+        _seconds(2024, 4, 5, 18, 2),
+        _seconds(2024, 4, 13, 10, 0),
+        _seconds(2024, 5, 2, 7, 30),
+    ]
+
+    us = parse_chat(EN_US_CHAT)
+    assert list(us.timestamps) == [
+        _seconds(2024, 4, 3, 9, 15),
+        _seconds(2024, 4, 13, 10, 0),
+        _seconds(2024, 5, 2, 19, 30),
+    ]
+
+
+def test_dayfirst_across_chunks_and_explicit():
+    # Zeilenweise bzw. in beliebigen Blöcken gefüttert: gleiches Ergebnis
+    parser = ChatParser()
+    for start in range(0, len(EN_GB_CHAT), 7):
+        parser.feed_chunk(EN_GB_CHAT[start:start + 7])
+    parser.flush()
+    assert list(parser.table.timestamps) == list(parse_chat(EN_GB_CHAT).timestamps)
+
+    # Ohne eindeutiges Datum bleibt es bei Monat/Tag; explizit gesetzt gilt dayfirst
+    undecided = ChatParser().feed("03/04/24, 09:15 - Anna: Morning!\n")
+    assert undecided.dayfirst is None
+    assert undecided.table.timestamps[0] == _seconds(2024, 3, 4, 9, 15)
+    explicit = parse_chat("03/04/24, 09:15 - Anna: Morning!\n", dayfirst=True)
+    assert explicit.timestamps[0] == _seconds(2024, 4, 3, 9, 15)
@@ -0,0 +1,64 @@
+"""
+Columnar: Treffer als Spalten-Tabelle und .npz-Export
+"""
+import pytest
+
+from markerengine.core.chat_parser import NO_SENDER, parse_chat
+from markerengine.core.columnar import LEVELS, export_hits, hit_columns
+from markerengine.core.engine import AnalysisResult, MarkerHit
+
+CHAT = (
+    "Export-Hinweis\n"
+    "01.07.24, 14:32 - Max: Lass uns auf WhatsApp wechseln\n"
+    "01.07.24, 14:35 - Anna: Ich brauche dringend Geld\n"
+)
+
+
+def _result():
+    messages = parse_chat(CHAT)
+    whatsapp = CHAT.index('WhatsApp')
+    geld = CHAT.index('Geld')
+    return AnalysisResult(
+        atomic_hits=[
+            MarkerHit('A_PLATFORM_SWITCH', 'Plattformwechsel', 'WhatsApp', whatsapp, whatsapp + 8, 0.9),
+            MarkerHit('A_MONEY_REQUEST', 'Geldforderung', 'Geld', geld, geld + 4, 0.75),
+            MarkerHit('A_PLATFORM_SWITCH', 'Plattformwechsel', 'Export', 0, 6, 0.5),
+        ],
+        semantic_hits=[MarkerHit('S_SCAM', 'Scam', 'Geld', geld, geld + 4)],
+        messages=messages,
+    )
+
+
+def test_hit_columns():
+    columns = hit_columns(_result())
+    assert len(columns) == 4
+    assert columns.marker_ids == ['A_PLATFORM_SWITCH', 'A_MONEY_REQUEST', 'S_SCAM']
+    assert list(columns.marker_codes) == [0, 1, 0, 2]
+    assert list(columns.level_codes) == [0, 0, 0, LEVELS.index('semantic')]
+    assert list(columns.message_index) == [1, 2, 0, 2]
+    assert columns.senders == ['Max', 'Anna']
+    assert list(columns.sender_ids) == [0, 1, NO_SENDER, 1]
+
+
+def test_export_npz(tmp_path):
+    np = pytest.importorskip('numpy')
+
+    path = export_hits(_result(), str(tmp_path / 'hits.parquet'), format='npz')
+    assert path.suffix == '.npz'
+    with np.load(path) as data:
+        # Marker-ID kategorial: Codes + Kategorien
+        assert data['marker_code'].dtype == np.int32
+        assert [str(m) for m in data['marker_ids'][data['marker_code']]] == \
+            ['A_PLATFORM_SWITCH', 'A_MONEY_REQUEST', 'A_PLATFORM_SWITCH', 'S_SCAM']
+        assert [str(l) for l in data['levels'][data['level_code']]] == \
+            ['atomic', 'atomic', 'atomic', 'semantic']
+        assert data['level_code'].dtype == np.int8
+
+        # Ganzzahlige Offsets, float32-Konfidenz
+        assert data['start'].dtype == np.int64 and data['end'].dtype == np.int64
+        assert data['start'].tolist() == [CHAT.index('WhatsApp'), CHAT.index('Geld'), 0, CHAT.index('Geld')]
+        assert (data['end'] - data['start']).tolist() == [8, 4, 6, 4]
+        assert data['message_index'].dtype == np.int32
+        assert data['sender_id'].tolist() == [0, 1, NO_SENDER, 1]
+        assert data['confidence'].dtype == np.float32
+        assert data['confidence'].tolist() == pytest.approx([0.9, 0.75, 0.5, 1.0])
@@ -0,0 +1,68 @@
+"""
+Regressionstest Marker-Hierarchie: Cluster mit gebrochener Schwelle und
+mehrfach gelisteten Eingängen (Phasen 2-4 über einen synthetischen Marker-Satz)
+"""
+import logging
+
+import yaml
+
+from markerengine.core.engine import MarkerEngine
+from markerengine.core.hierarchy import MarkerHierarchy
+
+logging.getLogger('markerengine').setLevel(logging.CRITICAL)
+
+ATOMIC = {'A_HALLO': {'marker_name': 'A_HALLO', 'beispiele': ['hallo welt']}}
+SEMANTIC = {
+    sem_id: {'id': sem_id, 'composed_of': ['A_HALLO'],
+             'rules': {'frequency': {'marker': 'A_HALLO', 'min_count': 1}}}
+    for sem_id in ('S_ONE', 'S_TWO')
+}
+SEMANTIC['S_NEVER'] = {'id': 'S_NEVER', 'composed_of': ['A_NONE'],
+                       'rules': {'frequency': {'marker': 'A_NONE'}}}
+CLUSTER = {
+    # 0.5: ein gefeuerter Eingang reicht, ohne Eingang feuert nichts
+    'C_HALF': {'id': 'C_HALF', 'composed_of': ['S_ONE', 'S_NEVER'], 'trigger_threshold': 0.5},
+    'C_HALF_EMPTY': {'id': 'C_HALF_EMPTY', 'composed_of': ['S_NEVER'], 'trigger_threshold': 0.5},
+    # Doppelt gelisteter Eingang zählt doppelt
+    'C_DUP': {'id': 'C_DUP', 'composed_of': ['S_TWO', 'S_TWO'], 'trigger_threshold': 2},
+    'C_DUP_HIGH': {'id': 'C_DUP_HIGH', 'composed_of': ['S_TWO', 'S_TWO'], 'trigger_threshold': 3},
+    # Schwelle 0 feuert auch ohne Eingänge
+    'C_ZERO': {'id': 'C_ZERO', 'composed_of': ['S_NEVER'], 'trigger_threshold': 0},
+}
+META = {
+    'MM_DUP': {'id': 'MM_DUP', 'composed_of': ['C_DUP'], 'trigger_threshold': 1},
+    'MM_PAIR': {'id': 'MM_PAIR', 'composed_of': ['C_HALF', 'C_HALF'], 'trigger_threshold': 1.5},
+}
+
+
+def _write_markers(base):
+    for folder, markers in (('atomic', ATOMIC), ('semantic', SEMANTIC),
+                            ('cluster', CLUSTER), ('meta_marker', META)):
+        directory = base / folder
+        directory.mkdir()
+        for marker_id, data in markers.items():
+            (directory / f"{marker_id}.yaml").write_text(yaml.safe_dump(data), encoding='utf-8')
+
+
+def test_hierarchy_thresholds():
+    hierarchy = MarkerHierarchy(ATOMIC, SEMANTIC, CLUSTER, META)
+    fired = hierarchy.mask('semantic', ['S_ONE', 'S_TWO'])
+    assert sorted(hierarchy.triggered('cluster', fired)) == ['C_DUP', 'C_HALF', 'C_ZERO']
+    assert hierarchy.triggered('cluster', 0) == ['C_ZERO']
+    assert sorted(hierarchy.triggered('meta', hierarchy.mask('cluster', ['C_DUP', 'C_HALF']))) == \
+        ['MM_DUP', 'MM_PAIR']
+
+
+def test_engine_fractional_and_duplicate_clusters(tmp_path):
+    _write_markers(tmp_path)
+    engine = MarkerEngine(str(tmp_path), use_cache=False, load_workers=1)
+    result = engine.analyze("01.07.24, 14:32 - Max: hallo welt\n")
+
+    assert sorted(h.marker_id for h in result.semantic_hits) == ['S_ONE', 'S_TWO']
+    assert sorted(h.marker_id for h in result.cluster_hits) == ['C_DUP', 'C_HALF', 'C_ZERO']
+    assert sorted(h.marker_id for h in result.meta_hits) == ['MM_DUP', 'MM_PAIR']
+
+    # Ohne Atomic Hits feuert nur der Cluster mit Schwelle 0
+    empty = engine.analyze("01.07.24, 14:32 - Max: nichts\n")
+    assert [h.marker_id for h in empty.cluster_hits] == ['C_ZERO']
+    assert empty.meta_hits == []
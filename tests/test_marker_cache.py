@@ -0,0 +1,77 @@
+"""
+Marker-Cache: Änderungen an einer YAML parsen nur diese Datei neu
+"""
+import logging
+
+import yaml
+
+from markerengine.core.engine import MarkerEngine
+from markerengine.core.marker_cache import MarkerCache
+from markerengine.core.marker_loader import load_marker_directories
+
+logging.getLogger('markerengine').setLevel(logging.CRITICAL)
+
+ATOMIC = {
+    'A_HALLO': ['hallo welt'],
+    'A_TSCHUESS': ['bis bald'],
+    'A_DANKE': ['vielen dank'],
+}
+
+
+def _write_marker(base, marker_id, beispiele):
+    path = base / 'atomic' / f"{marker_id}.yaml"
+    path.write_text(yaml.safe_dump({'marker_name': marker_id, 'beispiele': beispiele}),
+                    encoding='utf-8')
+    return path
+
+
+def _load(base, cache_dir):
+    cache = MarkerCache(base, cache_dir=str(cache_dir))
+    loaded = load_marker_directories(base, ('atomic',), cache=cache, workers=1)
+    cache.save()
+    return cache, {f.path.stem: f for f in loaded['atomic']}
+
+
+def test_edit_reparses_only_that_file(tmp_path):
+    base = tmp_path / 'markers'
+    (base / 'atomic').mkdir(parents=True)
+    cache_dir = tmp_path / 'cache'
+    for marker_id, beispiele in ATOMIC.items():
+        _write_marker(base, marker_id, beispiele)
+
+    cache, _ = _load(base, cache_dir)
+    assert (cache.hits, cache.misses) == (0, 3)
+
+    cache, files = _load(base, cache_dir)
+    assert (cache.hits, cache.misses) == (3, 0)
+    assert all(f.cached for f in files.values())
+
+    _write_marker(base, 'A_DANKE', ['vielen dank', 'merci'])
+    cache, files = _load(base, cache_dir)
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert [name for name, f in files.items() if not f.cached] == ['A_DANKE']
+    assert files['A_DANKE'].result()['beispiele'] == ['vielen dank', 'merci']
+
+    # Gelöschte Dateien fallen beim Speichern aus dem Cache
+    (base / 'atomic' / 'A_TSCHUESS.yaml').unlink()
+    cache, _ = _load(base, cache_dir)
+    assert (cache.hits, cache.misses) == (2, 0)
+    assert sorted(MarkerCache(base, cache_dir=str(cache_dir))._entries) == \
+        ['atomic/A_DANKE.yaml', 'atomic/A_HALLO.yaml']
+
+
+def test_engine_sees_edited_marker(tmp_path, monkeypatch):
+    monkeypatch.setenv('MARKERENGINE_CACHE_DIR', str(tmp_path / 'cache'))
+    base = tmp_path / 'markers'
+    (base / 'atomic').mkdir(parents=True)
+    for marker_id, beispiele in ATOMIC.items():
+        _write_marker(base, marker_id, beispiele)
+    text = "01.07.24, 14:32 - Max: merci und bis bald\n"
+
+    engine = MarkerEngine(str(base), load_workers=1)
+    assert sorted(h.marker_id for h in engine.analyze(text).atomic_hits) == ['A_TSCHUESS']
+
+    _write_marker(base, 'A_DANKE', ['vielen dank', 'merci'])
+    engine = MarkerEngine(str(base), load_workers=1)
+    assert (engine._marker_cache.hits, engine._marker_cache.misses) == (2, 1)
+    assert sorted(h.marker_id for h in engine.analyze(text).atomic_hits) == ['A_DANKE', 'A_TSCHUESS']
@@ -0,0 +1,41 @@
+"""
+Media Index: Auflösung von Audio-Referenzen über den einmal gescannten Ordner
+"""
+from markerengine.core.media_index import MediaIndex
+
+FILES = (
+    '00000012-PTT-20240701-WA0001.opus',
+    '00000013-PTT-20240701-WA0001.opus',
+    'AUD-20240702-WA0002.opus',
+    'voice-notiz.m4a',
+    'IMG-20240701-WA0003.jpg',
+)
+
+
+def _media(tmp_path):
+    for name in FILES:
+        (tmp_path / name).write_bytes(b'')
+    return MediaIndex(tmp_path)
+
+
+def test_suffix_match_over_all_files(tmp_path):
+    media = _media(tmp_path)
+    timestamp = '01.07.24, 14:32'
+
+    # Exakter Name
+    assert media.find_audio('AUD-20240702-WA0002.opus', timestamp).name == 'AUD-20240702-WA0002.opus'
+    # Teil-Name im WhatsApp-Schema: erste passende Datei nach Namen
+    assert media.find_audio('20240701-WA0001.opus', timestamp).name == '00000012-PTT-20240701-WA0001.opus'
+    # Anhang mit anderer Endung als .opus/.mp4
+    assert media.find_audio('notiz.m4a', timestamp).name == 'voice-notiz.m4a'
+    assert media.find_suffix('WA0003.jpg').name == 'IMG-20240701-WA0003.jpg'
+
+    assert media.find_suffix('fehlt.opus') is None
+    assert media.find_suffix('') is None
+
+
+def test_fallback_to_voice_message_of_the_day(tmp_path):
+    media = _media(tmp_path)
+    assert media.has_audio and media.audio_count == 3
+    # Unbekannte Referenz: Sprachnachricht vom Tag des Zeitstempels
+    assert media.find_audio('unbekannt.opus', '02.07.24, 09:00').name == 'AUD-20240702-WA0002.opus'
@@ -0,0 +1,103 @@
+"""
+Parallel: der Prozess-Pool liefert dieselben Treffer wie der serielle Scan
+"""
+import logging
+import re
+import threading
+
+import pytest
+import yaml
+
+from markerengine.core.engine import MarkerEngine
+from markerengine.core.parallel import PARALLEL_MIN_CHARS
+from markerengine.core.pattern_engine import MarkerPatternEngine
+
+logging.getLogger('markerengine').setLevel(logging.CRITICAL)
+
+SHARED = 'gemeinsamer Satz mit vielen Wörtern'
+
+# A_ONE und B_TWO teilen sich ein Beispiel (re.compile liefert dasselbe Pattern-Objekt)
+ATOMIC = {
+    'A_ONE': ['Das ist nur ein kleiner Test hier', SHARED],
+    'B_TWO': [SHARED],
+    'C_GELD': ['ich brauche dringend Geld', 'Geld'],
+}
+
+LINES = (
+    "Max: {}",
+    "Anna: Hallo, wie geht es dir heute?",
+    "Max: ich brauche dringend Geld für die Miete",
+    "Anna: Ein gemeinsamer Satz, aber nicht ganz",
+    "Max: Das ist nur ein Test",
+)
+
+
+def _chat():
+    lines = []
+    i = 0
+    while sum(len(line) for line in lines) < PARALLEL_MIN_CHARS + 10000:
+        template = LINES[i % len(LINES)]
+        lines.append(f"01.07.24, 14:{i % 60:02d} - " + template.format(SHARED) + "\n")
+        i += 1
+    return ''.join(lines)
+
+
+@pytest.fixture(scope='module')
+def markers(tmp_path_factory):
+    base = tmp_path_factory.mktemp('markers')
+    (base / 'atomic').mkdir()
+    for marker_id, beispiele in ATOMIC.items():
+        (base / 'atomic' / f"{marker_id}.yaml").write_text(
+            yaml.safe_dump({'marker_name': marker_id, 'beispiele': beispiele}), encoding='utf-8'
+        )
+    return str(base)
+
+
+@pytest.mark.parametrize('overlap_scope', ['global', 'marker'])
+def test_pattern_engine_parallel_matches_serial(markers, overlap_scope):
+    text = _chat()
+    serial = MarkerPatternEngine(markers, use_cache=False, load_workers=1, overlap_scope=overlap_scope)
+    parallel = MarkerPatternEngine(markers, use_cache=False, load_workers=1,
+                                   overlap_scope=overlap_scope, scan_workers=2)
+    try:
+        expected = [(m.marker_id, m.start_pos, m.end_pos, m.pattern) for m in serial.detect_patterns(text)]
+        found = [(m.marker_id, m.start_pos, m.end_pos, m.pattern) for m in parallel.detect_patterns(text)]
+    finally:
+        parallel.close()
+
+    assert found == expected
+    # Global verdrängen sich die gleichen Spans der beiden Marker gegenseitig
+    shared = {marker_id for marker_id, _, _, pattern in expected if pattern == re.escape(SHARED)}
+    assert len(shared) == (2 if overlap_scope == 'marker' else 1)
+
+
+def test_marker_engine_parallel_matches_serial(markers):
+    text = _chat()
+    serial = MarkerEngine(markers, use_cache=False, load_workers=1)
+    parallel = MarkerEngine(markers, use_cache=False, load_workers=1, scan_workers=2)
+    try:
+        expected_spans = sorted(serial._atomic_spans(text))
+        found_spans = sorted(parallel._resolve_spans(parallel._get_scanner().atomic_spans(text)))
+        expected = serial.analyze(text)
+        found = parallel.analyze(text)
+    finally:
+        parallel.close()
+
+    assert found_spans == expected_spans
+    assert {marker_id for marker_id, _, _, _ in expected_spans} == set(ATOMIC)
+    hits = lambda result: [(h.marker_id, h.position_start, h.position_end, h.text)
+                           for h in result.atomic_hits]
+    assert hits(found) == hits(expected)
+
+
+def test_scanner_started_once_across_threads(markers):
+    engine = MarkerPatternEngine(markers, use_cache=False, load_workers=1, scan_workers=2)
+    scanners = []
+    threads = [threading.Thread(target=lambda: scanners.append(engine._get_scanner()))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.close()
+    assert len(scanners) == 8 and all(scanner is scanners[0] for scanner in scanners)
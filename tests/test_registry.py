@@ -0,0 +1,25 @@
+"""
+Registry: Standard-Pfad und expliziter Pfad teilen sich eine Engine
+"""
+import logging
+import os
+
+from markerengine.core import registry
+from markerengine.core.engine import DEFAULT_MARKER_PATH
+from markerengine.core.real_analyzer import DEFAULT_MARKERS_PATH
+
+logging.getLogger('markerengine').setLevel(logging.CRITICAL)
+
+
+def test_default_path_shares_instance():
+    registry.clear_registry()
+    try:
+        analyzer = registry.get_real_analyzer()
+        assert registry.get_real_analyzer(str(DEFAULT_MARKERS_PATH)) is analyzer
+        assert registry.get_real_analyzer(os.path.relpath(DEFAULT_MARKERS_PATH)) is analyzer
+
+        engine = registry.get_marker_engine(DEFAULT_MARKER_PATH)
+        assert registry.get_marker_engine() is engine
+        assert len(registry._registry) == 2
+    finally:
+        registry.clear_registry()
@@ -0,0 +1,62 @@
+"""
+Transcription Cache: Schlüssel aus Inhalt, Modell, Sprache und Optionen; LRU-Verdrängung
+"""
+import os
+import shutil
+
+from markerengine.core.transcription_cache import TranscriptionCache
+
+OPTIONS = {'task': 'transcribe', 'temperature': 0.0}
+RESULT = {'text': 'hallo', 'language': 'de', 'segments': [], 'confidence': 0.9}
+
+
+def _audio(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_key_covers_model_language_and_options(tmp_path):
+    cache = TranscriptionCache(str(tmp_path / 'cache'))
+    audio = _audio(tmp_path, 'PTT-20240701-WA0001.opus', b'audio-1')
+    cache.store(audio, 'tiny', 'de', OPTIONS, RESULT)
+
+    assert cache.lookup(audio, 'tiny', 'de', OPTIONS)['text'] == 'hallo'
+    assert cache.lookup(audio, 'base', 'de', OPTIONS) is None
+    assert cache.lookup(audio, 'tiny', 'en', OPTIONS) is None
+    assert cache.lookup(audio, 'tiny', 'de', dict(OPTIONS, temperature=0.2)) is None
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    # Inhalt-adressiert: gleiche Datei unter anderem Namen trifft, geänderter Inhalt nicht
+    copy = str(tmp_path / 'kopie.opus')
+    shutil.copy(audio, copy)
+    assert cache.lookup(copy, 'tiny', 'de', OPTIONS) is not None
+    _audio(tmp_path, 'kopie.opus', b'audio-2')
+    assert cache.lookup(copy, 'tiny', 'de', OPTIONS) is None
+
+    # Deaktiviert: weder Lesen noch Schreiben
+    disabled = TranscriptionCache(str(tmp_path / 'cache'), enabled=False)
+    assert disabled.lookup(audio, 'tiny', 'de', OPTIONS) is None
+
+
+def test_evicts_least_recently_read(tmp_path):
+    cache = TranscriptionCache(str(tmp_path / 'cache'))
+    audios = {name: _audio(tmp_path, f"{name}.opus", name.encode()) for name in ('a', 'b', 'c')}
+    entries = {}
+    for age, (name, audio) in enumerate(audios.items()):
+        cache.store(audio, 'tiny', 'de', OPTIONS, RESULT)
+        entries[name] = cache._entry_path(cache.key(audio, 'tiny', 'de', OPTIONS))
+        # Eindeutige Zugriffszeiten: a am ältesten, c am jüngsten
+        os.utime(entries[name], (1000 + age, 1000 + age))
+
+    # Lesen macht a zum jüngsten Eintrag, b ist jetzt am längsten nicht gelesen
+    assert cache.lookup(audios['a'], 'tiny', 'de', OPTIONS) is not None
+
+    sizes = {name: path.stat().st_size for name, path in entries.items()}
+    cache.max_bytes = sizes['a'] + sizes['c']
+    assert cache.evict() == 1
+    assert [name for name, path in entries.items() if path.exists()] == ['a', 'c']
+
+    cache.max_bytes = sizes['a']
+    assert cache.evict() == 1
+    assert [name for name, path in entries.items() if path.exists()] == ['a']
@@ -0,0 +1,88 @@
+"""
+Transcription Scheduler: Verteilung auf Worker-Prozesse und Ladefehler des Modells
+"""
+import os
+import sys
+
+import pytest
+
+from markerengine.core.transcription_scheduler import (
+    ModelLoadError, TranscriptionJob, TranscriptionScheduler
+)
+from markerengine.core.whisper_integration import WhisperTranscriber
+
+# Whisper-Ersatz, dessen Modell sich nicht laden lässt
+FAILING_WHISPER = '''
+def load_model(size, device=None):
+    raise RuntimeError("Modell-Datei beschädigt")
+'''
+
+# Whisper-Ersatz mit Text aus dem Dateinamen
+WORKING_WHISPER = '''
+import os
+
+class _Model:
+    def transcribe(self, audio_path, **options):
+        return {'text': ' Text ' + os.path.basename(audio_path), 'segments': [{'avg_logprob': -1.0}]}
+
+def load_model(size, device=None):
+    return _Model()
+'''
+
+FAKE_TORCH = '''
+class cuda:
+    @staticmethod
+    def is_available():
+        return False
+'''
+
+
+def _setup(tmp_path, monkeypatch, whisper_source):
+    modules = tmp_path / 'modules'
+    modules.mkdir()
+    (modules / 'whisper.py').write_text(whisper_source, encoding='utf-8')
+    (modules / 'torch.py').write_text(FAKE_TORCH, encoding='utf-8')
+    # Gespawnte Worker übernehmen sys.path des Hauptprozesses
+    monkeypatch.syspath_prepend(str(modules))
+    # Im Hauptprozess importierte Ersatz-Module nach dem Test wieder entfernen
+    for name in ('whisper', 'torch'):
+        monkeypatch.setitem(sys.modules, name, None)
+        monkeypatch.delitem(sys.modules, name)
+
+    audio = []
+    for i in range(3):
+        path = tmp_path / f"PTT-20240701-WA000{i}.opus"
+        path.write_bytes(b'x' * (i + 1))
+        audio.append(str(path))
+    return audio
+
+
+def test_workers_match_serial(tmp_path, monkeypatch):
+    audio = _setup(tmp_path, monkeypatch, WORKING_WHISPER)
+    results = {}
+    for workers in (1, 2):
+        transcriber = WhisperTranscriber('tiny', device='cpu', use_cache=False)
+        progress = []
+        results[workers] = TranscriptionScheduler(transcriber, workers).run(
+            [TranscriptionJob(i, path) for i, path in enumerate(audio)],
+            lambda done, total: progress.append((done, total))
+        )
+        assert progress == [(1, 3), (2, 3), (3, 3)]
+        # Mehrere Worker laden ihr eigenes Modell, nicht das des Hauptprozesses
+        assert transcriber.loaded == (workers == 1)
+
+    assert results[1] == results[2]
+    assert [results[2][i]['text'] for i in range(3)] == [f"Text {os.path.basename(p)}" for p in audio]
+
+
+def test_worker_load_error_is_recorded(tmp_path, monkeypatch):
+    audio = _setup(tmp_path, monkeypatch, FAILING_WHISPER)
+
+    transcriber = WhisperTranscriber('tiny', device='cpu', cache_dir=str(tmp_path / 'cache'))
+    scheduler = TranscriptionScheduler(transcriber, workers=2)
+    with pytest.raises(ModelLoadError, match='Modell-Datei beschädigt'):
+        scheduler.run([TranscriptionJob(i, path) for i, path in enumerate(audio)])
+
+    # Wie beim Laden im eigenen Prozess: der Aufrufer sieht den Ladefehler
+    assert isinstance(transcriber.load_error, ModelLoadError)
+    assert not transcriber.loaded
@@ -0,0 +1,90 @@
+"""
+Sprachnachrichten im Chat: Cache über mehrere Läufe und Einfügen der Transkriptionen
+(mit einem Ersatz-Modell statt Whisper)
+"""
+import os
+
+from markerengine.core.whisper_integration import WhatsAppAudioProcessor, WhisperTranscriber
+
+# Ein Sender, mehrere Sprachnachrichten in derselben Minute
+CHAT = (
+    "01.07.24, 14:32 - Max: PTT-20240701-WA0001.opus (Datei angehängt)\n"
+    "01.07.24, 14:32 - Max: PTT-20240701-WA0002.opus (Datei angehängt)\n"
+    "01.07.24, 14:32 - Anna: Moment\n"
+    "01.07.24, 14:32 - Max: PTT-20240701-WA0003.opus (Datei angehängt)\n"
+    "01.07.24, 14:33 - Anna: ok"
+)
+
+
+class StubModel:
+    """Ersatz für das Whisper-Modell: Text aus dem Dateinamen, zählt Aufrufe"""
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio_path, **options):
+        self.calls.append(os.path.basename(audio_path))
+        return {'text': f" Text {os.path.basename(audio_path)[-11:-5]} ",
+                'segments': [{'avg_logprob': -1.0}], 'language': options.get('language')}
+
+
+def _export(tmp_path):
+    export = tmp_path / 'export'
+    export.mkdir()
+    (export / '_chat.txt').write_text(CHAT, encoding='utf-8')
+    for i in (1, 2, 3):
+        (export / f"PTT-20240701-WA000{i}.opus").write_bytes(b'x' * i)
+    return export
+
+
+def _processor(tmp_path):
+    transcriber = WhisperTranscriber('tiny', device='cpu', cache_dir=str(tmp_path / 'cache'))
+    transcriber._model = StubModel()
+    return WhatsAppAudioProcessor(transcriber), transcriber._model
+
+
+def test_transcriptions_follow_their_audio_line(tmp_path):
+    export = _export(tmp_path)
+    processor, model = _processor(tmp_path)
+    chat, messages = processor.process_chat_with_audio(str(export / '_chat.txt'))
+
+    assert [m.position for m in messages] == [0, 1, 3]
+    assert chat.split('\n') == [
+        "01.07.24, 14:32 - Max: PTT-20240701-WA0001.opus (Datei angehängt)",
+        "[🎤 SPRACHNACHRICHT TRANSKRIPTION: Text WA0001]",
+        "",
+        "01.07.24, 14:32 - Max: PTT-20240701-WA0002.opus (Datei angehängt)",
+        "[🎤 SPRACHNACHRICHT TRANSKRIPTION: Text WA0002]",
+        "",
+        "01.07.24, 14:32 - Anna: Moment",
+        "01.07.24, 14:32 - Max: PTT-20240701-WA0003.opus (Datei angehängt)",
+        "[🎤 SPRACHNACHRICHT TRANSKRIPTION: Text WA0003]",
+        "",
+        "01.07.24, 14:33 - Anna: ok",
+    ]
+    # Längste Datei zuerst
+    assert model.calls == ['PTT-20240701-WA0003.opus', 'PTT-20240701-WA0002.opus',
+                           'PTT-20240701-WA0001.opus']
+
+
+def test_second_run_makes_no_model_calls(tmp_path):
+    export = _export(tmp_path)
+    first, _ = _processor(tmp_path)
+    chat, _ = first.process_chat_with_audio(str(export / '_chat.txt'))
+
+    second, model = _processor(tmp_path)
+    progress = []
+    second.progress = lambda done, total: progress.append((done, total))
+    again, messages = second.process_chat_with_audio(str(export / '_chat.txt'))
+
+    assert model.calls == []
+    assert again == chat
+    assert [m.confidence for m in messages] == [0.9] * 3
+    assert progress == [(3, 3)]
+
+
+def test_splice_lines():
+    lines = ['a', 'b', 'c']
+    assert WhatsAppAudioProcessor._splice_lines(lines, {}) == 'a\nb\nc'
+    assert WhatsAppAudioProcessor._splice_lines(lines, {0: ['\n[1]\n', '\n[2]\n'], 2: ['\n[3]']}) == \
+        'a\n[1]\n\n[2]\n\nb\nc\n[3]'